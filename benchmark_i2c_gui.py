@@ -0,0 +1,281 @@
+#############################################################################
+# zlib License
+#
+# (C) 2023 Cristóvão Beirão da Cruz e Silva <cbeiraod@cern.ch>
+#
+# This software is provided 'as-is', without any express or implied
+# warranty.  In no event will the authors be held liable for any damages
+# arising from the use of this software.
+#
+# Permission is granted to anyone to use this software for any purpose,
+# including commercial applications, and to alter it and redistribute it
+# freely, subject to the following restrictions:
+#
+# 1. The origin of this software must not be misrepresented; you must not
+#    claim that you wrote the original software. If you use this software
+#    in a product, an acknowledgment in the product documentation would be
+#    appreciated but is not required.
+# 2. Altered source versions must be plainly marked as such, and must not be
+#    misrepresented as being the original software.
+# 3. This notice may not be removed or altered from any source distribution.
+#############################################################################
+
+import logging
+import i2c_gui
+import i2c_gui.chips
+
+from pathlib import Path
+import time
+import json
+import tracemalloc
+import tempfile
+import platform
+import subprocess
+
+def get_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=Path(__file__).parent, capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+def time_function(function, repetitions: int, conn: i2c_gui.Connection_Controller = None):
+    """Run the function several times, returning the wall time statistics and, if a connection is given, the I2C transactions of a single run"""
+    wall_times = []
+    transactions = None
+    for idx in range(repetitions):
+        if conn is not None:
+            conn.metrics.reset()
+
+        start_time = time.perf_counter_ns()
+        function()
+        wall_times += [(time.perf_counter_ns() - start_time)/1E9]
+
+        if conn is not None and transactions is None:
+            total = conn.metrics.summary()["total"]
+            transactions = {
+                "count": total["count"],
+                "bytes": total["bytes"],
+                "i2c_s": total["wall_ns"]/1E9,
+            }
+
+    result = {
+        "repetitions": repetitions,
+        "min_s": min(wall_times),
+        "mean_s": sum(wall_times)/repetitions,
+        "max_s": max(wall_times),
+    }
+    if transactions is not None:
+        result["transactions"] = transactions
+    return result
+
+def benchmark_construction(helper: i2c_gui.ScriptHelper, conn: i2c_gui.Connection_Controller, chip_class, repetitions: int):
+    wall_times = []
+    memory = None
+    for idx in range(repetitions):
+        if memory is None:  # Memory tracing slows down the construction, so it is only done on the first repetition and not timed
+            tracemalloc.start()
+            chip = chip_class(parent=helper, i2c_controller=conn)
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            memory = {
+                "python_heap_bytes": current,
+                "python_heap_peak_bytes": peak,
+            }
+            del chip
+
+        start_time = time.perf_counter_ns()
+        chip = chip_class(parent=helper, i2c_controller=conn)
+        wall_times += [(time.perf_counter_ns() - start_time)/1E9]
+        del chip
+
+    return {
+        "repetitions": repetitions,
+        "min_s": min(wall_times),
+        "mean_s": sum(wall_times)/repetitions,
+        "max_s": max(wall_times),
+        "memory": memory,
+    }
+
+def benchmark_decoded_updates(chip, decoded_value: tuple[str, str, str], updates: int, conn: i2c_gui.Connection_Controller):
+    address_space, block, value = decoded_value
+    var = chip.get_decoded_indexed_var(address_space, block, value)
+    original_value = var.get()
+
+    def set_values():
+        for idx in range(updates):
+            var.set(str(idx & 0x1))
+
+    def set_and_write_values():
+        for idx in range(updates):
+            var.set(str(idx & 0x1))
+            chip.write_decoded_value(address_space, block, value, write_check=False, no_message=True)
+
+    result = {
+        "value": "{}/{}/{}".format(*decoded_value),
+        "updates": updates,
+        "local": time_function(set_values, 1),
+        "with_write": time_function(set_and_write_values, 1, conn),
+    }
+
+    var.set(original_value)
+    return result
+
+def benchmark_chip(
+        helper: i2c_gui.ScriptHelper,
+        conn: i2c_gui.Connection_Controller,
+        chip_class,
+        configure_addresses,
+        decoded_value: tuple[str, str, str],
+        repetitions: int,
+        decoded_updates: int,
+        waveform_sampler: bool = False,
+    ):
+    results = {}
+
+    results["construction"] = benchmark_construction(helper, conn, chip_class, repetitions)
+
+    chip = chip_class(parent=helper, i2c_controller=conn)
+    configure_addresses(chip)
+
+    results["read_all"] = time_function(chip.read_all, repetitions, conn)
+    results["write_all"] = time_function(lambda: chip.write_all(write_check=False), repetitions, conn)
+    results["write_all_with_check"] = time_function(chip.write_all, repetitions, conn)
+
+    with tempfile.TemporaryDirectory() as directory:
+        config_file = Path(directory) / "benchmark.pckl"
+        results["save_config"] = time_function(lambda: chip.save_config(config_file), repetitions)
+        results["load_config"] = time_function(lambda: chip.load_config(config_file), repetitions)
+
+    results["decoded_updates"] = benchmark_decoded_updates(chip, decoded_value, decoded_updates, conn)
+
+    if waveform_sampler:
+        results["waveform_sampler_readout"] = time_function(chip._ws_helper.read_memory, repetitions, conn)
+
+    return results
+
+def run_benchmarks(
+        latency_us: float = 0,
+        repetitions: int = 3,
+        decoded_updates: int = 1000,
+        chips: list[str] = ["ETROC2", "ETROC1"],
+    ):
+    i2c_gui.__no_connect__ = True
+    i2c_gui.__no_connect_latency_us__ = latency_us
+
+    logger = logging.getLogger("Benchmark_Logger")
+    logger.setLevel(logging.CRITICAL)  # The emulated device does not hold the written values, so the readback failure messages are expected and only add noise
+
+    Script_Helper = i2c_gui.ScriptHelper(logger)
+
+    conn = i2c_gui.Connection_Controller(Script_Helper)
+    conn.connect()
+
+    results = {
+        "commit": get_commit(),
+        "i2c_gui_version": i2c_gui.__version__,
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "latency_us": latency_us,
+        "repetitions": repetitions,
+        "chips": {},
+    }
+
+    try:
+        if "ETROC2" in chips:
+            def configure_etroc2(chip: i2c_gui.chips.ETROC2_Chip):
+                chip.config_i2c_address(0x72)
+                chip.config_waveform_sampler_i2c_address(0x73)
+
+            results["chips"]["ETROC2"] = benchmark_chip(
+                Script_Helper, conn,
+                i2c_gui.chips.ETROC2_Chip,
+                configure_etroc2,
+                ("ETROC2", "Pixel Config", "DAC"),
+                repetitions=repetitions,
+                decoded_updates=decoded_updates,
+                waveform_sampler=True,
+            )
+
+        if "ETROC1" in chips:
+            def configure_etroc1(chip: i2c_gui.chips.ETROC1_Chip):
+                chip.config_i2c_address_a(0x72)
+                chip.config_i2c_address_b(0x73)
+                chip.config_i2c_address_full_pixel(0x74)
+                chip.config_i2c_address_tdc(0x75)
+
+            results["chips"]["ETROC1"] = benchmark_chip(
+                Script_Helper, conn,
+                i2c_gui.chips.ETROC1_Chip,
+                configure_etroc1,
+                ("Array_Reg_A", "Registers", "EN_DiscriOut"),
+                repetitions=repetitions,
+                decoded_updates=decoded_updates,
+            )
+    finally:
+        conn.disconnect()
+
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark the register handling of the I2C GUI against an emulated device (no hardware needed)')
+    parser.add_argument(
+        '--latency',
+        help = 'Time (in us) taken by each emulated I2C transaction. Default: 0',
+        default = 0,
+        dest = 'latency',
+        type = float,
+    )
+    parser.add_argument(
+        '-r',
+        '--repetitions',
+        help = 'Number of times each benchmark is repeated. Default: 3',
+        default = 3,
+        dest = 'repetitions',
+        type = int,
+    )
+    parser.add_argument(
+        '--decoded-updates',
+        help = 'Number of decoded value updates to time. Default: 1000',
+        default = 1000,
+        dest = 'decoded_updates',
+        type = int,
+    )
+    parser.add_argument(
+        '--chip',
+        help = 'Chip to benchmark, can be used multiple times. Default: all chips',
+        choices = ["ETROC2", "ETROC1"],
+        action = 'append',
+        dest = 'chips',
+    )
+    parser.add_argument(
+        '-o',
+        '--output',
+        help = 'The JSON file where to store the results, if not set they are printed to the terminal',
+        default = None,
+        dest = 'output',
+        type = Path,
+    )
+
+    args = parser.parse_args()
+
+    logging.basicConfig(format='%(asctime)s - %(levelname)s:%(name)s:%(message)s', level=logging.WARNING)
+
+    chips = args.chips
+    if chips is None:
+        chips = ["ETROC2", "ETROC1"]
+
+    results = run_benchmarks(
+        latency_us=args.latency,
+        repetitions=args.repetitions,
+        decoded_updates=args.decoded_updates,
+        chips=chips,
+    )
+
+    if args.output is None:
+        print(json.dumps(results, indent=2))
+    else:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
@@ -43,7 +43,7 @@ def read_write_test(
     conn.connection_type = "USB-ISS"
     conn.handle: USB_ISS_Helper
     conn.handle.port = port
-    conn.handle.clk = 100
+    conn.handle.clk = 100  # Replaced on connect by the clock found with tune_i2c_clock for this port, if any
 
     ## For FPGA connection (not yet fully implemented)
     #conn.connection_type = "FPGA-Eth"
@@ -0,0 +1,183 @@
+#############################################################################
+# zlib License
+#
+# (C) 2023 Cristóvão Beirão da Cruz e Silva <cbeiraod@cern.ch>
+#
+# This software is provided 'as-is', without any express or implied
+# warranty.  In no event will the authors be held liable for any damages
+# arising from the use of this software.
+#
+# Permission is granted to anyone to use this software for any purpose,
+# including commercial applications, and to alter it and redistribute it
+# freely, subject to the following restrictions:
+#
+# 1. The origin of this software must not be misrepresented; you must not
+#    claim that you wrote the original software. If you use this software
+#    in a product, an acknowledgment in the product documentation would be
+#    appreciated but is not required.
+# 2. Altered source versions must be plainly marked as such, and must not be
+#    misrepresented as being the original software.
+# 3. This notice may not be removed or altered from any source distribution.
+#############################################################################
+
+# Emulates a USB-ISS module (in I2C mode) with some I2C devices attached behind a pseudo-terminal, so the
+# serial protocol used by the pipelined USB-ISS connection can be exercised without any hardware (Linux/macOS only)
+
+import os
+import tty
+import select
+
+class Fake_USB_ISS():
+    _cmd_i2c_ad1 = 0x55
+    _cmd_i2c_ad2 = 0x56
+    _cmd_i2c_test = 0x58
+    _cmd_usb_iss = 0x5A
+    _ack = 0xFF
+    _nack = 0x00
+
+    def __init__(self, devices: list[int], memory_size: int = 65536, swap_endian: bool = True, module_id: int = 0x07, firmware_version: int = 0x09):
+        # Each device is emulated as a plain memory, so written values are read back
+        self._memory = {}
+        for device in devices:
+            self._memory[device] = [0 for idx in range(memory_size)]
+        self._memory_size = memory_size
+        self._swap_endian = swap_endian  # The ETROC chips interpret the 16 bit register address with the bytes swapped
+        self._module_id = module_id
+        self._firmware_version = firmware_version
+        self._mode = 0x40
+        self._buffer = []
+        self.command_count = 0
+
+    def _command_length(self, buffer: list[int]):
+        """Length of the command at the start of the buffer, or None if it is not complete yet"""
+        command = buffer[0]
+        if command == self._cmd_usb_iss:
+            if len(buffer) < 2:
+                return None
+            if buffer[1] == 0x02:  # ISS_MODE
+                return 4
+            return 2
+        if command == self._cmd_i2c_test:
+            return 2
+        if command in [self._cmd_i2c_ad1, self._cmd_i2c_ad2]:
+            header = 4
+            if command == self._cmd_i2c_ad2:
+                header = 5
+            if len(buffer) < header:
+                return None
+            if buffer[1] & 0x01:  # Read
+                return header
+            return header + buffer[header - 1]
+        return 1  # Unknown commands are dropped
+
+    def _execute(self, command: list[int]):
+        if command[0] == self._cmd_usb_iss:
+            if command[1] == 0x01:  # ISS_VERSION
+                return [self._module_id, self._firmware_version, self._mode]
+            if command[1] == 0x02:  # ISS_MODE
+                self._mode = command[2]
+                return [self._ack, 0x00]
+            if command[1] == 0x03:  # GET_SER_NUM
+                return list(b"00000000")
+            return [self._nack, 0x05]
+
+        if command[0] == self._cmd_i2c_test:
+            if command[1] >> 1 in self._memory:
+                return [self._ack]
+            return [self._nack]
+
+        if command[0] in [self._cmd_i2c_ad1, self._cmd_i2c_ad2]:
+            device = command[1] >> 1
+            if command[0] == self._cmd_i2c_ad2:
+                memory_address = (command[2] << 8) | command[3]
+                if self._swap_endian:
+                    memory_address = (command[3] << 8) | command[2]
+                byte_count = command[4]
+                data = command[5:]
+            else:
+                memory_address = command[2]
+                byte_count = command[3]
+                data = command[4:]
+
+            if command[1] & 0x01:  # Read
+                if device not in self._memory:
+                    return [0xff for idx in range(byte_count)]  # Nothing drives the bus
+                return [self._memory[device][(memory_address + idx) % self._memory_size] for idx in range(byte_count)]
+
+            if device not in self._memory:
+                return [self._nack]
+            for idx in range(byte_count):
+                self._memory[device][(memory_address + idx) % self._memory_size] = data[idx]
+            return [self._ack]
+
+        return []
+
+    def process(self, data: bytes):
+        """Handle the bytes received from the host, returning the response bytes"""
+        self._buffer += list(data)
+        response = []
+        while len(self._buffer) > 0:
+            length = self._command_length(self._buffer)
+            if length is None or len(self._buffer) < length:
+                break
+            command = self._buffer[:length]
+            self._buffer = self._buffer[length:]
+            self.command_count += 1
+            response += self._execute(command)
+        return bytes(response)
+
+    def serve(self, latency_us: float = 0):
+        master, slave = os.openpty()
+        tty.setraw(slave)
+        print("Fake USB-ISS module available on port: {}".format(os.ttyname(slave)), flush=True)
+
+        import time
+        try:
+            while True:
+                ready, _, _ = select.select([master], [], [])
+                if master in ready:
+                    response = self.process(os.read(master, 4096))
+                    if len(response) > 0:
+                        if latency_us > 0:  # Emulate the USB round trip
+                            time.sleep(latency_us/1E6)
+                        os.write(master, response)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.close(master)
+            os.close(slave)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Emulate a USB-ISS module with I2C devices attached on a pseudo-terminal')
+    parser.add_argument(
+        '-d',
+        '--device',
+        help = 'I2C address of an emulated device, can be used multiple times. Default: 0x72',
+        action = 'append',
+        dest = 'devices',
+        type = str,
+    )
+    parser.add_argument(
+        '--no-swap-endian',
+        help = 'Interpret the 16 bit register addresses with the most significant byte first',
+        action = 'store_true',
+        dest = 'no_swap_endian',
+    )
+    parser.add_argument(
+        '--latency',
+        help = 'Time (in us) to wait before each response, to emulate the USB round trip. Default: 0',
+        default = 0,
+        dest = 'latency',
+        type = float,
+    )
+
+    args = parser.parse_args()
+
+    devices = args.devices
+    if devices is None:
+        devices = ["0x72"]
+
+    Fake_USB_ISS([int(device, 0) & 0x7f for device in devices], swap_endian=not args.no_swap_endian).serve(args.latency)
@@ -28,7 +28,56 @@ from i2c_gui.fpga_eth_helper import FPGA_ETH_Helper
 
 from pathlib import Path
 
-def test_etroc2_device_memory(
+def finalise_block_error_summary(block_error_summary: dict, register_count: int):
+    for error_type in block_error_summary:
+        if len(block_error_summary[error_type]['errors']) == register_count:
+            block_error_summary[error_type]['full_block'] = True
+        block_error_summary[error_type]['error_count'] = len(block_error_summary[error_type]['errors'])
+
+def merge_block_ref_errors(block_ref_errors: dict):
+    block_errors = {}
+    for block_ref in block_ref_errors:
+        for error_type in block_ref_errors[block_ref]:
+            if error_type not in block_errors:
+                block_errors[error_type] = {
+                    'error_count': 0,
+                    'full_block': True,  # Assume error in full block, then deassert if not
+                    'errors': {},
+                }
+            if not block_ref_errors[block_ref][error_type]['full_block']:
+                block_errors[error_type]['full_block'] = False
+            block_errors[error_type]['errors'][block_ref] = block_ref_errors[block_ref][error_type]
+            block_errors[error_type]['error_count'] += block_ref_errors[block_ref][error_type]['error_count']
+    return block_errors
+
+def merge_block_errors(block_errors: dict):
+    address_space_errors = {}
+    for block_name in block_errors:
+        for error_type in block_errors[block_name]:
+            if error_type not in address_space_errors:
+                address_space_errors[error_type] = {
+                    'error_count': 0,
+                    'full_address': True,  # Assume error in full block, then deassert if not
+                    'errors': {},
+                }
+            if not block_errors[block_name][error_type]['full_block']:
+                address_space_errors[error_type]['full_address'] = False
+            address_space_errors[error_type]['error_count'] += block_errors[block_name][error_type]['error_count']
+            address_space_errors[error_type]['errors'][block_name] = block_errors[block_name][error_type]
+    return address_space_errors
+
+def run_test_steps(steps):
+    """Run all the steps of a chip test generator and return its error summary"""
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+def test_etroc2_device_memory(*args, **kwargs):
+    return run_test_steps(test_etroc2_device_memory_steps(*args, **kwargs))
+
+def test_etroc2_device_memory_steps(
         helper: i2c_gui.ScriptHelper,
         conn: i2c_gui.Connection_Controller,
         chip: i2c_gui.chips.ETROC2_Chip,
@@ -181,39 +230,143 @@ def test_etroc2_device_memory(
                             var.set(str(original_value))  # Reset back to original state once finished
                             chip.write_register(address_space, block_name, register_name, write_check=False)
 
-                for error_type in block_error_summary:
-                    if len(block_error_summary[error_type]['errors']) == len(register_model[address_space]['Register Blocks'][block_name]['Registers']):
-                        block_error_summary[error_type]['full_block'] = True
-                    block_error_summary[error_type]['error_count'] = len(block_error_summary[error_type]['errors'])
+                finalise_block_error_summary(block_error_summary, len(register_model[address_space]['Register Blocks'][block_name]['Registers']))
 
                 block_ref_errors[block_ref] = block_error_summary
 
-            for block_ref in block_ref_errors:
-                for error_type in block_ref_errors[block_ref]:
-                    if error_type not in block_errors[block_name]:
-                        block_errors[block_name][error_type] = {
-                            'error_count': 0,
-                            'full_block': True,  # Assume error in full block, then deassert if not
-                            'errors': {},
-                        }
-                    if not block_ref_errors[block_ref][error_type]['full_block']:
-                        block_errors[block_name][error_type]['full_block'] = False
-                    block_errors[block_name][error_type]['errors'][block_ref] = block_ref_errors[block_ref][error_type]
-                    block_errors[block_name][error_type]['error_count'] += block_ref_errors[block_ref][error_type]['error_count']
-
-        address_space_errors[address_space] = {}
-        for block_name in block_errors:
-            for error_type in block_errors[block_name]:
-                if error_type not in address_space_errors[address_space]:
-                    address_space_errors[address_space][error_type] = {
-                        'error_count': 0,
-                        'full_address': True,  # Assume error in full block, then deassert if not
-                        'errors': {},
+                yield  # Each block is a step, so the tests of the chips sharing a bus can be interleaved
+
+            block_errors[block_name] = merge_block_ref_errors(block_ref_errors)
+
+        address_space_errors[address_space] = merge_block_errors(block_errors)
+
+    # TODO: what about testing the broadcast write?
+    return address_space_errors
+
+def fast_test_etroc2_device_memory(*args, **kwargs):
+    return run_test_steps(fast_test_etroc2_device_memory_steps(*args, **kwargs))
+
+def fast_test_etroc2_device_memory_steps(
+        helper: i2c_gui.ScriptHelper,
+        conn: i2c_gui.Connection_Controller,
+        chip: i2c_gui.chips.ETROC2_Chip,
+        chip_address: int = 0x72,
+        ws_address: int = None,
+        error_mask: dict[str, bool] = {}
+    ):
+    if not (i2c_gui.__no_connect__ or conn.check_i2c_device(chip_address)):
+        raise RuntimeError("Unable to reach ETROC2 device")
+
+    chip.config_i2c_address(chip_address)
+    chip.config_waveform_sampler_i2c_address(ws_address)
+
+    # Each pattern test computes the value to write into every writable register from its original value
+    pattern_tests = {
+        'bit_flip': lambda value: (value ^ 0xff) & 0xff,  # Flip the bits in the register
+        'alternating_a': lambda value: 0xaa,
+        'alternating_5': lambda value: 0x55,
+        'set': lambda value: 0xff,
+        'clear': lambda value: 0x00,
+    }
+
+    mask_individual_read = False
+    if 'individual_read' in error_mask:
+        if error_mask['individual_read']:
+            mask_individual_read = True
+    enabled_pattern_tests = []
+    for error_type in pattern_tests:
+        if not (error_type in error_mask and error_mask[error_type]):
+            enabled_pattern_tests += [error_type]
+
+    address_space_errors = {}
+    from i2c_gui.chips.etroc2_chip import register_model
+    from i2c_gui.chips.address_space_controller import Address_Space_Controller
+    for address_space_name in register_model:
+        address_space: Address_Space_Controller = chip._address_space[address_space_name]
+        if address_space._i2c_address is None:
+            continue  # For instance, when the waveform sampler address is not set
+
+        i2c_address = address_space._i2c_address
+        memory_size = address_space._memory_size
+        register_bits = address_space._register_bits
+
+        # Read the full address space to get the current status:
+        address_space.read_all()
+        original_values = list(address_space._memory)
+
+        # Instead of testing register by register, each pattern is written to the whole runs of
+        # writable registers and then the full address space is read back in a single operation
+        read_values = {}
+        if not mask_individual_read:
+            read_values['repeated_read'] = conn.read_device_memory(i2c_address, 0, memory_size, register_bits)
+        yield  # Each full address space transfer is a step, so the tests of the chips sharing a bus can be interleaved
+
+        expected_values = {}
+        for error_type in enabled_pattern_tests:
+            expected = list(original_values)
+            for start, length in address_space._writable_ranges:
+                for address in range(start, start + length):
+                    expected[address] = pattern_tests[error_type](original_values[address])
+                conn.write_device_memory(i2c_address, start, expected[start:start + length], register_bits)
+            expected_values[error_type] = expected
+            read_values[error_type] = conn.read_device_memory(i2c_address, 0, memory_size, register_bits)
+            yield
+
+        if len(expected_values) > 0:
+            # Reset back to original state once finished
+            for start, length in address_space._writable_ranges:
+                conn.write_device_memory(i2c_address, start, original_values[start:start + length], register_bits)
+            address_space.invalidate_read_cache()
+            yield
+
+        # Map the differences found back onto the registers, building the same error structure as the register by register test
+        block_errors = {}
+        for block_name in register_model[address_space_name]['Register Blocks']:
+            block_info = register_model[address_space_name]['Register Blocks'][block_name]
+            if 'Indexer' in block_info:
+                blocks = helper.get_all_indexed_blocks(block_info['Indexer'], block_name)
+            else:
+                blocks = {
+                    block_name: {
+                        'indexers': {}  # There are no indexers for standard blocks
                     }
-                if not block_errors[block_name][error_type]['full_block']:
-                    address_space_errors[address_space][error_type]['full_address'] = False
-                address_space_errors[address_space][error_type]['error_count'] += block_errors[block_name][error_type]['error_count']
-                address_space_errors[address_space][error_type]['errors'][block_name] = block_errors[block_name][error_type]
+                }
+
+            block_ref_errors = {}
+            for block_ref in blocks:
+                block_error_summary = {}
+                if not mask_individual_read:
+                    block_error_summary['repeated_read'] = {'full_block': False, 'errors': []}
+                for error_type in enabled_pattern_tests:
+                    block_error_summary[error_type] = {'full_block': False, 'errors': {}}
+
+                for register_name in block_info['Registers']:
+                    register_info = block_info['Registers'][register_name]
+                    address = address_space._register_map[str(block_ref) + "/" + register_name]
+
+                    if not mask_individual_read:
+                        if read_values['repeated_read'][address] != original_values[address]:
+                            block_error_summary['repeated_read']['errors'] += [register_name]
+
+                    if 'read_only' in register_info and register_info['read_only']:
+                        continue
+
+                    for error_type in enabled_pattern_tests:
+                        expected_value = expected_values[error_type][address]
+                        read_value = read_values[error_type][address]
+                        if read_value != expected_value:
+                            if error_type == 'bit_flip':
+                                block_error_summary[error_type]['errors'][register_name] = (expected_value, read_value)
+                            else:
+                                block_error_summary[error_type]['errors'][register_name] = read_value
+
+                finalise_block_error_summary(block_error_summary, len(block_info['Registers']))
+
+                block_ref_errors[block_ref] = block_error_summary
+
+            block_errors[block_name] = merge_block_ref_errors(block_ref_errors)
+
+        address_space_errors[address_space_name] = merge_block_errors(block_errors)
 
     # TODO: what about testing the broadcast write?
     return address_space_errors
@@ -234,7 +387,7 @@ def slow(
     conn.connection_type = "USB-ISS"
     conn.handle: USB_ISS_Helper
     conn.handle.port = port
-    conn.handle.clk = 100
+    conn.handle.clk = 100  # Replaced on connect by the clock found with tune_i2c_clock for this port, if any
 
     ## For FPGA connection (not yet fully implemented)
     #conn.connection_type = "FPGA-Eth"
@@ -281,7 +434,7 @@ def fast(
     conn.connection_type = "USB-ISS"
     conn.handle: USB_ISS_Helper
     conn.handle.port = port
-    conn.handle.clk = 100
+    conn.handle.clk = 100  # Replaced on connect by the clock found with tune_i2c_clock for this port, if any
 
     ## For FPGA connection (not yet fully implemented)
     #conn.connection_type = "FPGA-Eth"
@@ -295,9 +448,11 @@ def fast(
 
     try:
         chip = i2c_gui.chips.ETROC2_Chip(parent=Script_Helper, i2c_controller=conn)
-        #error_summary = fast_test_etroc2_device_memory(Script_Helper, conn, chip,
-        #    error_mask=error_mask,
-        #)
+        error_summary = fast_test_etroc2_device_memory(Script_Helper, conn, chip,
+            error_mask=error_mask,
+            chip_address=chip_address,
+            ws_address=ws_address,
+        )
     except Exception:  # as e:
         # print("An Exception occurred:")
         # print(repr(e))
@@ -310,6 +465,239 @@ def fast(
 
     return error_summary
 
+def test_bus(
+    port: str,
+    targets: list[tuple[int, int]],
+    error_mask: dict[str, bool],
+    run_slow: bool = False,
+    no_connect: bool = False,
+    log_level: int = None,
+    trace_file: Path = None,
+    ):
+    # Runs in a separate process for each bus, so each bus has its own Tk interpreter, connection and profiler
+    i2c_gui.__no_connect__ = no_connect
+    if log_level is not None:
+        logging.basicConfig(format='%(asctime)s - %(levelname)s:%(name)s:%(message)s', level=log_level)
+
+    from i2c_gui.profiling import profiler
+    if trace_file is not None:
+        profiler.start()
+
+    logger = logging.getLogger("Script_Logger")
+
+    Script_Helper = i2c_gui.ScriptHelper(logger)
+
+    conn = i2c_gui.Connection_Controller(Script_Helper)
+
+    ## For USB ISS connection
+    conn.connection_type = "USB-ISS"
+    conn.handle: USB_ISS_Helper
+    conn.handle.port = port
+    conn.handle.clk = 100  # Replaced on connect by the clock found with tune_i2c_clock for this port, if any
+
+    conn.connect()
+
+    test_function = fast_test_etroc2_device_memory_steps
+    if run_slow:
+        test_function = test_etroc2_device_memory_steps
+
+    # The chips sharing a bus are interleaved: the test of each chip is advanced by one step in turn,
+    # so all of them progress together and a failing chip shows up early in a long run
+    bus_errors = {}
+    try:
+        tests = {}
+        for chip_address, ws_address in targets:
+            bus_errors[(chip_address, ws_address)] = None
+            chip = i2c_gui.chips.ETROC2_Chip(parent=Script_Helper, i2c_controller=conn)
+            tests[(chip_address, ws_address)] = test_function(Script_Helper, conn, chip,
+                error_mask=error_mask,
+                chip_address=chip_address,
+                ws_address=ws_address,
+            )
+
+        while len(tests) > 0:
+            for target in list(tests.keys()):
+                try:
+                    next(tests[target])
+                except StopIteration as stop:
+                    bus_errors[target] = stop.value
+                    del tests[target]
+                except Exception:
+                    import traceback
+                    traceback.print_exc()
+                    del tests[target]
+    finally:
+        conn.disconnect()
+
+        if trace_file is not None:
+            profiler.stop()
+            profiler.save(trace_file)
+
+    return bus_errors
+
+def get_bus_trace_file(trace_file: Path, port: str):
+    """Each bus is tested in its own process, so each one saves its trace to its own file, named after the port"""
+    import re
+    port_name = re.sub(r'[^A-Za-z0-9]+', '_', port).strip('_')
+    return trace_file.with_name(f'{trace_file.stem}_{port_name}{trace_file.suffix}')
+
+def get_target_name(port: str, chip_address: int, ws_address: int = None):
+    if ws_address is None:
+        return f'{port}:{hex(chip_address)}'
+    return f'{port}:{hex(chip_address)}/{hex(ws_address)}'
+
+def multi(
+    targets: list[tuple[str, int, int]],
+    error_mask: dict[str, bool],
+    run_slow: bool = False,
+    log_level: int = None,
+    trace_file: Path = None,
+    ):
+    """Test several chips, running one worker process per bus (port) and interleaving the tests of the chips on the same bus"""
+    buses = {}
+    for port, chip_address, ws_address in targets:
+        if port not in buses:
+            buses[port] = []
+        buses[port] += [(chip_address, ws_address)]
+
+    from concurrent.futures import ProcessPoolExecutor
+    chip_errors = {}
+    with ProcessPoolExecutor(max_workers=len(buses)) as executor:
+        futures = {}
+        for port in buses:
+            bus_trace_file = None
+            if trace_file is not None:
+                bus_trace_file = get_bus_trace_file(trace_file, port)
+            futures[port] = executor.submit(test_bus, port, buses[port], error_mask, run_slow, i2c_gui.__no_connect__, log_level, bus_trace_file)
+
+        for port in futures:
+            try:
+                bus_errors = futures[port].result()
+            except Exception:
+                import traceback
+                traceback.print_exc()
+                bus_errors = {target: None for target in buses[port]}
+
+            for chip_address, ws_address in bus_errors:
+                chip_errors[get_target_name(port, chip_address, ws_address)] = bus_errors[(chip_address, ws_address)]
+
+    return chip_errors
+
+def merge_chip_errors(chip_errors: dict):
+    """Total error counts over all the chips, per address space and error type, with the list of chips that had errors"""
+    merged = {}
+    for chip_name in chip_errors:
+        errors = chip_errors[chip_name]
+        if errors is None:
+            continue
+        for address_space_name in errors:
+            if address_space_name not in merged:
+                merged[address_space_name] = {}
+            for error_type in errors[address_space_name]:
+                if error_type not in merged[address_space_name]:
+                    merged[address_space_name][error_type] = {
+                        'error_count': 0,
+                        'chips': [],
+                    }
+                error_count = errors[address_space_name][error_type]['error_count']
+                merged[address_space_name][error_type]['error_count'] += error_count
+                if error_count > 0:
+                    merged[address_space_name][error_type]['chips'] += [chip_name]
+    return merged
+
+def parse_target(target: str):
+    """Parse a target in the format port,chip_address[,ws_address]"""
+    values = target.split(",")
+    if len(values) not in [2, 3]:
+        raise ValueError("Invalid target, expected the format port,chip_address[,ws_address]: {}".format(target))
+
+    port = values[0]
+    chip_address = int(values[1], 0) & 0x7f
+    ws_address = None
+    if len(values) == 3:
+        ws_address = int(values[2], 0) & 0x7f
+    return (port, chip_address, ws_address)
+
+def print_error_summary(errors: dict):
+    offset = "  "
+    for address_space_name in errors:
+        print(offset + f'Summary of errors in the address space {address_space_name}:')
+        offset += "  "
+        errors_found = False
+        for error_type in errors[address_space_name]:
+            error_count = errors[address_space_name][error_type]['error_count']
+            if error_count > 0:
+                print(offset + f'Total {error_type} errors - {error_count}')
+                errors_found = True
+        if not errors_found:
+            print(offset + f'No errors found')
+        offset = offset[:-2]
+
+def write_error_report(file_handle, errors: dict):
+    offset = "  "
+    for address_space_name in errors:
+        file_handle.write(offset + f'In the {address_space_name} address space:\n')
+        offset += "  "
+        address_space_errors_found = False
+        for error_type in errors[address_space_name]:
+            error_count = errors[address_space_name][error_type]['error_count']
+            full_address = errors[address_space_name][error_type]['full_address']
+            if error_count > 0:
+                file_handle.write(offset + f'{error_type} Error Summary - ')
+                if full_address:
+                    file_handle.write(f'The full {address_space_name} address space had errors ({error_count}):\n')
+                else:
+                    file_handle.write(f'Some registers in the {address_space_name} address space had errors, total {error_count}:\n')
+                offset += "  "
+                for block_name in errors[address_space_name][error_type]['errors']:
+                    block_errors = errors[address_space_name][error_type]['errors'][block_name]
+                    sub_blocks = len(block_errors['errors'])
+                    block_error_count = block_errors['error_count']
+                    full_block = block_errors['full_block']
+                    if block_error_count > 0:
+                        if sub_blocks != 1:
+                            if full_block:
+                                file_handle.write(offset + f'The full block {block_name} had errors ({block_error_count}):\n')
+                            else:
+                                file_handle.write(offset + f'Some of the registers of block {block_name} had errors, found {block_error_count} errors:\n')
+                            offset += "  "
+                        for block_ref in block_errors['errors']:
+                            block_ref_errors = block_errors['errors'][block_ref]
+                            block_ref_error_count = block_ref_errors['error_count']
+                            full_block_ref = block_ref_errors['full_block']
+                            if block_ref_error_count > 0:
+                                if full_block:
+                                    file_handle.write(offset + f'The full block {block_ref} had errors ({block_ref_error_count}):\n')
+                                else:
+                                    file_handle.write(offset + f'Some of the registers of block {block_ref} had errors, found {block_ref_error_count} errors:\n')
+                                offset += "  "
+                                for register_name in block_ref_errors['errors']:
+                                    if error_type == 'repeated_read':
+                                        file_handle.write(offset + f' - Attempted to read register {register_name} in a block read and later in an individual read, but got different values\n')
+                                    elif error_type == 'bit_flip':
+                                        error_info = block_ref_errors['errors'][register_name]
+                                        file_handle.write(offset + f' - Attempted to flip the bits of the {register_name} register, but it did not work. Expected to get {hex(error_info[0])}, but got {hex(error_info[1])}\n')
+                                    elif error_type == 'alternating_a':
+                                        error_info = block_ref_errors['errors'][register_name]
+                                        file_handle.write(offset + f' - Attempted to set the register {register_name} to the value 0xAA but it did not work, got the value {hex(error_info)} instead\n')
+                                    elif error_type == 'alternating_5':
+                                        error_info = block_ref_errors['errors'][register_name]
+                                        file_handle.write(offset + f' - Attempted to set the register {register_name} to the value 0x55 but it did not work, got the value {hex(error_info)} instead\n')
+                                    elif error_type == 'set':
+                                        error_info = block_ref_errors['errors'][register_name]
+                                        file_handle.write(offset + f' - Attempted to full set the register {register_name} (value 0xFF) but it did not work, got the value {hex(error_info)} instead\n')
+                                    elif error_type == 'clear':
+                                        error_info = block_ref_errors['errors'][register_name]
+                                        file_handle.write(offset + f' - Attempted to clear the register {register_name} (value 0x00) but it did not work, got the value {hex(error_info)} instead\n')
+                                offset = offset[:-2]
+                        if sub_blocks != 1:
+                            offset = offset[:-2]
+                offset = offset[:-2]
+                address_space_errors_found = True
+        if not address_space_errors_found:
+            file_handle.write(offset + f'No errors found\n')
+        offset = offset[:-2]
+
 
 if __name__ == "__main__":
     import argparse
@@ -339,7 +727,7 @@ if __name__ == "__main__":
         type = str,
     )
     parser.add_argument(
-        '-s'
+        '-s',
         '--slow',
         help='Run the slow algorithm which checks the registers one by one (this can take a very long time)',
         action = 'store_true',
@@ -395,6 +783,13 @@ if __name__ == "__main__":
         dest = 'ws_address',
         type = str,
     )
+    parser.add_argument(
+        '--target',
+        help='Test several chips concurrently (one process per port), in the format port,chip_address[,ws_address]. Can be used multiple times, when set the port and address options are ignored',
+        action = 'append',
+        dest = 'targets',
+        type = str,
+    )
     parser.add_argument(
         '-o',
         '--output_log',
@@ -403,6 +798,13 @@ if __name__ == "__main__":
         dest = 'output_log',
         type = Path,
     )
+    parser.add_argument(
+        '--trace-file',
+        help='If set, the time spent in the chip, address space and I2C operations is recorded and saved to this file in the Chrome trace event format. With --target, one file per port is saved, with the port name appended to the file name',
+        default = None,
+        dest = 'trace_file',
+        type = Path,
+    )
 
     args = parser.parse_args()
 
@@ -454,118 +856,106 @@ if __name__ == "__main__":
     else:
         ws_address = int(args.ws_address, 0) & 0x7f
 
-    if args.slow:
-        errors = slow(
-            error_mask=error_mask,
-            port=args.port,
-            chip_address = chip_address,
-            ws_address = ws_address,
-        )
-    else:
-        errors = fast(
+    if args.targets is not None:
+        targets = [parse_target(target) for target in args.targets]
+
+        worker_log_level = None
+        if not args.log_file:
+            worker_log_level = log_level
+
+        chip_errors = multi(
+            targets,
             error_mask=error_mask,
-            port=args.port,
-            chip_address = chip_address,
-            ws_address = ws_address,
+            run_slow=args.slow,
+            log_level=worker_log_level,
+            trace_file=args.trace_file,
         )
 
-    if errors is None:
-        print("No errors found, but the error structure is empty... maybe something went wrong?")
-    else:
         print("Short error report, see the output file for the detailed error report.")
-        offset = "  "
-        for address_space_name in errors:
-            print(offset + f'Summary of errors in the address space {address_space_name}:')
-            offset += "  "
+        merged_errors = merge_chip_errors(chip_errors)
+        for address_space_name in merged_errors:
+            print(f'  Summary of errors in the address space {address_space_name} over all chips:')
             errors_found = False
-            for error_type in errors[address_space_name]:
-                error_count = errors[address_space_name][error_type]['error_count']
+            for error_type in merged_errors[address_space_name]:
+                error_count = merged_errors[address_space_name][error_type]['error_count']
                 if error_count > 0:
-                    print(offset + f'Total {error_type} errors - {error_count}')
+                    chips = ', '.join(merged_errors[address_space_name][error_type]['chips'])
+                    print(f'    Total {error_type} errors - {error_count} (in chips: {chips})')
                     errors_found = True
             if not errors_found:
-                print(offset + f'No errors found')
-            offset = offset[:-2]
+                print(f'    No errors found')
+        for chip_name in chip_errors:
+            if chip_errors[chip_name] is None:
+                print(f'  The test of the chip {chip_name} did not complete')
 
         outfile = Path(args.output_log)
         with open(outfile, mode='w') as file_handle:
-            file_handle.write("--- Detailed log of running the full ETROC2 test ---\n\nThe following parameters were set:\n")
-            file_handle.write(f' - Chip Address: {hex(chip_address)}\n')
-            if ws_address is not None:
-                file_handle.write(f' - Waveform Sampler Address: {hex(ws_address)}\n')
-            else:
-                file_handle.write(' - No Waveform Sampler Address set\n')
-            file_handle.write(f' - Port: {args.port}\n')
+            file_handle.write("--- Detailed log of running the full ETROC2 test on multiple chips ---\n\nThe following chips were tested (port:chip address/waveform sampler address):\n")
+            for chip_name in chip_errors:
+                file_handle.write(f' - {chip_name}\n')
             file_handle.write('\n')
             file_handle.write('Attempting the following tests:\n')
             for error_type in error_mask:
                 if not error_mask[error_type]:
                     file_handle.write(f' - {error_type}\n')
 
-            file_handle.write('\n')
-            file_handle.write('\n')
-            file_handle.write('The following errors were found:\n')
-
-            offset = "  "
-            for address_space_name in errors:
-                file_handle.write(offset + f'In the {address_space_name} address space:\n')
-                offset += "  "
-                address_space_errors_found = False
-                for error_type in errors[address_space_name]:
-                    error_count = errors[address_space_name][error_type]['error_count']
-                    full_address = errors[address_space_name][error_type]['full_address']
-                    if error_count > 0:
-                        file_handle.write(offset + f'{error_type} Error Summary - ')
-                        if full_address:
-                            file_handle.write(f'The full {address_space_name} address space had errors ({error_count}):\n')
-                        else:
-                            file_handle.write(f'Some registers in the {address_space_name} address space had errors, total {error_count}:\n')
-                        offset += "  "
-                        for block_name in errors[address_space_name][error_type]['errors']:
-                            block_errors = errors[address_space_name][error_type]['errors'][block_name]
-                            sub_blocks = len(block_errors['errors'])
-                            block_error_count = block_errors['error_count']
-                            full_block = block_errors['full_block']
-                            if block_error_count > 0:
-                                if sub_blocks != 1:
-                                    if full_block:
-                                        file_handle.write(offset + f'The full block {block_name} had errors ({block_error_count}):\n')
-                                    else:
-                                        file_handle.write(offset + f'Some of the registers of block {block_name} had errors, found {block_error_count} errors:\n')
-                                    offset += "  "
-                                for block_ref in block_errors['errors']:
-                                    block_ref_errors = block_errors['errors'][block_ref]
-                                    block_ref_error_count = block_ref_errors['error_count']
-                                    full_block_ref = block_ref_errors['full_block']
-                                    if block_ref_error_count > 0:
-                                        if full_block:
-                                            file_handle.write(offset + f'The full block {block_ref} had errors ({block_ref_error_count}):\n')
-                                        else:
-                                            file_handle.write(offset + f'Some of the registers of block {block_ref} had errors, found {block_ref_error_count} errors:\n')
-                                        offset += "  "
-                                        for register_name in block_ref_errors['errors']:
-                                            if error_type == 'repeated_read':
-                                                file_handle.write(offset + f' - Attempted to read register {register_name} in a block read and later in an individual read, but got different values\n')
-                                            elif error_type == 'bit_flip':
-                                                error_info = block_ref_errors['errors'][register_name]
-                                                file_handle.write(offset + f' - Attempted to flip the bits of the {register_name} register, but it did not work. Expected to get {hex(error_info[0])}, but got {hex(error_info[1])}\n')
-                                            elif error_type == 'alternating_a':
-                                                error_info = block_ref_errors['errors'][register_name]
-                                                file_handle.write(offset + f' - Attempted to set the register {register_name} to the value 0xAA but it did not work, got the value {hex(error_info)} instead\n')
-                                            elif error_type == 'alternating_5':
-                                                error_info = block_ref_errors['errors'][register_name]
-                                                file_handle.write(offset + f' - Attempted to set the register {register_name} to the value 0x55 but it did not work, got the value {hex(error_info)} instead\n')
-                                            elif error_type == 'set':
-                                                error_info = block_ref_errors['errors'][register_name]
-                                                file_handle.write(offset + f' - Attempted to full set the register {register_name} (value 0xFF) but it did not work, got the value {hex(error_info)} instead\n')
-                                            elif error_type == 'clear':
-                                                error_info = block_ref_errors['errors'][register_name]
-                                                file_handle.write(offset + f' - Attempted to clear the register {register_name} (value 0x00) but it did not work, got the value {hex(error_info)} instead\n')
-                                        offset = offset[:-2]
-                                if sub_blocks != 1:
-                                    offset = offset[:-2]
-                        offset = offset[:-2]
-                        address_space_errors_found = True
-                if not address_space_errors_found:
-                    file_handle.write(offset + f'No errors found\n')
-                offset = offset[:-2]
+            for chip_name in chip_errors:
+                file_handle.write('\n')
+                file_handle.write('\n')
+                if chip_errors[chip_name] is None:
+                    file_handle.write(f'The test of the chip {chip_name} did not complete\n')
+                    continue
+                file_handle.write(f'The following errors were found in the chip {chip_name}:\n')
+                write_error_report(file_handle, chip_errors[chip_name])
+    else:
+        if args.trace_file is not None:
+            from i2c_gui.profiling import profiler
+            profiler.start()
+
+        try:
+            if args.slow:
+                errors = slow(
+                    error_mask=error_mask,
+                    port=args.port,
+                    chip_address = chip_address,
+                    ws_address = ws_address,
+                )
+            else:
+                errors = fast(
+                    error_mask=error_mask,
+                    port=args.port,
+                    chip_address = chip_address,
+                    ws_address = ws_address,
+                )
+        finally:
+            # The trace is also saved when the test fails, it is most useful then
+            if args.trace_file is not None:
+                profiler.stop()
+                profiler.save(args.trace_file)
+
+        if errors is None:
+            print("No errors found, but the error structure is empty... maybe something went wrong?")
+        else:
+            print("Short error report, see the output file for the detailed error report.")
+            print_error_summary(errors)
+
+            outfile = Path(args.output_log)
+            with open(outfile, mode='w') as file_handle:
+                file_handle.write("--- Detailed log of running the full ETROC2 test ---\n\nThe following parameters were set:\n")
+                file_handle.write(f' - Chip Address: {hex(chip_address)}\n')
+                if ws_address is not None:
+                    file_handle.write(f' - Waveform Sampler Address: {hex(ws_address)}\n')
+                else:
+                    file_handle.write(' - No Waveform Sampler Address set\n')
+                file_handle.write(f' - Port: {args.port}\n')
+                file_handle.write('\n')
+                file_handle.write('Attempting the following tests:\n')
+                for error_type in error_mask:
+                    if not error_mask[error_type]:
+                        file_handle.write(f' - {error_type}\n')
+
+                file_handle.write('\n')
+                file_handle.write('\n')
+                file_handle.write('The following errors were found:\n')
+
+                write_error_report(file_handle, errors)
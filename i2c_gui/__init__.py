@@ -27,12 +27,14 @@ __platform__ = None  # For storing the result of automativ platform detection
 __swap_endian__ = True  # Whether to swap register address bytes to correct for mixed up endianness
 __no_connect__ = False  # Set to true if the connection to I2C is to be emulated
 __no_connect_type__ = "check" # Set the type of no connect to implement. For most uses "check" is enough, but for readback tests the "echo" option is preferred
+__no_connect_latency_us__ = 0  # Time spent by each emulated I2C transaction, to make benchmarks with no connection closer to a real device
 
 from .etroc1_gui import ETROC1_GUI
 from .etroc2_gui import ETROC2_GUI
 from .multi_gui import Multi_GUI
 from .script_helper import ScriptHelper
 from .connection_controller import Connection_Controller
+from .connection_pool import Connection_Pool
 
 from .functions import validate_8bit_register
 from .functions import validate_variable_bit_register
@@ -71,6 +73,7 @@ __all__ = [
     "Multi_GUI",
     "ScriptHelper",
     "Connection_Controller",
+    "Connection_Pool",
     "validate_8bit_register",
     "validate_variable_bit_register",
     "validate_i2c_address",
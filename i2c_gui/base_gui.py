@@ -36,13 +36,14 @@ from tkinter import filedialog as tkfd
 from tkinter.messagebox import showinfo
 
 class Base_GUI(GUI_Helper):
-    def __init__(self, title, root: tk.Tk, logger: logging.Logger, do_status: bool = True, do_global_controls: bool = True, stack_global_controls: bool = False):
+    def __init__(self, title, root: tk.Tk, logger: logging.Logger, do_status: bool = True, do_global_controls: bool = True, stack_global_controls: bool = False, prebuild_tabs: bool = True):
         super().__init__(None, ttk.Frame(root, padding="5 5 5 5"), logger)
         self._root = root
         self._title = title
         self._canvases = []
         self._min_internal_width = 0
         self._min_internal_height = 300
+        self._prebuild_tabs = prebuild_tabs
 
         from . import __platform__
         if __platform__ not in ["x11", "win32", "aqua"]:
@@ -86,28 +87,7 @@ class Base_GUI(GUI_Helper):
             self._status_display.prepare_display(self._frame, 100, 1000)
 
         self._frame.update_idletasks()
-        if hasattr(self, "_tab_frame_data"):
-            for entry in self._tab_frame_data:
-                if "canvas" not in self._tab_frame_data[entry]:
-                    frame: ttk.Frame = self._tab_frame_data[entry]["frame"]
-                    if frame.winfo_reqheight() > self._min_internal_height:
-                        self._min_internal_height = frame.winfo_reqheight()
-            for entry in self._tab_frame_data:
-                if "canvas" in self._tab_frame_data[entry]:
-                    canvas: tk.Canvas = self._tab_frame_data[entry]["canvas"]
-                    frame: ttk.Frame = self._tab_frame_data[entry]["internal frame"]
-                    scrollbar: ttk.Scrollbar = self._tab_frame_data[entry]["scrollbar"]
-
-                    canvas.config(width=frame.winfo_reqwidth(), height=min(self._min_internal_height, frame.winfo_reqheight()))
-                    canvas.config(
-                        yscrollcommand=scrollbar.set,
-                        scrollregion=(
-                            0,
-                            0,
-                            frame.winfo_reqwidth(),
-                            frame.winfo_reqheight()
-                        )
-                    )
+        self._update_tab_sizes()
 
     @property
     def is_connected(self):
@@ -209,6 +189,7 @@ class Base_GUI(GUI_Helper):
     def _create_monitor_menu_entries(self, monitormenu: tk.Menu):
         monitormenu.add_command(label='Open I2C Monitor', command=self._open_i2c_monitor)#, state='disabled')
         monitormenu.add_command(label='Open Logging Monitor', command=self._open_logging_monitor)#, state='disabled')
+        monitormenu.add_command(label='Open I2C Metrics', command=self._open_i2c_metrics)
 
     def _create_utility_menu_entries(self, utilitymenu: tk.Menu):
         utilitymenu.add_command(label='Scan I2C Devices', command=self._open_i2c_scan)#, state='disabled')
@@ -217,6 +198,10 @@ class Base_GUI(GUI_Helper):
         if hasattr(self, '_i2c_controller') and self._i2c_controller is not None:
             self._i2c_controller.display_i2c_window()
 
+    def _open_i2c_metrics(self):
+        if hasattr(self, '_i2c_controller') and self._i2c_controller is not None:
+            self._i2c_controller.display_i2c_metrics_window()
+
     def _open_logging_monitor(self):
         if hasattr(self, '_logging_helper') and self._logging_helper is not None:
             self._logging_helper.display_logging()
@@ -261,10 +246,12 @@ class Base_GUI(GUI_Helper):
 
     def _full_chip_display(self, chip: Base_Chip):
         self._tab_frame_data = {}
+        self._tab_chip = chip
         for tab in chip.tabs:
             frame = ttk.Frame(self._notebook)
             self._tab_frame_data[tab] = {
                 "frame": frame,
+                "built": False,
             }
             self.register_tab(frame, tab)
 
@@ -290,8 +277,71 @@ class Base_GUI(GUI_Helper):
                 frame.bind('<Enter>', lambda event, canvas=canvas: self._bind_canvas_to_mousewheel(canvas, event))
                 frame.bind('<Leave>', lambda event, canvas=canvas: self._unbind_canvas_from_mousewheel(canvas, event))
 
-            chip.build_tab(tab, frame)
-        pass
+            self._tab_frame_data[tab]["build frame"] = frame
+
+        # The tab contents are only built when the tab is first viewed (or when the GUI is idle) so that the window shows up quickly
+        self._notebook.bind('<<NotebookTabChanged>>', self._notebook_tab_changed)
+        self._build_selected_tab()
+        if self._prebuild_tabs:
+            # A timer and not an idle callback, since the update_idletasks at the end of __init__ would otherwise build a tab before the window shows up
+            self._frame.after(500, self._prebuild_next_tab)
+
+    def _notebook_tab_changed(self, event: tk.Event):
+        self._build_selected_tab()
+
+    def _build_selected_tab(self):
+        selected = self._notebook.select()
+        for tab in self._tab_frame_data:
+            if str(self._tab_frame_data[tab]["frame"]) == selected:
+                self._build_tab(tab)
+                break
+
+    def _build_tab(self, tab: str):
+        if self._tab_frame_data[tab]["built"]:
+            return
+
+        self._logger.trace("Building tab {}".format(tab))
+        self._tab_frame_data[tab]["built"] = True
+        self._tab_chip.build_tab(tab, self._tab_frame_data[tab]["build frame"])
+
+        self._frame.update_idletasks()
+        self._update_tab_sizes()
+
+    def _prebuild_next_tab(self):
+        for tab in self._tab_frame_data:
+            if not self._tab_frame_data[tab]["built"]:
+                self._build_tab(tab)
+                # Yield back to the event loop between tabs so the GUI stays responsive
+                self._frame.after(10, self._prebuild_next_tab)
+                break
+
+    def _update_tab_sizes(self):
+        if hasattr(self, "_tab_frame_data"):
+            for entry in self._tab_frame_data:
+                if not self._tab_frame_data[entry]["built"]:
+                    continue
+                if "canvas" not in self._tab_frame_data[entry]:
+                    frame: ttk.Frame = self._tab_frame_data[entry]["frame"]
+                    if frame.winfo_reqheight() > self._min_internal_height:
+                        self._min_internal_height = frame.winfo_reqheight()
+            for entry in self._tab_frame_data:
+                if not self._tab_frame_data[entry]["built"]:
+                    continue
+                if "canvas" in self._tab_frame_data[entry]:
+                    canvas: tk.Canvas = self._tab_frame_data[entry]["canvas"]
+                    frame: ttk.Frame = self._tab_frame_data[entry]["internal frame"]
+                    scrollbar: ttk.Scrollbar = self._tab_frame_data[entry]["scrollbar"]
+
+                    canvas.config(width=frame.winfo_reqwidth(), height=min(self._min_internal_height, frame.winfo_reqheight()))
+                    canvas.config(
+                        yscrollcommand=scrollbar.set,
+                        scrollregion=(
+                            0,
+                            0,
+                            frame.winfo_reqwidth(),
+                            frame.winfo_reqheight()
+                        )
+                    )
 
     def _update_canvas(self, canvas: tk.Canvas, window: tk._CanvasItemId, event: tk.Event):
         canvas.itemconfigure(window, width=event.width)
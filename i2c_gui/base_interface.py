@@ -49,4 +49,11 @@ class Base_Interface(GUI_Helper):
         self._enabled = True
 
     def disable(self):
-        self._enabled = False
\ No newline at end of file
+        self._enabled = False
+
+    @property
+    def notifications_suspended(self):
+        return self._parent.notifications_suspended
+
+    def refresh(self, address_space_name: str):
+        pass
\ No newline at end of file
@@ -28,10 +28,13 @@ if TYPE_CHECKING:
 from ..gui_helper import GUI_Helper
 
 from ..functions import hex_0fill
+from ..profiling import traced
 
 import tkinter as tk
 import logging
 import time
+from bisect import bisect_right
+from contextlib import contextmanager
 
 class Address_Space_Controller(GUI_Helper):
     def __init__(
@@ -58,8 +61,16 @@ class Address_Space_Controller(GUI_Helper):
 
         self._not_read = True
 
+        self._read_cache = False
+
+        self._notification_depth = 0
+        self._changed_addresses = set()
+        self._decoded_dependencies = {}
+
         self._memory = [None for val in range(self._memory_size)]
         self._read_only_map = [True for val in range(self._memory_size)]
+        self._default_memory = [None for val in range(self._memory_size)]
+        self._verified = [False for val in range(self._memory_size)]  # Whether the value in self._memory is known to match the value in the chip
 
         self._display_vars = [tk.StringVar(value = "0", name="{}_{}_Reg{}".format(self._parent._unique_name, self._name, val)) for val in range(self._memory_size)]
 
@@ -79,6 +90,7 @@ class Address_Space_Controller(GUI_Helper):
                         read_only = register_map[block_name]["Registers"][register]['read_only']
                     full_address = base_address + offset
                     self._register_map[block_name + "/" + register] = full_address
+                    self._default_memory[full_address] = register_map[block_name]["Registers"][register]['default']
                     self._display_vars[full_address].set(hex_0fill(register_map[block_name]["Registers"][register]['default'], 8))
                     self._read_only_map[full_address] = read_only
             elif "Indexer" in register_map[block_name]:
@@ -107,11 +119,16 @@ class Address_Space_Controller(GUI_Helper):
                             read_only = register_map[block_name]["Registers"][register]['read_only']
                         full_register_name = base_name + "/" + register
                         self._register_map[full_register_name] = full_address
+                        self._default_memory[full_address] = register_map[block_name]["Registers"][register]['default']
                         self._display_vars[full_address].set(hex_0fill(register_map[block_name]["Registers"][register]['default'], 8))
                         self._read_only_map[full_address] = read_only
             else:
                 self._logger.error("An impossible condition occured, there was a memory block defined which does not have a base address and does not have an indexer")
 
+        self._build_writable_ranges()
+        # Only the configuration registers are cached, status registers (and unmapped addresses) always have to be fetched from the chip
+        self._cacheable_map = [not read_only for read_only in self._read_only_map]
+
         self._decoded_display_vars = {}
         self._decoded_bit_size = {}
         if decoded_registers is not None:
@@ -149,12 +166,120 @@ class Address_Space_Controller(GUI_Helper):
         for regInfo in decoding_position_info:
             register = regInfo[0]
 
-            register_var = self._display_vars[self._register_map[block_ref + "/" + register]]
+            address = self._register_map[block_ref + "/" + register]
+            register_var = self._display_vars[address]
             self._update_decoded_value(block_ref, value, value_bits, regInfo)
-            # Note: Save ? these callbacks in case they need to be handled later
-            register_var.trace_add('write', lambda var, index, mode, block_ref=block_ref, value=value, value_bits=value_bits, position=regInfo:self._update_decoded_value(block_ref, value, value_bits, position))
+            # Note: A single trace is placed on each register, which then updates all the decoded values which depend on it
+            if address not in self._decoded_dependencies:
+                self._decoded_dependencies[address] = []
+                register_var.trace_add('write', lambda var, index, mode, address=address:self._register_updated(address))
+            self._decoded_dependencies[address] += [(block_ref, value, value_bits, regInfo)]
             self._decoded_display_vars[block_ref + "/" + value].trace_add('write', lambda var, index, mode, block_ref=block_ref, value=value, value_bits=value_bits, position=regInfo:self._update_register(block_ref, value, value_bits, position))
 
+    def _register_updated(self, address):
+        if self._notification_depth > 0:  # Decoded values are updated once, when the batch of notifications is released
+            self._changed_addresses.add(address)
+            return
+
+        for block_ref, value, value_bits, position in self._decoded_dependencies[address]:
+            self._update_decoded_value(block_ref, value, value_bits, position)
+
+    @property
+    def notifications_suspended(self):
+        return self._notification_depth > 0
+
+    @contextmanager
+    def batch_notifications(self):
+        """Suspend the per-register notifications during bulk updates and emit a single one at the end"""
+        self._notification_depth += 1
+        try:
+            yield self
+        finally:
+            if self._notification_depth == 1:
+                self._release_notifications()
+            self._notification_depth -= 1
+
+    def _release_notifications(self):
+        changed = sorted(self._changed_addresses)
+        self._changed_addresses = set()
+        if len(changed) == 0:
+            return
+
+        self._logger.trace("Releasing notifications for {} changed addresses in address space '{}'".format(len(changed), self._name))
+
+        for address in changed:
+            if address in self._decoded_dependencies:
+                for block_ref, value, value_bits, position in self._decoded_dependencies[address]:
+                    self._update_decoded_value(block_ref, value, value_bits, position)
+
+        self._parent.addresses_changed(self._name, changed)
+
+    def _set_display_var(self, address: int, value: str):
+        if self._notification_depth > 0:
+            self._changed_addresses.add(address)
+        self._display_vars[address].set(value)
+
+    def _build_writable_ranges(self):
+        # The writable ranges are stored as a sorted list of (start address, length) intervals
+        ranges = []
+        start_address = None
+        for idx in range(self._memory_size):
+            if not self._read_only_map[idx] and start_address is None:
+                start_address = idx
+            if self._read_only_map[idx] and start_address is not None:
+                ranges += [(start_address, idx - start_address)]
+                start_address = None
+        if start_address is not None:
+            ranges += [(start_address, self._memory_size - start_address)]
+
+        self._set_writable_ranges(ranges)
+
+    def _set_writable_ranges(self, ranges: list[tuple[int, int]]):
+        self._writable_ranges = ranges
+        self._writable_range_starts = [range_param[0] for range_param in ranges]
+
+        for block_name in self._blocks:
+            block = self._blocks[block_name]
+            block["Writable Ranges"] = self._get_writable_ranges(block["Base Address"], block["Length"])
+
+    def _get_writable_ranges(self, address: int, data_size: int):
+        end_address = address + data_size
+
+        idx = max(bisect_right(self._writable_range_starts, address) - 1, 0)
+        ranges = []
+        for start, length in self._writable_ranges[idx:]:
+            if start >= end_address:
+                break
+            range_start = max(start, address)
+            range_end = min(start + length, end_address)
+            if range_end > range_start:
+                ranges += [(range_start, range_end - range_start)]
+
+        return ranges
+
+    @contextmanager
+    def temporarily_writable(self, address: int, data_size: int):
+        """Temporarily lift the read only property of a range of registers, for instance for the broadcast addresses"""
+        read_only_backup = self._read_only_map[address:address + data_size]
+        ranges_backup = self._writable_ranges
+
+        self._read_only_map[address:address + data_size] = [False for idx in range(data_size)]
+
+        ranges = []
+        for start, length in sorted(self._writable_ranges + [(address, data_size)]):
+            if len(ranges) > 0 and start <= ranges[-1][0] + ranges[-1][1]:
+                last_start, last_length = ranges[-1]
+                ranges[-1] = (last_start, max(last_length, start + length - last_start))
+            else:
+                ranges += [(start, length)]
+        self._set_writable_ranges(ranges)
+
+        try:
+            yield self
+        finally:
+            self._read_only_map[address:address + data_size] = read_only_backup
+            self._set_writable_ranges(ranges_backup)
+
     def _get_indexed_block_address_range(self, block_name, indexer_info, register_map):
         indexer_function = indexer_info['function']
 
@@ -226,15 +351,14 @@ class Address_Space_Controller(GUI_Helper):
 
     def _update_register(self, block, value, bits, position):
         #self._logger.detailed_trace("Entered Address_Space_Controller._update_register(block={}, value={}, bits={}, position={})".format(block, value, bits, position))
-        register_string = "{}/{}[{}]".format(block, position[0], position[1])
-        decoded_string = "{}[{}]".format(value, position[2])
-        self._logger.detailed_trace("Attempting to update register {} from decoded value {}".format(register_string, decoded_string))
+        # Note: the log messages are only formatted if the log level is enabled, these functions are called for every register update
+        self._logger.detailed_trace("Attempting to update register %s/%s[%s] from decoded value %s[%s]", block, position[0], position[1], value, position[2])
         if hasattr(self, "_updating_from_register"):  # Avoid an infinite loop where the two variables trigger each other
             return
 
-        self._logger.trace("Updating register {} from decoded value {}".format(register_string, decoded_string))
+        self._logger.trace("Updating register %s/%s[%s] from decoded value %s[%s]", block, position[0], position[1], value, position[2])
 
-        self._updating_from_decoded_value = decoded_string
+        self._updating_from_decoded_value = (value, position[2])
 
         register_min_idx, register_max_idx = self._get_bit_index_min_max(position[1], 8)
         value_min_idx,    value_max_idx    = self._get_bit_index_min_max(position[2], bits)
@@ -254,14 +378,12 @@ class Address_Space_Controller(GUI_Helper):
 
     def _update_decoded_value(self, block, value, bits, position):
         #self._logger.detailed_trace("Entered Address_Space_Controller._update_decoded_value(block={}, value={}, bits={}, position={})".format(block, value, bits, position))
-        register_string = "{}/{}[{}]".format(block, position[0], position[1])
-        decoded_string = "{}[{}]".format(value, position[2])
-        self._logger.detailed_trace("Attempting to update decoded value {} from register {}".format(decoded_string, register_string))
+        self._logger.detailed_trace("Attempting to update decoded value %s[%s] from register %s/%s[%s]", value, position[2], block, position[0], position[1])
         if hasattr(self, "_updating_from_decoded_value"):  # Avoid an infinite loop where the two variables trigger each other
-            if self._updating_from_decoded_value == decoded_string:
+            if self._updating_from_decoded_value == (value, position[2]):
                 return
 
-        self._logger.trace("Updating decoded value {} from register {}".format(decoded_string, register_string))
+        self._logger.trace("Updating decoded value %s[%s] from register %s/%s[%s]", value, position[2], block, position[0], position[1])
 
         self._updating_from_register = True
 
@@ -311,10 +433,72 @@ class Address_Space_Controller(GUI_Helper):
 
         return (min_val, max_val)
 
+    @property
+    def read_cache(self):
+        return self._read_cache
+
+    @read_cache.setter
+    def read_cache(self, value: bool):
+        self._read_cache = value
+
+    def invalidate_read_cache(self, address: int = 0, data_size: int = None):
+        if data_size is None:
+            data_size = self._memory_size - address
+        for idx in range(address, address + data_size):
+            self._verified[idx] = False
+
+    def _get_uncached_ranges(self, address: int, data_size: int):
+        if not self._read_cache:
+            return [(address, data_size)]
+
+        ranges = []
+        range_start = None
+        for idx in range(address, address + data_size):
+            if self._cacheable_map[idx] and self._verified[idx]:
+                if range_start is not None:
+                    ranges += [(range_start, idx - range_start)]
+                    range_start = None
+            elif range_start is None:
+                range_start = idx
+        if range_start is not None:
+            ranges += [(range_start, address + data_size - range_start)]
+
+        return ranges
+
+    def _get_fetch_ranges(self, address: int, data_size: int):
+        ranges = self._get_uncached_ranges(address, data_size)
+        if ranges != [(address, data_size)]:
+            cached_size = data_size - sum([range_param[1] for range_param in ranges])
+            self._logger.trace("Serving {} of {} bytes starting at address {} in the address space '{}' from the read cache".format(cached_size, data_size, address, self._name))
+        return ranges
+
+    def _store_memory(self, address: int, data: list[int]):
+        for i in range(len(data)):
+            self._memory[address+i] = data[i]
+            self._verified[address+i] = True
+
+    def _fetch_memory(self, address: int, data_size: int):
+        for range_address, range_size in self._get_fetch_ranges(address, data_size):
+            self._store_memory(range_address, self._i2c_controller.read_device_memory(self._i2c_address, range_address, range_size, self._register_bits))
+
+    async def _fetch_memory_async(self, address: int, data_size: int):
+        for range_address, range_size in self._get_fetch_ranges(address, data_size):
+            self._store_memory(range_address, await self._i2c_controller.read_device_memory_async(self._i2c_address, range_address, range_size, self._register_bits))
+
+    def _show_memory(self, address: int, data_size: int):
+        with self.batch_notifications():
+            for idx in range(address, address + data_size):
+                self._set_display_var(idx, hex_0fill(self._memory[idx], 8))
+
+    def _load_memory_from_display(self, address: int, data_size: int):
+        for idx in range(address, address + data_size):
+            self._memory[idx] = int(self._display_vars[idx].get(), 0)
+
     def update_i2c_address(self, address: int):
         if address != self._i2c_address:
             self._i2c_address = address
             self._not_read = True
+            self.invalidate_read_cache()
 
             if address is not None:
                 self._logger.info("Updated address space '{}' to the I2C address {}".format(self._name, hex_0fill(address, 7)))
@@ -333,57 +517,155 @@ class Address_Space_Controller(GUI_Helper):
     def get_decoded_bit_size(self, value_name):
         return self._decoded_bit_size[value_name]
 
-    def read_all(self):
+    @traced("address_space")
+    def read_all(self, update_modified: bool = True):
+        # update_modified is disabled when the chip reads several address spaces as a batch and updates the modified state once
         if self._i2c_address is None:
             self.send_message("Unable to read address space '{}' because the i2c address is not set".format(self._name), "Error")
             return
 
         self._logger.info("Reading the full '{}' address space".format(self._name))
 
-        self._memory = self._i2c_controller.read_device_memory(self._i2c_address, 0, self._memory_size, self._register_bits)
-        for idx in range(self._memory_size):
-            self._display_vars[idx].set(hex_0fill(self._memory[idx], 8))
+        self._fetch_memory(0, self._memory_size)
+        self._show_memory(0, self._memory_size)
+        self._not_read = False
+
+        if update_modified:
+            self._parent.update_whether_modified()
+
+    async def read_all_async(self):
+        if self._i2c_address is None:
+            self.send_message("Unable to read address space '{}' because the i2c address is not set".format(self._name), "Error")
+            return
+
+        self._logger.info("Reading the full '{}' address space".format(self._name))
+
+        await self._fetch_memory_async(0, self._memory_size)
+        self._show_memory(0, self._memory_size)
         self._not_read = False
 
         self._parent.update_whether_modified()
 
+    @traced("address_space")
     def write_all(self, write_check: bool = True):
         if self._i2c_address is None:
             self.send_message("Unable to write address space '{}' because the i2c address is not set".format(self._name), "Error")
             return False
 
-        for val in self._read_only_map:
-            if val:
-                self._logger.info("Unable to write the full '{}' address space because the are some read only registers, breaking it into smaller blocks".format(self._name))
-                return self.write_memory_block_with_split_for_read_only(0, self._memory_size, write_check)
-
+        if self._writable_ranges != [(0, self._memory_size)]:
+            self._logger.info("Unable to write the full '{}' address space because the are some read only registers, breaking it into smaller blocks".format(self._name))
+            return self._write_ranges(self._writable_ranges, write_check)
 
         self._logger.info("Writing the full '{}' address space".format(self._name))
 
-        for idx in range(self._memory_size):
-            self._memory[idx] = int(self._display_vars[idx].get(), 0)
+        self._load_memory_from_display(0, self._memory_size)
         self._i2c_controller.write_device_memory(self._i2c_address, 0, self._memory, self._register_bits)
+        self.invalidate_read_cache()
 
+        success = True
         if write_check:
-            self._memory = self._i2c_controller.read_device_memory(self._i2c_address, 0, self._memory_size, self._register_bits)
-            failed = []
-            for i in range(self._memory_size):
-                if self._memory[i] != int(self._display_vars[i].get(), 0):
-                    failed += [i]
-                    # self._display_vars[i].set(hex_0fill(self._memory[i], 8))
-            if len(failed) != 0:
-                failed = ["0x{:0x}".format(i) for i in failed]
-                self.send_message("Failure to write the full {} address space (I2C address 0x{:0x}). The following register addresses failed to write: {}".format(self._name, self._i2c_address, ', '.join(failed)),
-                                  status="Error"
-                )
-                self._parent.update_whether_modified()
-
-                return False
+            success = self._check_written_all(self._i2c_controller.read_device_memory(self._i2c_address, 0, self._memory_size, self._register_bits))
 
         self._parent.update_whether_modified()
 
+        return success
+
+    async def write_all_async(self, write_check: bool = True):
+        if self._i2c_address is None:
+            self.send_message("Unable to write address space '{}' because the i2c address is not set".format(self._name), "Error")
+            return False
+
+        if self._writable_ranges != [(0, self._memory_size)]:
+            self._logger.info("Unable to write the full '{}' address space because the are some read only registers, breaking it into smaller blocks".format(self._name))
+            return await self._write_ranges_async(self._writable_ranges, write_check)
+
+        self._logger.info("Writing the full '{}' address space".format(self._name))
+
+        self._load_memory_from_display(0, self._memory_size)
+        await self._i2c_controller.write_device_memory_async(self._i2c_address, 0, self._memory, self._register_bits)
+        self.invalidate_read_cache()
+
+        success = True
+        if write_check:
+            success = self._check_written_all(await self._i2c_controller.read_device_memory_async(self._i2c_address, 0, self._memory_size, self._register_bits))
+
+        self._parent.update_whether_modified()
+
+        return success
+
+    @traced("address_space")
+    def write_all_transfers(self):
+        """
+        Transfer stage of a batched write of several address spaces, see Base_Chip.write_all_batched. All the writable ranges are written
+        without any readback and are returned so they can be verified later with check_written_ranges (None if the i2c address is not set)
+        """
+        if self._i2c_address is None:
+            self.send_message("Unable to write address space '{}' because the i2c address is not set".format(self._name), "Error")
+            return None
+
+        self._logger.info("Writing the {} writable ranges of the full '{}' address space".format(len(self._writable_ranges), self._name))
+
+        for address, data_size in self._writable_ranges:
+            self._load_memory_from_display(address, data_size)
+            self._i2c_controller.write_device_memory(self._i2c_address, address, self._memory[address:address+data_size], self._register_bits)
+            self.invalidate_read_cache(address, data_size)
+
+        return list(self._writable_ranges)
+
+    @traced("address_space")
+    def check_written_ranges(self, ranges: list[tuple[int, int]]):
+        """Verification stage of a batched write, all the ranges are read back with a single transfer spanning them"""
+        if len(ranges) == 0:
+            return True
+
+        start_address = ranges[0][0]
+        end_address = ranges[-1][0] + ranges[-1][1]
+        data = self._i2c_controller.read_device_memory(self._i2c_address, start_address, end_address - start_address, self._register_bits)
+
+        # Only the written registers are checked, the read only registers in between keep their previous values
+        failed = []
+        for address, data_size in ranges:
+            for idx in range(address, address + data_size):
+                self._verified[idx] = True
+                if self._memory[idx] != data[idx - start_address]:
+                    failed += [idx]
+                    self._memory[idx] = data[idx - start_address]
+        if len(failed) != 0:
+            failed = ["0x{:0x}".format(i) for i in failed]
+            self.send_message("Failure to write the full {} address space (I2C address 0x{:0x}). The following register addresses failed to write: {}".format(self._name, self._i2c_address, ', '.join(failed)),
+                              status="Error"
+            )
+            return False
+        return True
+
+    def _check_written_all(self, data: list[int]):
+        self._memory = data
+        self._verified = [True for val in range(self._memory_size)]
+        failed = []
+        for i in range(self._memory_size):
+            if self._memory[i] != int(self._display_vars[i].get(), 0):
+                failed += [i]
+                # self._display_vars[i].set(hex_0fill(self._memory[i], 8))
+        if len(failed) != 0:
+            failed = ["0x{:0x}".format(i) for i in failed]
+            self.send_message("Failure to write the full {} address space (I2C address 0x{:0x}). The following register addresses failed to write: {}".format(self._name, self._i2c_address, ', '.join(failed)),
+                              status="Error"
+            )
+            return False
         return True
 
+    @traced("address_space")
+    def tune_i2c_clock(self, block_ref: str, iterations: int = 10, board: str = ""):
+        if self._i2c_address is None:
+            self.send_message("Unable to tune the I2C clock with the address space {} because the chip address is not set".format(self._name), "Error")
+            return None
+
+        block = self._blocks[block_ref]
+        best_clk = self._i2c_controller.tune_i2c_clock(self._i2c_address, block["Base Address"], block["Length"], self._register_bits, iterations, board)
+        # The device memory was rewritten several times, do not trust the cached values
+        self.invalidate_read_cache(block["Base Address"], block["Length"])
+        return best_clk
+
     def read_memory_register(self, address):
         if self._i2c_address is None:
             self.send_message("Unable to read address space '{}' because the i2c address is not set".format(self._name), "Error")
@@ -391,12 +673,24 @@ class Address_Space_Controller(GUI_Helper):
 
         self._logger.info("Reading register at address {} in the address space '{}'".format(address, self._name))
 
-        tmp = self._i2c_controller.read_device_memory(self._i2c_address, address, 1, self._register_bits)
-        self._memory[address] = tmp[0]
-        self._display_vars[address].set(hex_0fill(tmp[0], 8))
+        self._fetch_memory(address, 1)
+        self._display_vars[address].set(hex_0fill(self._memory[address], 8))
 
         self._parent.update_whether_modified()
 
+    async def read_memory_register_async(self, address):
+        if self._i2c_address is None:
+            self.send_message("Unable to read address space '{}' because the i2c address is not set".format(self._name), "Error")
+            return
+
+        self._logger.info("Reading register at address {} in the address space '{}'".format(address, self._name))
+
+        await self._fetch_memory_async(address, 1)
+        self._display_vars[address].set(hex_0fill(self._memory[address], 8))
+
+        self._parent.update_whether_modified()
+
+    @traced("address_space")
     def write_memory_register(self, address, write_check: bool = True):
         if self._i2c_address is None:
             self.send_message("Unable to write address space '{}' because the i2c address is not set".format(self._name), "Error")
@@ -408,28 +702,55 @@ class Address_Space_Controller(GUI_Helper):
 
         self._logger.info("Writing register at address {} in the address space '{}'".format(address, self._name))
 
-        self._memory[address] = int(self._display_vars[address].get(), 0)
+        self._load_memory_from_display(address, 1)
         self._i2c_controller.write_device_memory(self._i2c_address, address, [self._memory[address]], self._register_bits)
+        self._verified[address] = False
 
+        success = True
         if write_check:
             #time.sleep(self._readback_delay_us/10E6)  # because sleep accepts seconds
 
-            tmp = self._i2c_controller.read_device_memory(self._i2c_address, address, 1, self._register_bits)
-            if self._memory[address] != tmp[0]:
-                self.send_message("Failure to write register at address 0x{:0x} in the {} address space (I2C address 0x{:0x})".format(address, self._name, self._i2c_address),
-                                  status="Error"
-                )
-                self._memory[address] = tmp[0]
-                # self._display_vars[address].set(hex_0fill(tmp[0], 8))
+            success = self._check_written_register(address, self._i2c_controller.read_device_memory(self._i2c_address, address, 1, self._register_bits))
+
+        self._parent.update_whether_modified()
+
+        return success
+
+    async def write_memory_register_async(self, address, write_check: bool = True):
+        if self._i2c_address is None:
+            self.send_message("Unable to write address space '{}' because the i2c address is not set".format(self._name), "Error")
+            return False
+
+        if self._read_only_map[address]:
+            self._logger.info("Unable to write to the register at address {} in the address space '{}' because it is read only".format(address, self._name))
+            return False
 
-                self._parent.update_whether_modified()
+        self._logger.info("Writing register at address {} in the address space '{}'".format(address, self._name))
 
-                return False
+        self._load_memory_from_display(address, 1)
+        await self._i2c_controller.write_device_memory_async(self._i2c_address, address, [self._memory[address]], self._register_bits)
+        self._verified[address] = False
+
+        success = True
+        if write_check:
+            success = self._check_written_register(address, await self._i2c_controller.read_device_memory_async(self._i2c_address, address, 1, self._register_bits))
 
         self._parent.update_whether_modified()
 
+        return success
+
+    def _check_written_register(self, address: int, data: list[int]):
+        self._verified[address] = True
+        if self._memory[address] != data[0]:
+            self.send_message("Failure to write register at address 0x{:0x} in the {} address space (I2C address 0x{:0x})".format(address, self._name, self._i2c_address),
+                              status="Error"
+            )
+            self._memory[address] = data[0]
+            # self._display_vars[address].set(hex_0fill(data[0], 8))
+            return False
         return True
 
+    @traced("address_space")
     def read_memory_block(self, address, data_size):
         if self._i2c_address is None:
             self.send_message("Unable to read address space '{}' because the i2c address is not set".format(self._name), "Error")
@@ -437,26 +758,27 @@ class Address_Space_Controller(GUI_Helper):
 
         self._logger.info("Reading a block of {} bytes starting at address {} in the address space '{}'".format(data_size, address, self._name))
 
-        tmp = self._i2c_controller.read_device_memory(self._i2c_address, address, data_size, self._register_bits)
-        for i in range(data_size):
-            self._memory[address+i] = tmp[i]
-            self._display_vars[address+i].set(hex_0fill(tmp[i], 8))
+        self._fetch_memory(address, data_size)
+        self._show_memory(address, data_size)
 
         self._parent.update_whether_modified()
 
-    def write_memory_block_with_split_for_read_only(self, address, data_size, write_check: bool = True):
-        start_address = None
-        ranges = []
+    async def read_memory_block_async(self, address, data_size):
+        if self._i2c_address is None:
+            self.send_message("Unable to read address space '{}' because the i2c address is not set".format(self._name), "Error")
+            return
 
-        for idx in range(data_size):
-            if not self._read_only_map[address + idx] and start_address is None:
-                start_address = address + idx
-            if self._read_only_map[address + idx] and start_address is not None:
-                ranges += [(start_address, address + idx - start_address)]
-                start_address = None
-        if start_address is not None:
-            ranges += [(start_address, address + idx - start_address + 1)]
+        self._logger.info("Reading a block of {} bytes starting at address {} in the address space '{}'".format(data_size, address, self._name))
+
+        await self._fetch_memory_async(address, data_size)
+        self._show_memory(address, data_size)
+
+        self._parent.update_whether_modified()
+
+    def write_memory_block_with_split_for_read_only(self, address, data_size, write_check: bool = True):
+        return self._write_ranges(self._get_writable_ranges(address, data_size), write_check)
 
+    def _write_ranges(self, ranges: list[tuple[int, int]], write_check: bool = True):
         success = True
         self._logger.info("Found {} ranges without read only registers".format(len(ranges)))
         for range_param in ranges:
@@ -469,49 +791,86 @@ class Address_Space_Controller(GUI_Helper):
 
         return success
 
+    async def _write_ranges_async(self, ranges: list[tuple[int, int]], write_check: bool = True):
+        success = True
+        self._logger.info("Found {} ranges without read only registers".format(len(ranges)))
+        for range_param in ranges:
+            if range_param[1] == 1:
+                if not await self.write_memory_register_async(range_param[0], write_check):
+                    success = False
+            else:
+                if not await self.write_memory_block_async(range_param[0], range_param[1], write_check):
+                    success = False
+
+        return success
+
+    @traced("address_space")
     def write_memory_block(self, address, data_size, write_check: bool = True):
         if self._i2c_address is None:
             self.send_message("Unable to write address space '{}' because the i2c address is not set".format(self._name), "Error")
             return False
 
-        has_read_only = False
-        for idx in range(data_size):
-            if self._read_only_map[address + idx]:
-                has_read_only = True
-                break
-        if has_read_only:
+        ranges = self._get_writable_ranges(address, data_size)
+        if ranges != [(address, data_size)]:
             self._logger.info("The block of {} bytes starting at address {} in the address space '{}' covers one or more registers which are read only, it will be broken down into smaller blocks which do not cover the read only registers".format(data_size, address, self._name))
-            self.write_memory_block_with_split_for_read_only(address, data_size, write_check)
+            self._write_ranges(ranges, write_check)
             return False
 
         self._logger.info("Writing a block of {} bytes starting at address {} in the address space '{}'".format(data_size, address, self._name))
 
-        for i in range(data_size):
-            self._memory[address+i] = int(self._display_vars[address+i].get(), 0)
+        self._load_memory_from_display(address, data_size)
         self._i2c_controller.write_device_memory(self._i2c_address, address, self._memory[address:address+data_size], self._register_bits)
+        self.invalidate_read_cache(address, data_size)
 
+        success = True
         if write_check:
             #time.sleep(self._readback_delay_us/10E6)  # because sleep accepts seconds
 
-            tmp = self._i2c_controller.read_device_memory(self._i2c_address, address, data_size, self._register_bits)
-            failed = []
-            for i in range(data_size):
-                if self._memory[address+i] != tmp[i]:
-                    failed += [address+i]
-                    self._memory[address+i] = tmp[i]
-                    # self._display_vars[address+i].set(hex_0fill(tmp[i], 8))
-            if len(failed) != 0:
-                failed = ["0x{:0x}".format(i) for i in failed]
-                self.send_message("Failure to write memory block at address 0x{:0x} with length {} in the {} address space (I2C address 0x{:0x}). The following register addresses failed to write: {}".format(address, data_size, self._name, self._i2c_address, ', '.join(failed)),
-                                  status="Error"
-                )
+            success = self._check_written_block(address, data_size, self._i2c_controller.read_device_memory(self._i2c_address, address, data_size, self._register_bits))
+
+        self._parent.update_whether_modified()
+
+        return success
+
+    async def write_memory_block_async(self, address, data_size, write_check: bool = True):
+        if self._i2c_address is None:
+            self.send_message("Unable to write address space '{}' because the i2c address is not set".format(self._name), "Error")
+            return False
+
+        ranges = self._get_writable_ranges(address, data_size)
+        if ranges != [(address, data_size)]:
+            self._logger.info("The block of {} bytes starting at address {} in the address space '{}' covers one or more registers which are read only, it will be broken down into smaller blocks which do not cover the read only registers".format(data_size, address, self._name))
+            await self._write_ranges_async(ranges, write_check)
+            return False
+
+        self._logger.info("Writing a block of {} bytes starting at address {} in the address space '{}'".format(data_size, address, self._name))
 
-                self._parent.update_whether_modified()
+        self._load_memory_from_display(address, data_size)
+        await self._i2c_controller.write_device_memory_async(self._i2c_address, address, self._memory[address:address+data_size], self._register_bits)
+        self.invalidate_read_cache(address, data_size)
 
-                return False
+        success = True
+        if write_check:
+            success = self._check_written_block(address, data_size, await self._i2c_controller.read_device_memory_async(self._i2c_address, address, data_size, self._register_bits))
 
         self._parent.update_whether_modified()
 
+        return success
+
+    def _check_written_block(self, address: int, data_size: int, data: list[int]):
+        failed = []
+        for i in range(data_size):
+            self._verified[address+i] = True
+            if self._memory[address+i] != data[i]:
+                failed += [address+i]
+                self._memory[address+i] = data[i]
+                # self._display_vars[address+i].set(hex_0fill(data[i], 8))
+        if len(failed) != 0:
+            failed = ["0x{:0x}".format(i) for i in failed]
+            self.send_message("Failure to write memory block at address 0x{:0x} with length {} in the {} address space (I2C address 0x{:0x}). The following register addresses failed to write: {}".format(address, data_size, self._name, self._i2c_address, ', '.join(failed)),
+                              status="Error"
+            )
+            return False
         return True
 
     def read_block(self, block_name):
@@ -524,6 +883,16 @@ class Address_Space_Controller(GUI_Helper):
 
         self.read_memory_block(block["Base Address"], block["Length"])
 
+    async def read_block_async(self, block_name):
+        if self._i2c_address is None:
+            self.send_message("Unable to read address space '{}' because the i2c address is not set".format(self._name), "Error")
+            return
+
+        block = self._blocks[block_name]
+        self._logger.info("Attempting to read block {}".format(block_name))
+
+        await self.read_memory_block_async(block["Base Address"], block["Length"])
+
     def write_block(self, block_name, write_check: bool = True):
         if self._i2c_address is None:
             self.send_message("Unable to write address space '{}' because the i2c address is not set".format(self._name), "Error")
@@ -532,10 +901,30 @@ class Address_Space_Controller(GUI_Helper):
         block = self._blocks[block_name]
         self._logger.info("Attempting to write block {}".format(block_name))
 
+        if block["Writable Ranges"] != [(block["Base Address"], block["Length"])]:
+            self._logger.info("The block {} in the address space '{}' covers one or more registers which are read only, it will be broken down into smaller blocks which do not cover the read only registers".format(block_name, self._name))
+            self._write_ranges(block["Writable Ranges"], write_check)
+            return False
+
         return self.write_memory_block(block["Base Address"], block["Length"], write_check)
 
+    async def write_block_async(self, block_name, write_check: bool = True):
+        if self._i2c_address is None:
+            self.send_message("Unable to write address space '{}' because the i2c address is not set".format(self._name), "Error")
+            return False
+
+        block = self._blocks[block_name]
+        self._logger.info("Attempting to write block {}".format(block_name))
+
+        if block["Writable Ranges"] != [(block["Base Address"], block["Length"])]:
+            self._logger.info("The block {} in the address space '{}' covers one or more registers which are read only, it will be broken down into smaller blocks which do not cover the read only registers".format(block_name, self._name))
+            await self._write_ranges_async(block["Writable Ranges"], write_check)
+            return False
+
+        return await self.write_memory_block_async(block["Base Address"], block["Length"], write_check)
+
     def read_register(self, block_name, register_name):
-        self._logger.detailed_trace(f'Address_Space_Controller::read_register("{block_name}", "{register_name}")')
+        self._logger.detailed_trace('Address_Space_Controller::read_register("%s", "%s")', block_name, register_name)
         if self._i2c_address is None:
             self.send_message("Unable to read address space '{}' because the i2c address is not set".format(self._name), "Error")
             return
@@ -544,6 +933,15 @@ class Address_Space_Controller(GUI_Helper):
 
         self.read_memory_register(self._register_map[block_name + "/" + register_name])
 
+    async def read_register_async(self, block_name, register_name):
+        if self._i2c_address is None:
+            self.send_message("Unable to read address space '{}' because the i2c address is not set".format(self._name), "Error")
+            return
+
+        self._logger.info("Attempting to read register {} in block {}".format(register_name, block_name))
+
+        await self.read_memory_register_async(self._register_map[block_name + "/" + register_name])
+
     def write_register(self, block_name, register_name, write_check: bool = True):
         if self._i2c_address is None:
             self.send_message("Unable to write address space '{}' because the i2c address is not set".format(self._name), "Error")
@@ -553,41 +951,47 @@ class Address_Space_Controller(GUI_Helper):
 
         return self.write_memory_register(self._register_map[block_name + "/" + register_name], write_check)
 
-    def reset(self):
-        register_count = len(self._register_map)
-        count = 0
+    async def write_register_async(self, block_name, register_name, write_check: bool = True):
+        if self._i2c_address is None:
+            self.send_message("Unable to write address space '{}' because the i2c address is not set".format(self._name), "Error")
+            return False
+
+        self._logger.info("Attempting to write register {} in block {}".format(register_name, block_name))
+
+        return await self.write_memory_register_async(self._register_map[block_name + "/" + register_name], write_check)
+
+    def _set_display_from_array(self, values: list[int], progress_message: str):
+        # Only the addresses where the displayed value differs are touched, so that the
+        # (expensive) variable traces only fire for registers which actually change
+        changed = []
+        for idx in range(self._memory_size):
+            if values[idx] is None:
+                continue
+            value = hex_0fill(values[idx], 8)
+            if self._display_vars[idx].get() != value:
+                changed += [(idx, value)]
+
+        change_count = len(changed)
         lastUpdateTime = time.time_ns()
-        for register_ref in self._register_map:
-            thisTime = time.time_ns()
-            if thisTime - lastUpdateTime > 0.3 * 10**9:
-                lastUpdateTime = thisTime
-                self.display_progress("Resetting:", count*100./register_count)
-                #self._parent._parent._frame.update_idletasks()
-                self._parent._parent._frame.update()
-
-            full_address = self._register_map[register_ref]
-
-            register_info = register_ref.split("/")
-            block_ref = register_info[0]
-            register_name = register_info[1]
-            block_info = block_ref.split(":")
-            block_name = block_info[0]
-
-            default_value = self._register_map_metadata[block_name]["Registers"][register_name]['default']
-            self._display_vars[full_address].set(hex_0fill(default_value, 8))
-            count += 1
+        with self.batch_notifications():
+            for count in range(change_count):
+                thisTime = time.time_ns()
+                if thisTime - lastUpdateTime > 0.3 * 10**9:
+                    lastUpdateTime = thisTime
+                    self.display_progress(progress_message, count*100./change_count)
+                    #self._parent._parent._frame.update_idletasks()
+                    self._parent._parent._frame.update()
+
+                idx, value = changed[count]
+                self._set_display_var(idx, value)
         self.clear_progress()
 
+        return change_count
+
+    @traced("address_space")
+    def reset(self):
+        self._set_display_from_array(self._default_memory, "Resetting:")
+
+    @traced("address_space")
     def revert(self):
-        lastUpdateTime = time.time_ns()
-        for idx in range(self._memory_size):
-            thisTime = time.time_ns()
-            if thisTime - lastUpdateTime > 0.3 * 10**9:
-                lastUpdateTime = thisTime
-                self.display_progress("Reverting:", idx*100./self._memory_size)
-                #self._parent._parent._frame.update_idletasks()
-                self._parent._parent._frame.update()
-
-            if self._memory[idx] is not None:
-                self._display_vars[idx].set(hex_0fill(self._memory[idx], 8))
-        self.clear_progress()
+        self._set_display_from_array(self._memory, "Reverting:")
@@ -37,6 +37,7 @@ import itertools
 import pickle
 
 from ..functions import hex_0fill
+from ..profiling import traced
 
 class Base_Chip(GUI_Helper):
     newid = itertools.count()
@@ -60,6 +61,9 @@ class Base_Chip(GUI_Helper):
         self._indexer_array = {}
         self._block_array_display_vars = {}
         self._block_array_decoded_display_vars = {}
+        self._indexed_block_refs = {}
+        self._indexed_vars = {}
+        self._decoded_indexed_vars = {}
 
         self._enable_readback = True
 
@@ -110,7 +114,28 @@ class Base_Chip(GUI_Helper):
     def enable_readback(self, value: bool):
         self._enable_readback = value
 
+    @property
+    def read_cache(self):
+        for name in self._address_space:
+            if not self._address_space[name].read_cache:
+                return False
+        return True
+
+    @read_cache.setter
+    def read_cache(self, value: bool):
+        # Configuration registers are served from the last value verified in the chip, status registers are always read
+        for name in self._address_space:
+            self._address_space[name].read_cache = value
+
+    def invalidate_read_cache(self, address_space_name: str = None):
+        for name in self._address_space:
+            if address_space_name is None or name == address_space_name:
+                self._address_space[name].invalidate_read_cache()
+
     def _connection_update(self, value):
+        # The chip may have been power cycled or swapped while disconnected
+        self.invalidate_read_cache()
+
         for element_name in self._toggle_elements:
             reverse_polarity = self._toggle_elements[element_name][0]
             element = self._toggle_elements[element_name][1]
@@ -196,6 +221,7 @@ class Base_Chip(GUI_Helper):
             if val != init_val:
                 self._indexer_vars[indexer]['variable'].set(val)
 
+    @traced("chip")
     def save_config(self, config_file: str):
         info = {
         }
@@ -213,6 +239,7 @@ class Base_Chip(GUI_Helper):
 
         self.save_pickle_file(config_file, info)
 
+    @traced("chip")
     def load_config(self, config_file: str):
         info = self.load_pickle_file(config_file)
 
@@ -220,16 +247,19 @@ class Base_Chip(GUI_Helper):
             address_space: Address_Space_Controller = self._address_space[address_space_name]
             size = address_space._memory_size
 
-            for idx in range(size):
-                address_space._display_vars[idx].set(hex_0fill(info[address_space_name][idx], 8))
+            with address_space.batch_notifications():
+                for idx in range(size):
+                    address_space._set_display_var(idx, hex_0fill(info[address_space_name][idx], 8))
 
         self.update_whether_modified()
 
+    @traced("chip")
     def reset_config(self):
         for name in self._address_space:
             self._address_space[name].reset()
         self.update_whether_modified()
 
+    @traced("chip")
     def revert_config(self):
         for name in self._address_space:
             if self._address_space[name].is_modified:
@@ -328,10 +358,12 @@ class Base_Chip(GUI_Helper):
         if name in self._tabs:
             self._tabs.__delitem__(name)
 
+    @traced("chip")
     def read_all(self):
         for address_space in self._address_space:
             self.read_all_address_space(address_space)
 
+    @traced("chip")
     def write_all(self, write_check: bool = True):
         success = True
         for address_space in self._address_space:
@@ -340,19 +372,104 @@ class Base_Chip(GUI_Helper):
 
         return success
 
+    async def read_all_async(self):
+        for address_space in self._address_space:
+            await self.read_all_address_space_async(address_space)
+
+    async def write_all_async(self, write_check: bool = True):
+        success = True
+        for address_space in self._address_space:
+            if not await self.write_all_address_space_async(address_space, write_check=write_check):
+                success = False
+
+        return success
+
+    @traced("chip")
+    def read_all_batched(self, address_space_names: list[str] = None):
+        """
+        Read several address spaces (all by default) as a single batch: the bus is held for all the transfers, so no other
+        thread interleaves with them, and the modified state of the chip is only updated once at the end
+        """
+        if address_space_names is None:
+            address_space_names = list(self._address_space.keys())
+
+        with self._i2c_controller.exclusive_access():
+            for address_space_name in address_space_names:
+                self._logger.info("Reading full address space: {}".format(address_space_name))
+                address_space: Address_Space_Controller = self._address_space[address_space_name]
+                address_space.read_all(update_modified=False)
+
+        self.update_whether_modified()
+
+    @traced("chip")
+    def write_all_batched(self, address_space_names: list[str] = None, write_check: bool = True):
+        """
+        Write several address spaces (all by default) as a single batch: all the writes are issued first, then a single
+        verification pass reads back each address space and the modified state of the chip is only updated once at the end
+        """
+        if address_space_names is None:
+            address_space_names = list(self._address_space.keys())
+
+        success = True
+        written_ranges = {}
+        with self._i2c_controller.exclusive_access():
+            for address_space_name in address_space_names:
+                self._logger.info("Writing full address space: {}".format(address_space_name))
+                address_space: Address_Space_Controller = self._address_space[address_space_name]
+                ranges = address_space.write_all_transfers()
+                if ranges is None:
+                    success = False
+                else:
+                    written_ranges[address_space_name] = ranges
+
+            if write_check:
+                for address_space_name in written_ranges:
+                    address_space: Address_Space_Controller = self._address_space[address_space_name]
+                    if not address_space.check_written_ranges(written_ranges[address_space_name]):
+                        success = False
+
+        self.update_whether_modified()
+
+        return success
+
     def update_whether_modified(self):
         pass
 
+    @property
+    def notifications_suspended(self):
+        for name in self._address_space:
+            if self._address_space[name].notifications_suspended:
+                return True
+        return False
+
+    def addresses_changed(self, address_space_name: str, addresses: list[int]):
+        # Called once at the end of a batch of bulk updates, so the displayed widgets are refreshed only once
+        for interface in self._displayed_interfaces:
+            self._displayed_interfaces[interface].refresh(address_space_name)
+
+    @traced("chip")
     def read_all_address_space(self, address_space_name: str):
         self._logger.info("Reading full address space: {}".format(address_space_name))
         address_space: Address_Space_Controller = self._address_space[address_space_name]
         address_space.read_all()
 
+    @traced("chip")
     def write_all_address_space(self, address_space_name: str, write_check: bool = True):
         self._logger.info("Writing full address space: {}".format(address_space_name))
         address_space: Address_Space_Controller = self._address_space[address_space_name]
         return address_space.write_all(write_check=write_check)
 
+    async def read_all_address_space_async(self, address_space_name: str):
+        self._logger.info("Reading full address space: {}".format(address_space_name))
+        address_space: Address_Space_Controller = self._address_space[address_space_name]
+        await address_space.read_all_async()
+
+    async def write_all_address_space_async(self, address_space_name: str, write_check: bool = True):
+        self._logger.info("Writing full address space: {}".format(address_space_name))
+        address_space: Address_Space_Controller = self._address_space[address_space_name]
+        return await address_space.write_all_async(write_check=write_check)
+
+    @traced("chip")
     def read_all_block(self, address_space_name: str, block_name: str, full_array: bool = False):
         self._validate_indexers()
         block_ref, _ = self._gen_block_ref_from_indexers(
@@ -365,6 +482,7 @@ class Base_Chip(GUI_Helper):
         address_space: Address_Space_Controller = self._address_space[address_space_name]
         address_space.read_block(block_ref)
 
+    @traced("chip")
     def write_all_block(self, address_space_name: str, block_name: str, full_array: bool = False, write_check: bool = True):
         self._validate_indexers()
         block_ref, _ = self._gen_block_ref_from_indexers(
@@ -377,6 +495,36 @@ class Base_Chip(GUI_Helper):
         address_space: Address_Space_Controller = self._address_space[address_space_name]
         return address_space.write_block(block_ref, write_check=write_check)
 
+    async def read_all_block_async(self, address_space_name: str, block_name: str, full_array: bool = False):
+        self._validate_indexers()
+        block_ref, _ = self._gen_block_ref_from_indexers(
+            address_space_name=address_space_name,
+            block_name=block_name,
+            full_array=full_array,
+        )
+
+        self.send_message("Reading block {} from address space {} of chip {}".format(block_ref, address_space_name, self._chip_name))
+        address_space: Address_Space_Controller = self._address_space[address_space_name]
+        await address_space.read_block_async(block_ref)
+
+    async def write_all_block_async(self, address_space_name: str, block_name: str, full_array: bool = False, write_check: bool = True):
+        self._validate_indexers()
+        block_ref, _ = self._gen_block_ref_from_indexers(
+            address_space_name=address_space_name,
+            block_name=block_name,
+            full_array=full_array,
+        )
+
+        self.send_message("Writing block {} from address space {} of chip {}".format(block_ref, address_space_name, self._chip_name))
+        address_space: Address_Space_Controller = self._address_space[address_space_name]
+        return await address_space.write_block_async(block_ref, write_check=write_check)
+
+    def tune_i2c_clock(self, address_space_name: str, block_name: str, iterations: int = 10, board: str = ""):
+        """Tune the I2C clock with verified bursts on a block whose current contents are safe to rewrite"""
+        self.send_message("Tuning the I2C clock with block {} from address space {} of chip {}".format(block_name, address_space_name, self._chip_name))
+        address_space: Address_Space_Controller = self._address_space[address_space_name]
+        return address_space.tune_i2c_clock(block_name, iterations=iterations, board=board)
+
     def _gen_block_ref_from_indexers(self, address_space_name: str, block_name: str, full_array: bool):
         block_ref = block_name
         params = {'block': block_name}
@@ -408,21 +556,23 @@ class Base_Chip(GUI_Helper):
 
         return block_ref, params
 
+    @traced("chip")
     def read_register(self, address_space_name: str, block_name: str, register: str, no_message: bool = False):
-        self._logger.detailed_trace(f'Base_Chip::read_register("{address_space_name}", "{block_name}", "{register}", {no_message})')
+        self._logger.detailed_trace('Base_Chip::read_register("%s", "%s", "%s", %s)', address_space_name, block_name, register, no_message)
         self._validate_indexers()
         block_ref, _ = self._gen_block_ref_from_indexers(
             address_space_name=address_space_name,
             block_name=block_name,
             full_array=False,
         )
-        self._logger.detailed_trace(f'   Got block_ref={block_ref}')
+        self._logger.detailed_trace('   Got block_ref=%s', block_ref)
 
         if not no_message:
             self.send_message("Reading register {} from block {} of address space {} of chip {}".format(register, block_ref, address_space_name, self._chip_name))
         address_space: Address_Space_Controller = self._address_space[address_space_name]
         address_space.read_register(block_ref, register)
 
+    @traced("chip")
     def write_register(self, address_space_name: str, block_name: str, register: str, write_check: bool = True, no_message: bool = False):
         self._validate_indexers()
         block_ref, _ = self._gen_block_ref_from_indexers(
@@ -436,6 +586,7 @@ class Base_Chip(GUI_Helper):
         address_space: Address_Space_Controller = self._address_space[address_space_name]
         return address_space.write_register(block_ref, register, write_check=write_check)
 
+    @traced("chip")
     def read_decoded_value(self, address_space_name: str, block_name: str, decoded_value_name: str, no_message: bool = False):
         value_info = self._register_decoding[address_space_name]['Register Blocks'][block_name][decoded_value_name]
 
@@ -443,6 +594,7 @@ class Base_Chip(GUI_Helper):
             register = position[0]
             self.read_register(address_space_name, block_name, register, no_message=no_message)
 
+    @traced("chip")
     def write_decoded_value(self, address_space_name: str, block_name: str, decoded_value_name: str, write_check: bool = True, no_message: bool = False):
         value_info = self._register_decoding[address_space_name]['Register Blocks'][block_name][decoded_value_name]
 
@@ -450,15 +602,63 @@ class Base_Chip(GUI_Helper):
             register = position[0]
             self.write_register(address_space_name, block_name, register, write_check, no_message=no_message)
 
+    async def read_register_async(self, address_space_name: str, block_name: str, register: str, no_message: bool = False):
+        self._validate_indexers()
+        block_ref, _ = self._gen_block_ref_from_indexers(
+            address_space_name=address_space_name,
+            block_name=block_name,
+            full_array=False,
+        )
+
+        if not no_message:
+            self.send_message("Reading register {} from block {} of address space {} of chip {}".format(register, block_ref, address_space_name, self._chip_name))
+        address_space: Address_Space_Controller = self._address_space[address_space_name]
+        await address_space.read_register_async(block_ref, register)
+
+    async def write_register_async(self, address_space_name: str, block_name: str, register: str, write_check: bool = True, no_message: bool = False):
+        self._validate_indexers()
+        block_ref, _ = self._gen_block_ref_from_indexers(
+            address_space_name=address_space_name,
+            block_name=block_name,
+            full_array=False,
+        )
+
+        if not no_message:
+            self.send_message("Writing register {} from block {} of address space {} of chip {}".format(register, block_ref, address_space_name, self._chip_name))
+        address_space: Address_Space_Controller = self._address_space[address_space_name]
+        return await address_space.write_register_async(block_ref, register, write_check=write_check)
+
+    async def read_decoded_value_async(self, address_space_name: str, block_name: str, decoded_value_name: str, no_message: bool = False):
+        value_info = self._register_decoding[address_space_name]['Register Blocks'][block_name][decoded_value_name]
+
+        for position in value_info['position']:
+            register = position[0]
+            await self.read_register_async(address_space_name, block_name, register, no_message=no_message)
+
+    async def write_decoded_value_async(self, address_space_name: str, block_name: str, decoded_value_name: str, write_check: bool = True, no_message: bool = False):
+        value_info = self._register_decoding[address_space_name]['Register Blocks'][block_name][decoded_value_name]
+
+        for position in value_info['position']:
+            register = position[0]
+            await self.write_register_async(address_space_name, block_name, register, write_check, no_message=no_message)
+
     def tab_needs_canvas(self, tab: str):
         return self._tabs[tab]["canvas"]
 
     def build_tab(self, tab: str, frame: ttk.Frame):
+        existing_interfaces = list(self._displayed_interfaces.keys())
+
         if "builder" not in self._tabs[tab].keys():
             self.empty_tab_builder(frame)
         else:
             self._tabs[tab]["builder"](frame)
 
+        # Tabs may be built after the connection was established, in which case the new interfaces must be enabled
+        if self.is_connected:
+            for interface in self._displayed_interfaces:
+                if interface not in existing_interfaces:
+                    self._displayed_interfaces[interface].enable()
+
     def empty_tab_builder(self, frame: ttk.Frame):
         self._empty_label = ttk.Label(frame, text="This is an empty placeholder tab")
         self._empty_label.grid(column=100, row=100)
@@ -468,31 +668,57 @@ class Base_Chip(GUI_Helper):
             return self._block_array_display_vars[address_space][block_name][var_name]
         return self._address_space[address_space].get_display_var(block_name + "/" + var_name)
 
+    def _get_indexed_block_ref(self, address_space_name: str, block_name: str):
+        # Block refs are cached per combination of indexer values, so switching between pixels does not regenerate them
+        key = (address_space_name, block_name) + tuple([self._indexer_vars[indexer]['variable'].get() for indexer in self._indexer_vars])
+        if key not in self._indexed_block_refs:
+            block_ref, _ = self._gen_block_ref_from_indexers(
+                address_space_name=address_space_name,
+                block_name=block_name,
+                full_array=False,
+            )
+            self._indexed_block_refs[key] = block_ref
+        return self._indexed_block_refs[key]
+
     def get_indexed_var(self, address_space, block_name, var_name):
-        self._logger.detailed_trace(f'Base_Chip::get_indexed_var("{address_space}", "{block_name}", "{var_name}")')
-        block_ref, _ = self._gen_block_ref_from_indexers(
-            address_space_name=address_space,
-            block_name=block_name,
-            full_array=False,
-        )
-        self._logger.detailed_trace(f'   Got block_ref={block_ref}')
+        self._logger.detailed_trace('Base_Chip::get_indexed_var("%s", "%s", "%s")', address_space, block_name, var_name)
+        block_ref = self._get_indexed_block_ref(address_space, block_name)
+        self._logger.detailed_trace('   Got block_ref=%s', block_ref)
 
         return self._address_space[address_space].get_display_var(block_ref + "/" + var_name)
 
+    def get_indexed_vars(self, address_space, block_name):
+        block_ref = self._get_indexed_block_ref(address_space, block_name)
+
+        if (address_space, block_ref) not in self._indexed_vars:
+            address_space_controller: Address_Space_Controller = self._address_space[address_space]
+            self._indexed_vars[(address_space, block_ref)] = {}
+            for register in self._register_model[address_space]["Register Blocks"][block_name]["Registers"]:
+                self._indexed_vars[(address_space, block_ref)][register] = address_space_controller.get_display_var(block_ref + "/" + register)
+
+        return self._indexed_vars[(address_space, block_ref)]
+
     def get_decoded_display_var(self, address_space, block_name, var_name):
         if address_space in self._block_array_decoded_display_vars and block_name in self._block_array_decoded_display_vars[address_space] and var_name in self._block_array_decoded_display_vars[address_space][block_name]:
             return self._block_array_decoded_display_vars[address_space][block_name][var_name]
         return self._address_space[address_space].get_decoded_display_var(block_name + "/" + var_name)
 
     def get_decoded_indexed_var(self, address_space, block_name, var_name):
-        block_ref, _ = self._gen_block_ref_from_indexers(
-            address_space_name=address_space,
-            block_name=block_name,
-            full_array=False,
-        )
+        block_ref = self._get_indexed_block_ref(address_space, block_name)
 
         return self._address_space[address_space].get_decoded_display_var(block_ref + "/" + var_name)
 
+    def get_decoded_indexed_vars(self, address_space, block_name):
+        block_ref = self._get_indexed_block_ref(address_space, block_name)
+
+        if (address_space, block_ref) not in self._decoded_indexed_vars:
+            address_space_controller: Address_Space_Controller = self._address_space[address_space]
+            self._decoded_indexed_vars[(address_space, block_ref)] = {}
+            for value in self._register_decoding[address_space]["Register Blocks"][block_name]:
+                self._decoded_indexed_vars[(address_space, block_ref)][value] = address_space_controller.get_decoded_display_var(block_ref + "/" + value)
+
+        return self._decoded_indexed_vars[(address_space, block_ref)]
+
     def build_block_interface(self, element: tk.Tk, title: str, internal_title: str, button_title: str, address_space: str, block: str, col: int, row: int, register_columns: int, read_only: bool = False):
         from ..register_block_interface import Register_Block_Interface
 
@@ -565,6 +791,23 @@ class Base_Chip(GUI_Helper):
 
         return retVal
 
+    def build_pixel_heatmap_interface(self, control_variables, element: tk.Tk, title: str, internal_title: str, address_space: str, values: dict[str, str], col: int, row: int):
+        from ..pixel_heatmap_interface import Pixel_Heatmap_Interface
+
+        retVal = Pixel_Heatmap_Interface(
+            self,
+            title=title,
+            address_space=address_space,
+            values=values,
+            control_variables=control_variables,
+        )
+
+        retVal.prepare_display(element, col, row)
+
+        self._displayed_interfaces[internal_title] = retVal
+
+        return retVal
+
     def build_decoded_block_array_interface(self, element: tk.Tk, title: str, internal_title: str, button_title: str, address_space: str, block: str, col: int, row: int, value_columns: int, read_only: bool = False):
         from ..register_block_array_decoded_interface import Register_Block_Array_Decoded_Interface
 
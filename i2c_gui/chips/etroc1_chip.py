@@ -28,6 +28,7 @@ if TYPE_CHECKING:
 
 from .base_chip import Base_Chip
 from ..gui_helper import GUI_Helper
+from ..profiling import traced
 
 import tkinter as tk
 import tkinter.ttk as ttk  # For themed widgets (gives a more native visual to the elements)
@@ -1845,6 +1846,15 @@ class ETROC1_Chip(Base_Chip):
             }
         )
 
+    @traced("chip")
+    def read_all(self):
+        # The four address spaces are small, so the per address space overhead dominates when they are read one at a time
+        self.read_all_batched()
+
+    @traced("chip")
+    def write_all(self, write_check: bool = True):
+        return self.write_all_batched(write_check=write_check)
+
     def update_whether_modified(self):
         if self._i2c_address_a is not None:
             state_a = self._address_space["Array_Reg_A"].is_modified
@@ -29,6 +29,7 @@ if TYPE_CHECKING:
 from .base_chip import Base_Chip
 from ..gui_helper import GUI_Helper
 from .address_space_controller import Address_Space_Controller
+from ..profiling import traced
 
 import tkinter as tk
 import tkinter.ttk as ttk  # For themed widgets (gives a more native visual to the elements)
@@ -1797,47 +1798,69 @@ class ETROC2_Chip(Base_Chip):
         else:
             return super().write_all_address_space(address_space_name, write_check=write_check)
 
-    #  We need to overload the write block method so that we intercept the call for the broadcast feature
-    def write_all_block(self, address_space_name: str, block_name: str, full_array: bool = False, write_check: bool = True):
+    async def write_all_address_space_async(self, address_space_name: str, write_check: bool = True):
+        if address_space_name == "ETROC2":
+            self._logger.info("Writing full address space: {}".format(address_space_name))
+            success = True
+            broadcast_backup = self._indexer_vars['broadcast']['variable'].get()
+            for block in self._register_model[address_space_name]["Register Blocks"]:
+                self._indexer_vars['broadcast']['variable'].set(broadcast_backup)
+                if not await self.write_all_block_async(address_space_name, block, full_array=True, write_check=write_check):
+                    success = False
+            return success
+        else:
+            return await super().write_all_address_space_async(address_space_name, write_check=write_check)
+
+    def _is_broadcast_write(self, address_space_name: str, block_name: str):
         broadcast = self._indexer_vars['broadcast']['variable'].get()
-        if address_space_name == "ETROC2" and "Indexer" in self._register_model[address_space_name]["Register Blocks"][block_name] and broadcast == "1":
-            block_ref, params = self._gen_block_ref_from_indexers(
-                address_space_name=address_space_name,
-                block_name=block_name,
-                full_array=False,  # Always specifically set to false since we always want to address a single "element" of the array due to the broadcast feature
-            )
-            params['broadcast'] = True
+        return address_space_name == "ETROC2" and "Indexer" in self._register_model[address_space_name]["Register Blocks"][block_name] and broadcast == "1"
 
-            self.send_message("Broadcast writing block {} from address space {} of chip {}".format(block_ref, address_space_name, self._chip_name))
+    def _prepare_broadcast_block(self, address_space_name: str, block_name: str):
+        block_ref, params = self._gen_block_ref_from_indexers(
+            address_space_name=address_space_name,
+            block_name=block_name,
+            full_array=False,  # Always specifically set to false since we always want to address a single "element" of the array due to the broadcast feature
+        )
+        params['broadcast'] = True
 
-            # Fetch the base address for the broadcast block array
-            broadcast_base_address = etroc2_column_row_to_base_address(**params)
+        self.send_message("Broadcast writing block {} from address space {} of chip {}".format(block_ref, address_space_name, self._chip_name))
 
-            address_space: Address_Space_Controller = self._address_space[address_space_name]
-            displayed_block_info = address_space._blocks[block_ref]
-            block_length = displayed_block_info["Length"]
+        # Fetch the base address for the broadcast block array
+        broadcast_base_address = etroc2_column_row_to_base_address(**params)
 
-            # Copy values from displayed variables into the broadcast address space for writing out
-            for offset in range(block_length):
-                displayed_address = displayed_block_info["Base Address"] + offset
-                broadcast_address = broadcast_base_address + offset
-                address_space._display_vars[broadcast_address].set(
-                    address_space._display_vars[displayed_address].get()
-                )
+        address_space: Address_Space_Controller = self._address_space[address_space_name]
+        displayed_block_info = address_space._blocks[block_ref]
+        block_length = displayed_block_info["Length"]
 
-                # Temporarily disable the read-only property on the broadcast address
-                address_space._read_only_map[broadcast_address] = False
+        # Copy values from displayed variables into the broadcast address space for writing out
+        for offset in range(block_length):
+            displayed_address = displayed_block_info["Base Address"] + offset
+            broadcast_address = broadcast_base_address + offset
+            address_space._display_vars[broadcast_address].set(
+                address_space._display_vars[displayed_address].get()
+            )
 
-            return_status = address_space.write_memory_block(broadcast_base_address, block_length, write_check=write_check)
+        return address_space, broadcast_base_address, block_length
 
-            # Re-enable the read-only on the broadcast address
-            for offset in range(block_length):
-                broadcast_address = broadcast_base_address + offset
-                address_space._read_only_map[broadcast_address] = True
+    def _finish_broadcast(self, address_space: Address_Space_Controller):
+        # A broadcast write changes every pixel, so none of the cached pixel values can be trusted anymore
+        address_space.invalidate_read_cache()
 
-            # TODO: Validate broadcast write
+        # TODO: Validate broadcast write
 
-            self._indexer_vars['broadcast']['variable'].set("0")
+        self._indexer_vars['broadcast']['variable'].set("0")
+
+    #  We need to overload the write block method so that we intercept the call for the broadcast feature
+    @traced("chip")
+    def write_all_block(self, address_space_name: str, block_name: str, full_array: bool = False, write_check: bool = True):
+        if self._is_broadcast_write(address_space_name, block_name):
+            address_space, broadcast_base_address, block_length = self._prepare_broadcast_block(address_space_name, block_name)
+
+            # Temporarily disable the read-only property on the broadcast addresses
+            with address_space.temporarily_writable(broadcast_base_address, block_length):
+                return_status = address_space.write_memory_block(broadcast_base_address, block_length, write_check=write_check)
+
+            self._finish_broadcast(address_space)
             return return_status
         else:
             self._indexer_vars['broadcast']['variable'].set("0")
@@ -1848,45 +1871,63 @@ class ETROC2_Chip(Base_Chip):
                 write_check=write_check,
             )
 
-    #  We need to overload the write register method so that we intercept the call for the broadcast feature
-    def write_register(self, address_space_name: str, block_name: str, register: str, write_check: bool = True, no_message: bool = False):
-        broadcast = self._indexer_vars['broadcast']['variable'].get()
-        if address_space_name == "ETROC2" and "Indexer" in self._register_model[address_space_name]["Register Blocks"][block_name] and broadcast == "1":
-            block_ref, params = self._gen_block_ref_from_indexers(
+    async def write_all_block_async(self, address_space_name: str, block_name: str, full_array: bool = False, write_check: bool = True):
+        if self._is_broadcast_write(address_space_name, block_name):
+            address_space, broadcast_base_address, block_length = self._prepare_broadcast_block(address_space_name, block_name)
+
+            # Temporarily disable the read-only property on the broadcast addresses
+            with address_space.temporarily_writable(broadcast_base_address, block_length):
+                return_status = await address_space.write_memory_block_async(broadcast_base_address, block_length, write_check=write_check)
+
+            self._finish_broadcast(address_space)
+            return return_status
+        else:
+            self._indexer_vars['broadcast']['variable'].set("0")
+            return await super().write_all_block_async(
                 address_space_name=address_space_name,
                 block_name=block_name,
-                full_array=False,
+                full_array=full_array,
+                write_check=write_check,
             )
-            params['broadcast'] = True
 
-            if not no_message:
-                self.send_message("Broadcast writing register {} from block {} of address space {} of chip {}".format(register, block_ref, address_space_name, self._chip_name))
+    def _prepare_broadcast_register(self, address_space_name: str, block_name: str, register: str, no_message: bool):
+        block_ref, params = self._gen_block_ref_from_indexers(
+            address_space_name=address_space_name,
+            block_name=block_name,
+            full_array=False,
+        )
+        params['broadcast'] = True
 
-            # Fetch the base address for the broadcast block array
-            broadcast_base_address = etroc2_column_row_to_base_address(**params)
-            offset = self._register_model[address_space_name]["Register Blocks"][block_name]['Registers'][register]['offset']
-            broadcast_address = broadcast_base_address + offset
+        if not no_message:
+            self.send_message("Broadcast writing register {} from block {} of address space {} of chip {}".format(register, block_ref, address_space_name, self._chip_name))
 
-            address_space: Address_Space_Controller = self._address_space[address_space_name]
-            displayed_block_info = address_space._blocks[block_ref]
-            displayed_address = displayed_block_info["Base Address"] + offset
+        # Fetch the base address for the broadcast block array
+        broadcast_base_address = etroc2_column_row_to_base_address(**params)
+        offset = self._register_model[address_space_name]["Register Blocks"][block_name]['Registers'][register]['offset']
+        broadcast_address = broadcast_base_address + offset
 
-            # Copy values from displayed variable into the broadcast address for writing out
-            address_space._display_vars[broadcast_address].set(
-                address_space._display_vars[displayed_address].get()
-            )
+        address_space: Address_Space_Controller = self._address_space[address_space_name]
+        displayed_block_info = address_space._blocks[block_ref]
+        displayed_address = displayed_block_info["Base Address"] + offset
 
-            # Temporarily disable the read-only property on the broadcast address
-            address_space._read_only_map[broadcast_address] = False
+        # Copy values from displayed variable into the broadcast address for writing out
+        address_space._display_vars[broadcast_address].set(
+            address_space._display_vars[displayed_address].get()
+        )
 
-            return_status = address_space.write_memory_register(broadcast_address, write_check=write_check)
+        return address_space, broadcast_address
 
-            # Re-enable the read-only on the broadcast address
-            address_space._read_only_map[broadcast_address] = True
+    #  We need to overload the write register method so that we intercept the call for the broadcast feature
+    @traced("chip")
+    def write_register(self, address_space_name: str, block_name: str, register: str, write_check: bool = True, no_message: bool = False):
+        if self._is_broadcast_write(address_space_name, block_name):
+            address_space, broadcast_address = self._prepare_broadcast_register(address_space_name, block_name, register, no_message)
 
-            # TODO: Validate broadcast write
+            # Temporarily disable the read-only property on the broadcast address
+            with address_space.temporarily_writable(broadcast_address, 1):
+                return_status = address_space.write_memory_register(broadcast_address, write_check=write_check)
 
-            self._indexer_vars['broadcast']['variable'].set("0")
+            self._finish_broadcast(address_space)
             return return_status
         else:
             self._indexer_vars['broadcast']['variable'].set("0")
@@ -1898,6 +1939,29 @@ class ETROC2_Chip(Base_Chip):
                 no_message=no_message,
             )
 
+    async def write_register_async(self, address_space_name: str, block_name: str, register: str, write_check: bool = True, no_message: bool = False):
+        if self._is_broadcast_write(address_space_name, block_name):
+            address_space, broadcast_address = self._prepare_broadcast_register(address_space_name, block_name, register, no_message)
+
+            # Temporarily disable the read-only property on the broadcast address
+            with address_space.temporarily_writable(broadcast_address, 1):
+                return_status = await address_space.write_memory_register_async(broadcast_address, write_check=write_check)
+
+            self._finish_broadcast(address_space)
+            return return_status
+        else:
+            self._indexer_vars['broadcast']['variable'].set("0")
+            return await super().write_register_async(
+                address_space_name=address_space_name,
+                block_name=block_name,
+                register=register,
+                write_check=write_check,
+                no_message=no_message,
+            )
+
+    def tune_i2c_clock(self, address_space_name: str = "ETROC2", block_name: str = "Peripheral Config", iterations: int = 10, board: str = ""):
+        return super().tune_i2c_clock(address_space_name, block_name, iterations=iterations, board=board)
+
     def config_i2c_address(self, address):
         self._i2c_address = address
 
@@ -1917,7 +1981,25 @@ class ETROC2_Chip(Base_Chip):
         self.update_whether_modified()
 
     def graphical_interface_builder(self, frame: ttk.Frame):
-        pass
+        frame.columnconfigure(100, weight=1)
+
+        self._ETROC2_pixel_heatmap_frame = self.build_pixel_heatmap_interface(
+            control_variables=self._indexer_vars,
+            element=frame,
+            title="Pixel Matrix",
+            internal_title="Pixel Heatmap",
+            address_space="ETROC2",
+            values={
+                "DAC": "Pixel Config",
+                "TH": "Pixel Status",
+                "BL": "Pixel Status",
+                "NW": "Pixel Status",
+                "ACC": "Pixel Status",
+                "ScanDone": "Pixel Status",
+            },
+            col=100,
+            row=100,
+        )
 
     def peripheral_register_builder(self, frame: ttk.Frame):
         frame.columnconfigure(100, weight=1)
@@ -55,6 +55,7 @@ class Waveform_Sampler_Helper(GUI_Helper):
     def __init__(self, parent: Base_Chip):
         super().__init__(parent, None, parent._logger)
         self._is_connected = False
+        self._read_early_stop = False
 
         self._decoded_display_vars = {}
         self._control_vars = {}
@@ -30,9 +30,19 @@ import tkinter as tk
 import tkinter.ttk as ttk  # For themed widgets (gives a more native visual to the elements)
 import logging
 import time
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 from .usb_iss_helper import USB_ISS_Helper
+from .usb_iss_serial_helper import USB_ISS_Serial_Helper
 from .fpga_eth_helper import FPGA_ETH_Helper
+from .linux_i2c_dev_helper import Linux_I2C_Dev_Helper
+from .i2c_session_log import I2C_Session_Recorder
+from .i2c_session_log import I2C_Replay_Helper
+from .i2c_metrics import I2C_Metrics
+from .i2c_request_queue import I2C_Request_Queue
+from .profiling import traced
 
 class Connection_Controller(GUI_Helper):
     _orange_col = '#f0c010'
@@ -41,7 +51,10 @@ class Connection_Controller(GUI_Helper):
 
     _connection_types = [
         "USB-ISS",
+        "USB-ISS Pipelined",
         "FPGA-Eth",
+        "Linux I2C-Dev",
+        "Replay",
     ]
 
     _parent: Base_GUI
@@ -51,6 +64,10 @@ class Connection_Controller(GUI_Helper):
         usb_iss_max_seq_byte = 8,
         override_logger = None,
         successive_i2c_delay_us : int = 1000,
+        i2c_log_max_messages : int = 5000,
+        i2c_max_retries : int = 3,
+        i2c_retry_delay_us : int = 1000,
+        i2c_max_retry_delay_us : int = 100000,
     ):
         if override_logger is None:
             super().__init__(parent, None, parent._logger)
@@ -58,20 +75,30 @@ class Connection_Controller(GUI_Helper):
             super().__init__(parent, None, override_logger)
         self._is_connected = False
 
+        # All the transactions go through the request queue, so that requests from several threads (i.e. a script
+        # and a monitoring thread) are carried out one at a time, in order, and the bookkeeping below stays consistent
+        self._request_queue = I2C_Request_Queue()
+
         self._time_last_i2c_command = time.time_ns()
+        self._metrics = I2C_Metrics()
 
         self._usb_iss_max_seq_byte = usb_iss_max_seq_byte
+        self._i2c_retry_policy = (i2c_max_retries, i2c_retry_delay_us, i2c_max_retry_delay_us)
 
         #  The i2c connection is instantiated as a helper class, the helper class will manage
         # the connection itself, allowing to replace the class with others in case other I2C
         # interfaces need to be supported
         self._i2c_connection = USB_ISS_Helper(self, usb_iss_max_seq_byte)
+        self._i2c_connection.set_retry_policy(*self._i2c_retry_policy)
 
         self._i2c_connection_type_var = tk.StringVar(value=self._connection_types[0])
         self._i2c_connection_type_var.trace_add("write", self._update_connection_type) # This should probably be moved lower
 
         self._registered_connection_callbacks = []
 
+        # Worker thread for the async API, created on first use
+        self._executor = None
+
         self._successive_i2c_delay_us = successive_i2c_delay_us
 
         from . import __no_connect__
@@ -79,6 +106,8 @@ class Connection_Controller(GUI_Helper):
             self._previous_write_value = None
 
         self._do_logging_i2c = False
+        self._i2c_log = deque(maxlen=i2c_log_max_messages)
+        self._i2c_log_pending = []
         self._i2c_logging_window_status_var = tk.StringVar()
         self._i2c_logging_window_status_var.set("Logging Disabled")
 
@@ -103,6 +132,10 @@ class Connection_Controller(GUI_Helper):
         if not self.is_connected:
             self._i2c_connection_type_var.set(val)
 
+    @property
+    def metrics(self):
+        return self._metrics
+
     @property
     def handle(self):
         return self._i2c_connection
@@ -120,17 +153,29 @@ class Connection_Controller(GUI_Helper):
     def _update_connection_type(self, var=None, index=None, mode=None):
         connection_type = self._i2c_connection_type_var.get()
         update_display = False
+        if self.is_recording:
+            self.stop_recording()
         if connection_type == "USB-ISS":
             self._i2c_connection = USB_ISS_Helper(self, self._usb_iss_max_seq_byte)
             update_display = True
+        elif connection_type == "USB-ISS Pipelined":
+            self._i2c_connection = USB_ISS_Serial_Helper(self, self._usb_iss_max_seq_byte)
+            update_display = True
         elif connection_type == "FPGA-Eth":
             self._i2c_connection = FPGA_ETH_Helper(self)
             self.send_message("The FPGA-Eth connection is not fully implement yet - this will not work", "Warning")
             update_display = True
+        elif connection_type == "Linux I2C-Dev":
+            self._i2c_connection = Linux_I2C_Dev_Helper(self)
+            update_display = True
+        elif connection_type == "Replay":
+            self._i2c_connection = I2C_Replay_Helper(self)
+            update_display = True
         else:
             self.send_message("Unknown I2C Connection Type: {}".format(connection_type), "Error")
             self._i2c_connection_type_var.set(self._connection_types[0])
             self._update_connection_type()
+        self._i2c_connection.set_retry_policy(*self._i2c_retry_policy)
 
         if update_display and hasattr(self, "_i2c_connection_frame") and self._i2c_connection_frame is not None:
             self._i2c_connection_frame.destroy()
@@ -140,18 +185,95 @@ class Connection_Controller(GUI_Helper):
 
             self._i2c_connection.display_in_frame(self._i2c_connection_frame)
 
-    def check_i2c_device(self, address: str):
+    def _pace_i2c_command(self):
+        # Returns the time spent waiting (in ns) so it can be accounted for in the metrics
+        sleep_ns = 0
         this_time = time.time_ns()
         if this_time - self._time_last_i2c_command < self._successive_i2c_delay_us * 1000:
             time.sleep(self._successive_i2c_delay_us/10E6)
-            this_time = time.time_ns()
+            sleep_ns = time.time_ns() - this_time
+            this_time += sleep_ns
         self._time_last_i2c_command = this_time
+        return sleep_ns
 
-        from . import __no_connect__
-        if __no_connect__:
-            return True
+    def _emulate_i2c_latency(self):
+        from . import __no_connect_latency_us__
+        if __no_connect_latency_us__ > 0:
+            time.sleep(__no_connect_latency_us__/1E6)
 
-        return self._i2c_connection.check_i2c_device(int(address, 0))
+    @traced("i2c")
+    def check_i2c_device(self, address: str):
+        with self._request_queue.bus():
+            start_time = time.perf_counter_ns()
+            sleep_ns = self._pace_i2c_command()
+
+            from . import __no_connect__
+            if __no_connect__:
+                self._emulate_i2c_latency()
+                self._metrics.record("check", int(address, 0), 0, time.perf_counter_ns() - start_time, sleep_ns)
+                return True
+
+            retVal = self._i2c_connection.check_i2c_device(int(address, 0))
+            self._metrics.record("check", int(address, 0), 0, time.perf_counter_ns() - start_time, sleep_ns)
+            return retVal
+
+    def probe_chunk_size(self, device_address: int, memory_address: int, byte_count: int = None, register_bits: int = 16, include_write: bool = False):
+        """Find the largest reliable transfer sizes for the current adapter, see I2C_Connection_Helper.probe_chunk_size"""
+        with self._request_queue.bus():
+            if not self.is_connected:
+                raise RuntimeError("You must first connect to a device before trying to probe the transfer size")
+
+            from . import __no_connect__
+            if __no_connect__:
+                return None
+
+            results = self._i2c_connection.probe_chunk_size(device_address, memory_address, byte_count, register_bits, include_write)
+            if results is not None:
+                self._logger.info("Transfer sizes for the I2C device 0x{:02x}: {}".format(device_address, results))
+            return results
+
+    def tune_i2c_clock(self, device_address: int, memory_address: int, byte_count: int, register_bits: int = 16, iterations: int = 10, board: str = None):
+        """Find the fastest reliable I2C clock for the current adapter, see USB_ISS_Helper.tune_clock"""
+        with self._request_queue.bus():
+            if not self.is_connected:
+                raise RuntimeError("You must first connect to a device before trying to tune the I2C clock")
+
+            from . import __no_connect__
+            if __no_connect__:
+                return None
+
+            if not hasattr(self._i2c_connection, "tune_clock"):
+                self.send_message("The {} connection does not support tuning the I2C clock".format(self.connection_type), "Error")
+                return None
+
+            return self._i2c_connection.tune_clock(device_address, memory_address, byte_count, register_bits, iterations, board)
+
+    @property
+    def is_recording(self):
+        return isinstance(self._i2c_connection, I2C_Session_Recorder)
+
+    def start_recording(self, filename: str):
+        """Record all the following I2C transactions to a session log, which can be replayed with the Replay connection type"""
+        with self._request_queue.bus():
+            if self.is_recording:
+                self.stop_recording()
+
+            from . import __no_connect__
+            if __no_connect__:
+                self.send_message("The I2C connection is emulated, so there will be no transactions to record", "Warning")
+
+            self._i2c_connection = I2C_Session_Recorder(self._i2c_connection, filename)
+            self.send_message("Recording the I2C session to {}".format(filename))
+
+    def stop_recording(self):
+        with self._request_queue.bus():
+            if not self.is_recording:
+                return
+
+            recorder: I2C_Session_Recorder = self._i2c_connection
+            recorder.close()
+            self._i2c_connection = recorder.helper
+            self.send_message("Stopped recording the I2C session to {}".format(recorder.filename))
 
     def register_connection_callback(self, function):
         if function not in self._registered_connection_callbacks:
@@ -188,7 +310,10 @@ class Connection_Controller(GUI_Helper):
             return
 
         from . import __no_connect__
-        if self._i2c_connection.connect(__no_connect__):
+        with self._request_queue.bus():
+            connected = self._i2c_connection.connect(__no_connect__)
+        if connected:
+            self._i2c_connection.remember_connection_params()
             if hasattr(self, "_connect_button"):
                 self._connect_button.config(text="Disconnect", command=self.disconnect)
             if hasattr(self, "_connection_type_option"):
@@ -209,7 +334,13 @@ class Connection_Controller(GUI_Helper):
         if not self.is_connected:
             return
 
-        self._i2c_connection.disconnect()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+        with self._request_queue.bus():
+            self._i2c_connection.disconnect()
+        self._i2c_connection.forget_connection_params()
 
         if hasattr(self, "_connect_button"):
             self._connect_button.config(text="Connect", command=self.connect)
@@ -227,58 +358,102 @@ class Connection_Controller(GUI_Helper):
         if hasattr(self, "_i2c_scan_window"):
             self._toggle_logging_button.config(state='disabled')
 
+    @traced("i2c")
     def read_device_memory(self, device_address: int, memory_address: int, byte_count: int = 1, register_bits = 16):
-        if not self.is_connected:
-            raise RuntimeError("You must first connect to a device before trying to read registers from it")
-
-        from .functions import validate_i2c_address
-        if not validate_i2c_address(hex(device_address)):
-            raise RuntimeError("Invalid I2C address received: {}".format(hex(device_address)))
-
-        this_time = time.time_ns()
-        if this_time - self._time_last_i2c_command < self._successive_i2c_delay_us * 1000:
-            time.sleep(self._successive_i2c_delay_us/10E6)
-            this_time = time.time_ns()
-        self._time_last_i2c_command = this_time
-
-        from . import __no_connect__
-        from . import __no_connect_type__
-        if __no_connect__:
-            retVal = []
-            if __no_connect_type__ == "check" or self._previous_write_value is None:
-                retVal = [i for i in range(byte_count)]
-                if byte_count == 1:
-                    retVal[0] = 0x42
-            elif __no_connect_type__ == "echo":
-                retVal = [self._previous_write_value for i in range(byte_count)]
-            else:
-                self._logger.error("Massive error, no connect was set, but an incorrect no connect type was chosen, so the I2C emulation behaviour is unknown")
+        with self._request_queue.bus():
+            if not self.is_connected:
+                raise RuntimeError("You must first connect to a device before trying to read registers from it")
+
+            from .functions import validate_i2c_address
+            if not validate_i2c_address(hex(device_address)):
+                raise RuntimeError("Invalid I2C address received: {}".format(hex(device_address)))
+
+            start_time = time.perf_counter_ns()
+            sleep_ns = self._pace_i2c_command()
+
+            from . import __no_connect__
+            from . import __no_connect_type__
+            if __no_connect__:
+                self._emulate_i2c_latency()
+                retVal = []
+                if __no_connect_type__ == "check" or self._previous_write_value is None:
+                    retVal = [i for i in range(byte_count)]
+                    if byte_count == 1:
+                        retVal[0] = 0x42
+                elif __no_connect_type__ == "echo":
+                    retVal = [self._previous_write_value for i in range(byte_count)]
+                else:
+                    self._logger.error("Massive error, no connect was set, but an incorrect no connect type was chosen, so the I2C emulation behaviour is unknown")
+                self._metrics.record("read", device_address, byte_count, time.perf_counter_ns() - start_time, sleep_ns)
+                return retVal
+
+            try:
+                retVal = self._i2c_connection.read_device_memory(device_address, memory_address, byte_count, register_bits)
+            except Exception:
+                self._metrics.record("read", device_address, byte_count, time.perf_counter_ns() - start_time, sleep_ns + self._i2c_connection.last_sleep_ns, self._i2c_connection.last_chunk_count, self._i2c_connection.last_retry_count, failed=True)
+                raise
+            self._metrics.record("read", device_address, byte_count, time.perf_counter_ns() - start_time, sleep_ns + self._i2c_connection.last_sleep_ns, self._i2c_connection.last_chunk_count, self._i2c_connection.last_retry_count)
             return retVal
 
-        return self._i2c_connection.read_device_memory(device_address, memory_address, byte_count, register_bits)
-
+    @traced("i2c")
     def write_device_memory(self, device_address: int, memory_address: int, data: list[int], register_bits = 16):
-        if not self.is_connected:
-            raise RuntimeError("You must first connect to a device before trying to write registers to it")
-
-        from .functions import validate_i2c_address
-        if not validate_i2c_address(hex(device_address)):
-            raise RuntimeError("Invalid I2C address received: {}".format(hex(device_address)))
-
-        this_time = time.time_ns()
-        if this_time - self._time_last_i2c_command < self._successive_i2c_delay_us * 1000:
-            time.sleep(self._successive_i2c_delay_us/10E6)
-            this_time = time.time_ns()
-        self._time_last_i2c_command = this_time
-
-        from . import __no_connect__
-        from . import __no_connect_type__
-        if __no_connect__:
-            if __no_connect_type__ == "echo":
-                self._previous_write_value = data[len(data)-1]
-            return
+        with self._request_queue.bus():
+            if not self.is_connected:
+                raise RuntimeError("You must first connect to a device before trying to write registers to it")
+
+            from .functions import validate_i2c_address
+            if not validate_i2c_address(hex(device_address)):
+                raise RuntimeError("Invalid I2C address received: {}".format(hex(device_address)))
+
+            start_time = time.perf_counter_ns()
+            sleep_ns = self._pace_i2c_command()
+
+            from . import __no_connect__
+            from . import __no_connect_type__
+            if __no_connect__:
+                self._emulate_i2c_latency()
+                if __no_connect_type__ == "echo":
+                    self._previous_write_value = data[len(data)-1]
+                self._metrics.record("write", device_address, len(data), time.perf_counter_ns() - start_time, sleep_ns)
+                return
+
+            try:
+                self._i2c_connection.write_device_memory(device_address, memory_address, data, register_bits)
+            except Exception:
+                self._metrics.record("write", device_address, len(data), time.perf_counter_ns() - start_time, sleep_ns + self._i2c_connection.last_sleep_ns, self._i2c_connection.last_chunk_count, self._i2c_connection.last_retry_count, failed=True)
+                raise
+            self._metrics.record("write", device_address, len(data), time.perf_counter_ns() - start_time, sleep_ns + self._i2c_connection.last_sleep_ns, self._i2c_connection.last_chunk_count, self._i2c_connection.last_retry_count)
 
-        self._i2c_connection.write_device_memory(device_address, memory_address, data, register_bits)
+    @property
+    def pending_requests(self):
+        return self._request_queue.pending_requests
+
+    def exclusive_access(self):
+        """
+        Hold the bus over several transactions, for instance a read-modify-write which must not be interleaved with other threads:
+            with conn.exclusive_access():
+                data = conn.read_device_memory(...)
+                conn.write_device_memory(...)
+        """
+        return self._request_queue.bus()
+
+    def _get_executor(self):
+        # A single worker, so the transfers issued through the async API are still carried out one at a time on the bus
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="i2c_gui_io")
+        return self._executor
+
+    async def check_i2c_device_async(self, address: str):
+        return await asyncio.get_running_loop().run_in_executor(self._get_executor(), self.check_i2c_device, address)
+
+    async def read_device_memory_async(self, device_address: int, memory_address: int, byte_count: int = 1, register_bits = 16):
+        """Same as read_device_memory, but the transfer runs in a worker thread so the event loop can drive other controllers meanwhile"""
+        return await asyncio.get_running_loop().run_in_executor(self._get_executor(), self.read_device_memory, device_address, memory_address, byte_count, register_bits)
+
+    async def write_device_memory_async(self, device_address: int, memory_address: int, data: list[int], register_bits = 16):
+        """Same as write_device_memory, but the transfer runs in a worker thread so the event loop can drive other controllers meanwhile"""
+        # The data is copied, since the caller may change its memory image while the transfer is queued
+        return await asyncio.get_running_loop().run_in_executor(self._get_executor(), self.write_device_memory, device_address, memory_address, list(data), register_bits)
 
     def display_i2c_window(self):
         if hasattr(self, "_i2c_window"):
@@ -335,6 +510,11 @@ class Connection_Controller(GUI_Helper):
         self._scrollbar.grid(column=201, row=100, sticky=(tk.N, tk.W, tk.E, tk.S))
         self._text_display.config(yscrollcommand=self._scrollbar.set)
 
+        from .logging import append_lines_to_text
+        append_lines_to_text(self._text_display, [self._format_i2c_log_entry(entry) for entry in self._i2c_log], self._i2c_log.maxlen)
+        self._i2c_log_pending = []
+        self._i2c_log_flush_id = self._text_display.after(100, self._flush_i2c_log)
+
         # Place the logging toggle button at the top of the control frame
         self._toggle_logging_button = ttk.Button(self._i2c_window_generic_control_frame, text="Enable Logging", command=self.toggle_i2c_logging)
         self._toggle_logging_button.grid(column=200, row=100, sticky=(tk.W, tk.E), padx=(0,5))
@@ -429,6 +609,10 @@ class Connection_Controller(GUI_Helper):
 
         self.is_logging_i2c = False
 
+        if hasattr(self, "_i2c_log_flush_id"):
+            self._text_display.after_cancel(self._i2c_log_flush_id)
+            del self._i2c_log_flush_id
+
         self._i2c_window.destroy()
         del self._i2c_window
 
@@ -442,11 +626,16 @@ class Connection_Controller(GUI_Helper):
         self._toggle_logging_button.config(text=button_text)
 
     def clear_i2c_log(self):
+        self._i2c_log.clear()
+        self._i2c_log_pending = []
+
         self._text_display.configure(state='normal')
         self._text_display.delete("1.0", tk.END)
-        #self._text_display.insert('end', self.get_log())
         self._text_display.configure(state='disabled')
 
+    def get_i2c_log(self):
+        return "\n".join([self._format_i2c_log_entry(entry) for entry in self._i2c_log])
+
     def test_i2c_device(self):
         self._normalize_i2c_address()
 
@@ -543,9 +732,45 @@ class Connection_Controller(GUI_Helper):
         if not self.is_logging_i2c:
             return
 
-        self._text_display.configure(state='normal')
-        self._text_display.insert('end', message + "\n")
-        self._text_display.configure(state='disabled')
+        self._append_i2c_log_entry(message)
+
+    def record_i2c_transaction(self, operation: str, device_address: int, memory_address: int, data: list[int]):
+        if not self.is_logging_i2c:
+            return
+
+        # Only a compact record is kept, the text is generated when the monitor displays it
+        self._append_i2c_log_entry((time.time_ns(), operation, device_address, memory_address, bytes(data)))
+
+    def _append_i2c_log_entry(self, entry):
+        self._i2c_log.append(entry)
+
+        # Entries are added to the monitor in batches by a timer of the main thread, the transactions may run in other threads which must not touch tk
+        if hasattr(self, "_i2c_window"):
+            self._i2c_log_pending.append(entry)  # A single operation on the list, so it is never lost if the monitor is flushed at the same time
+
+    def _format_i2c_log_entry(self, entry):
+        if isinstance(entry, str):
+            return entry
+
+        timestamp, operation, device_address, memory_address, data = entry
+        return "{}.{:06d} {:<5} device 0x{:02x} register 0x{:04x} ({} bytes): {}".format(
+            time.strftime("%H:%M:%S", time.localtime(timestamp // 10**9)),
+            (timestamp % 10**9) // 1000,
+            operation,
+            device_address,
+            memory_address,
+            len(data),
+            data.hex(' '),
+        )
+
+    def _flush_i2c_log(self):
+        pending, self._i2c_log_pending = self._i2c_log_pending, []
+
+        if len(pending) > 0:
+            from .logging import append_lines_to_text
+            append_lines_to_text(self._text_display, [self._format_i2c_log_entry(entry) for entry in pending[-self._i2c_log.maxlen:]], self._i2c_log.maxlen)
+
+        self._i2c_log_flush_id = self._text_display.after(100, self._flush_i2c_log)
 
     def display_i2c_scan_window(self):
         if hasattr(self, "_i2c_scan_window"):
@@ -610,6 +835,115 @@ class Connection_Controller(GUI_Helper):
         self._i2c_scan_window.destroy()
         del self._i2c_scan_window
 
+    def display_i2c_metrics_window(self):
+        if hasattr(self, "_i2c_metrics_window"):
+            self._logger.info("I2C metrics window already open")
+            self._i2c_metrics_window.focus()
+            return
+
+        self._i2c_metrics_window = tk.Toplevel(self._parent._root)
+        self._i2c_metrics_window.title(self._parent._title + " - I2C Metrics")
+        self._i2c_metrics_window.protocol('WM_DELETE_WINDOW', self.close_i2c_metrics_window)
+        self._i2c_metrics_window.columnconfigure(100, weight=1)
+        self._i2c_metrics_window.rowconfigure(100, weight=1)
+
+        self._i2c_metrics_frame = ttk.Frame(self._i2c_metrics_window, padding="5 5 5 5")
+        self._i2c_metrics_frame.grid(column=100, row=100, sticky=(tk.N, tk.W, tk.E, tk.S))
+        self._i2c_metrics_frame.columnconfigure(100, weight=1)
+        self._i2c_metrics_frame.rowconfigure(100, weight=1)
+
+        columns = ["device", "count", "bytes", "wall", "sleep", "transfer", "mean", "max", "chunks", "retries", "failures"]
+        headings = ["Device", "Count", "Bytes", "Wall (ms)", "Sleep (ms)", "Transfer (ms)", "Mean (ms)", "Max (ms)", "Chunks/Op", "Retries", "Failures"]
+        self._i2c_metrics_tree = ttk.Treeview(self._i2c_metrics_frame, columns=columns, height=10)
+        self._i2c_metrics_tree.heading("#0", text="Operation")
+        self._i2c_metrics_tree.column("#0", width=100)
+        for idx in range(len(columns)):
+            self._i2c_metrics_tree.heading(columns[idx], text=headings[idx])
+            self._i2c_metrics_tree.column(columns[idx], width=90, anchor=tk.E)
+        self._i2c_metrics_tree.grid(column=100, row=100, sticky=(tk.N, tk.W, tk.E, tk.S))
+
+        self._i2c_metrics_summary_var = tk.StringVar()
+        self._i2c_metrics_summary_label = ttk.Label(self._i2c_metrics_frame, textvariable=self._i2c_metrics_summary_var)
+        self._i2c_metrics_summary_label.grid(column=100, row=200, sticky=(tk.W), pady=(5,5))
+
+        self._i2c_metrics_control_frame = ttk.Frame(self._i2c_metrics_frame)
+        self._i2c_metrics_control_frame.grid(column=100, row=300, sticky=(tk.E))
+
+        self._i2c_metrics_reset_button = ttk.Button(self._i2c_metrics_control_frame, text="Reset", command=self._reset_i2c_metrics)
+        self._i2c_metrics_reset_button.grid(column=100, row=100, padx=(0,5))
+
+        self._i2c_metrics_export_button = ttk.Button(self._i2c_metrics_control_frame, text="Export JSON", command=self._export_i2c_metrics)
+        self._i2c_metrics_export_button.grid(column=200, row=100)
+
+        self._refresh_i2c_metrics()
+
+    def close_i2c_metrics_window(self):
+        if not hasattr(self, "_i2c_metrics_window"):
+            self._logger.info("I2C metrics window does not exist")
+            return
+
+        self._i2c_metrics_window.after_cancel(self._i2c_metrics_refresh_id)
+        self._i2c_metrics_window.destroy()
+        del self._i2c_metrics_window
+
+    def _reset_i2c_metrics(self):
+        self._metrics.reset()
+        self._i2c_metrics_window.after_cancel(self._i2c_metrics_refresh_id)
+        self._refresh_i2c_metrics()
+
+    def _export_i2c_metrics(self):
+        from tkinter import filedialog as tkfd
+        filename = tkfd.asksaveasfilename(
+            parent=self._i2c_metrics_window,
+            title='Export I2C Metrics',
+            initialdir='./',
+            initialfile='i2c_metrics.json',
+            defaultextension='json',
+            filetypes=[('JSON files', '*.json')],
+        )
+
+        if filename is None or filename == "":
+            return
+
+        self._metrics.export_json(filename)
+
+    def _refresh_i2c_metrics(self):
+        summary = self._metrics.summary()
+
+        def row_values(device, stats):
+            count = max(stats["count"], 1)
+            chunks = sum([chunk_count*stats["chunk_histogram"][chunk_count] for chunk_count in stats["chunk_histogram"]])
+            return (
+                device,
+                stats["count"],
+                stats["bytes"],
+                "{:.1f}".format(stats["wall_ns"]/1e6),
+                "{:.1f}".format(stats["sleep_ns"]/1e6),
+                "{:.1f}".format(stats["transfer_ns"]/1e6),
+                "{:.3f}".format(stats["wall_ns"]/count/1e6),
+                "{:.3f}".format(stats["max_latency_ns"]/1e6),
+                "{:.1f}".format(chunks/count),
+                stats["retries"],
+                stats["failures"],
+            )
+
+        self._i2c_metrics_tree.delete(*self._i2c_metrics_tree.get_children())
+        for operation in summary["operations"]:
+            parent = self._i2c_metrics_tree.insert("", "end", text=operation.title(), values=row_values("All", summary["operations"][operation]), open=True)
+            for device in summary["devices"]:
+                if operation in summary["devices"][device]:
+                    self._i2c_metrics_tree.insert(parent, "end", text="", values=row_values(device, summary["devices"][device][operation]))
+
+        total = summary["total"]
+        self._i2c_metrics_summary_var.set("Time in I2C calls: {:.1f} ms of {:.1f} s ({:.1f}%), of which {:.1f} ms were spent in pacing sleeps".format(
+            total["wall_ns"]/1e6,
+            summary["elapsed_ns"]/1e9,
+            summary["i2c_fraction"]*100,
+            total["sleep_ns"]/1e6,
+        ))
+
+        self._i2c_metrics_refresh_id = self._i2c_metrics_window.after(1000, self._refresh_i2c_metrics)
+
     def scan_i2c_devices(self):
         self.scan_progress(0)
 
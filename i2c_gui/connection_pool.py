@@ -0,0 +1,145 @@
+#############################################################################
+# zlib License
+#
+# (C) 2023 Cristóvão Beirão da Cruz e Silva <cbeiraod@cern.ch>
+#
+# This software is provided 'as-is', without any express or implied
+# warranty.  In no event will the authors be held liable for any damages
+# arising from the use of this software.
+#
+# Permission is granted to anyone to use this software for any purpose,
+# including commercial applications, and to alter it and redistribute it
+# freely, subject to the following restrictions:
+#
+# 1. The origin of this software must not be misrepresented; you must not
+#    claim that you wrote the original software. If you use this software
+#    in a product, an acknowledgment in the product documentation would be
+#    appreciated but is not required.
+# 2. Altered source versions must be plainly marked as such, and must not be
+#    misrepresented as being the original software.
+# 3. This notice may not be removed or altered from any source distribution.
+#############################################################################
+
+from __future__ import annotations
+
+from .gui_helper import GUI_Helper
+from .connection_controller import Connection_Controller
+
+import logging
+import asyncio
+from collections import deque
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from .chips.base_chip import Base_Chip
+
+class Connection_Pool(GUI_Helper):
+    """
+    Several I2C buses, each with its own connection controller (and therefore its own I/O worker), and the chips attached to them.
+    Operations on chips of different buses run in parallel, while the operations on a shared bus are serialized, taking turns between the chips
+    """
+    def __init__(self, parent: GUI_Helper, **controller_params):
+        super().__init__(parent, None, parent._logger)
+
+        self._controller_params = controller_params
+        self._buses = {}
+        self._chips = {}
+        self._chip_bus = {}
+
+    @property
+    def buses(self):
+        return list(self._buses.keys())
+
+    @property
+    def chips(self):
+        return list(self._chips.keys())
+
+    @property
+    def is_connected(self):
+        for bus in self._buses.values():
+            if not bus.is_connected:
+                return False
+        return len(self._buses) > 0
+
+    def add_bus(self, name: str, connection_type: str = "USB-ISS", **connection_params):
+        """Add a bus, the connection parameters are set on the connection helper, for instance port and clk for the USB-ISS"""
+        if name in self._buses:
+            raise RuntimeError("The bus {} is already in the connection pool".format(name))
+
+        controller = Connection_Controller(self._parent, **self._controller_params)
+        controller.connection_type = connection_type
+        for param, value in connection_params.items():
+            if not hasattr(controller.handle, param):
+                raise RuntimeError("The {} connection does not have the parameter {}".format(connection_type, param))
+            setattr(controller.handle, param, value)
+
+        self._buses[name] = controller
+        return controller
+
+    def get_bus(self, name: str) -> Connection_Controller:
+        return self._buses[name]
+
+    def add_chip(self, name: str, bus_name: str, chip_class, **chip_params):
+        """Create a chip attached to one of the buses of the pool"""
+        if name in self._chips:
+            raise RuntimeError("The chip {} is already in the connection pool".format(name))
+
+        chip = chip_class(parent=self._parent, i2c_controller=self._buses[bus_name], **chip_params)
+        self._chips[name] = chip
+        self._chip_bus[name] = bus_name
+        return chip
+
+    def get_chip(self, name: str) -> Base_Chip:
+        return self._chips[name]
+
+    def get_chip_bus(self, name: str):
+        return self._chip_bus[name]
+
+    def connect(self):
+        for name, bus in self._buses.items():
+            bus.connect()
+            if not bus.is_connected:
+                self.send_message("Unable to connect the bus {}".format(name), "Error")
+        return self.is_connected
+
+    def disconnect(self):
+        for bus in self._buses.values():
+            bus.disconnect()
+
+    async def _run_bus(self, chip_queues: dict[str, deque], results: dict[int, object]):
+        # A single job at a time on the bus, taking the chips in turn so that a long list of operations on one chip does not starve the others
+        while len(chip_queues) > 0:
+            for chip_name in list(chip_queues.keys()):
+                job_id, operation = chip_queues[chip_name].popleft()
+                try:
+                    results[job_id] = await operation(self._chips[chip_name])
+                except Exception as error:
+                    results[job_id] = error
+                if len(chip_queues[chip_name]) == 0:
+                    del chip_queues[chip_name]
+
+    async def run(self, jobs: list[tuple[str, object]]):
+        """
+        Run a list of (chip name, operation) jobs, where the operation is called with the chip and returns an awaitable, for instance:
+            lambda chip: chip.read_all_async()
+        Returns the results in the order of the jobs, a job which raised has the exception as its result
+        """
+        bus_queues = {}
+        for job_id, (chip_name, operation) in enumerate(jobs):
+            bus_name = self._chip_bus[chip_name]
+            if bus_name not in bus_queues:
+                bus_queues[bus_name] = {}
+            if chip_name not in bus_queues[bus_name]:
+                bus_queues[bus_name][chip_name] = deque()
+            bus_queues[bus_name][chip_name].append((job_id, operation))
+
+        results = {}
+        await asyncio.gather(*[self._run_bus(chip_queues, results) for chip_queues in bus_queues.values()])
+        return [results[job_id] for job_id in range(len(jobs))]
+
+    def run_all(self, operation, chip_names: list[str] = None):
+        """Blocking helper which runs the same operation on all the chips (or the given ones), for scripts without an event loop"""
+        if chip_names is None:
+            chip_names = self.chips
+        results = asyncio.run(self.run([(chip_name, operation) for chip_name in chip_names]))
+        return dict(zip(chip_names, results))
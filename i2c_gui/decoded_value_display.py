@@ -24,8 +24,10 @@ from __future__ import annotations
 
 from .gui_helper import GUI_Helper
 from .functions import hex_0fill
+from .functions import label_text_offset
 
 import tkinter as tk
+import tkinter.font
 import tkinter.ttk as ttk  # For themed widgets (gives a more native visual to the elements)
 import logging
 
@@ -83,9 +85,11 @@ class Decoded_Value_Display(GUI_Helper):
                 self._shadow_var.trace_remove('write', self._callback_update_display_var)
                 self._shadow_var = None
 
-            # Update displayed value
-            if val is not None:
+            # Update displayed value, switching the shadow var does not change whether the memory is modified
+            if val is not None and self._display_var.get() != val.get():
+                self._rebinding_shadow_var = True
                 self._display_var.set(val.get())
+                del self._rebinding_shadow_var
 
             # Set new shadow var
             self._shadow_var = val
@@ -158,21 +162,13 @@ class Decoded_Value_Display(GUI_Helper):
                 self._value_binary_label = ttk.Label(self._frame, text="Binary:", padding=padding)
                 self._value_binary_label.grid(column=binary_col, row=binary_row, sticky=tk.E)
 
-                self._value_binary_frame = ttk.Frame(self._frame)
-                self._value_binary_frame.grid(column=binary_col+100, row=binary_row, sticky=(tk.W, tk.S, tk.N), padx=0, pady=0)
+                # A single label draws the whole bit field, the clicked bit is found from the position in the label
+                self._value_binary = ttk.Label(self._frame, font='TkFixedFont', text="0b" + "0"*self._bits, padding=0)
+                self._value_binary.grid(column=binary_col+100, row=binary_row, sticky=(tk.W, tk.S, tk.N), padx=0, pady=0)
                 self._frame.rowconfigure(binary_row, weight=1)
-                self._value_binary_frame.rowconfigure(100, weight=1)
 
-                self._value_binary_prefix = ttk.Label(self._value_binary_frame, font='TkFixedFont', text="0b")
-                self._value_binary_prefix.grid(column=100, row=100)
-
-                for idx in range(self._bits):
-                    bit = self._bits - 1 - idx
-                    bit_label = ttk.Label(self._value_binary_frame, font='TkFixedFont', text="0")
-                    bit_label.grid(column = 200 + 100*idx, row = 100)
-                    if not self._read_only:
-                        bit_label.bind("<Button-1>", lambda e, bit=bit:self._toggle_bit(bit))
-                    self.__setattr__("_value_binary_bit{}".format(bit), bit_label)
+                if not self._read_only:
+                    self._value_binary.bind("<Button-1>", self._binary_clicked)
 
                 self._callback_update_binary_repr = self._display_var.trace_add('write', self._update_binary_repr)
                 self._update_binary_repr()
@@ -227,18 +223,26 @@ class Decoded_Value_Display(GUI_Helper):
         else:
             self.send_message("Unable to write value {}, check that the value makes sense: '{}'".format(self._name, self._display_var.get()))
 
+    def _binary_clicked(self, event: tk.Event):
+        text_x = event.x - label_text_offset(self._value_binary)
+        char_idx = text_x // tkinter.font.nametofont('TkFixedFont').measure("0") - 2  # Skip the 0b prefix
+        if char_idx >= 0 and char_idx < self._bits:
+            self._toggle_bit(self._bits - 1 - char_idx)
+
     def _toggle_bit(self, bit_idx):
         if self._enabled:
             value = int(self._display_var.get(), 0)
             self._display_var.set(hex_0fill(value ^ (1 << bit_idx), self._bits))
 
     def _update_display_var(self, var=None, index=None, mode=None):
-        self._logger.detailed_trace("Attempting to update display var from shadow var for {}".format(self._name))
+        self._logger.detailed_trace("Attempting to update display var from shadow var for %s", self._name)
         if hasattr(self, "_updating_from_display_var"):  # Avoid an infinite loop where the two variables trigger each other
             return
+        if self._parent.notifications_suspended:  # The display will be refreshed once the bulk update finishes
+            return
 
         if self._shadow_var is not None:
-            self._logger.trace("Updating display var from shadow var for {}".format(self._name))
+            self._logger.trace("Updating display var from shadow var for %s", self._name)
 
             self._updating_from_shadow_var = True
 
@@ -247,12 +251,12 @@ class Decoded_Value_Display(GUI_Helper):
             del self._updating_from_shadow_var
 
     def _update_shadow_var(self, var=None, index=None, mode=None):
-        self._logger.detailed_trace("Attempting to update shadow var from display var for {}".format(self._name))
+        self._logger.detailed_trace("Attempting to update shadow var from display var for %s", self._name)
         if hasattr(self, "_updating_from_shadow_var"):  # Avoid an infinite loop where the two variables trigger each other
             return
 
         if self._shadow_var is not None:
-            self._logger.trace("Updating shadow var from display var for {}".format(self._name))
+            self._logger.trace("Updating shadow var from display var for %s", self._name)
 
             self._updating_from_display_var = True
 
@@ -260,18 +264,34 @@ class Decoded_Value_Display(GUI_Helper):
 
             del self._updating_from_display_var
 
+    def refresh(self):
+        if self._shadow_var is not None:
+            self._updating_from_shadow_var = True
+
+            self._display_var.set(self._shadow_var.get())
+
+            del self._updating_from_shadow_var
+
+        if hasattr(self, "_value_binary"):
+            self._draw_binary_repr()
+
     def _update_binary_repr(self, var=None, index=None, mode=None):
+        if self._parent.notifications_suspended:  # The display will be refreshed once the bulk update finishes
+            return
+
+        self._draw_binary_repr()
+
+        if not hasattr(self, "_rebinding_shadow_var"):
+            self._parent.update_whether_modified()
+
+    def _draw_binary_repr(self):
         binary_string = ''.join(["0" for i in range(self._bits)])
         if self._display_var.get() != '' and self._display_var.get() != '0x':  # If value is set, decode the binary string
             binary_string = format(int(self._display_var.get(), 0), 'b')
             if len(binary_string) < self._bits:
                 prepend = '0'*(self._bits-len(binary_string))
                 binary_string = prepend + binary_string
-        for bit in range(self._bits):
-            value = binary_string[self._bits-1-bit]
-            getattr(self, "_value_binary_bit{}".format(bit)).config(text=value)
-
-        self._parent.update_whether_modified()
+        self._value_binary.config(text="0b" + binary_string)
 
     def invalid_value_value(self, string: str):
         self.send_message("Invalid value trying to be set for value {}: {}".format(self._name, string))
@@ -123,6 +123,24 @@ def hex_0fill(val: str, bits: int):
             val = int(val, 0)
     return "{0:#0{1}x}".format(val, ceil(bits/4) + 2)  # We have to add 2 to account for the two characters which make the hex identifier, i.e. '0x'
 
+def label_text_offset(label) -> int:
+    """Horizontal distance (in pixels) from the left edge of a label to its text, i.e. the border plus the left padding"""
+    offset = 0
+    for option in ["borderwidth", "padding", "padx"]:
+        if option not in label.keys():
+            continue
+
+        value = label.tk.splitlist(label.cget(option))
+        if len(value) == 0 and option != "padx":  # Themed widgets take the unset options from their style
+            style = label.cget("style") if "style" in label.keys() else ""
+            if style == "":
+                style = label.winfo_class()
+            value = label.tk.splitlist(label.tk.call("ttk::style", "lookup", style, "-" + option))
+
+        if len(value) > 0 and str(value[0]) != "":
+            offset += label.winfo_pixels(str(value[0]))
+    return offset
+
 def validate_num(string: str):
     digit_regex = r"\d+"
 
@@ -24,14 +24,25 @@ from __future__ import annotations
 
 from .gui_helper import GUI_Helper
 from .base_gui import Base_GUI
+from .profiling import traced
 
 import tkinter as tk
 import tkinter.ttk as ttk  # For themed widgets (gives a more native visual to the elements)
 import logging
 import time
+import threading
+import json
+from pathlib import Path
 
 class I2C_Connection_Helper(GUI_Helper):
     _parent: Base_GUI
+
+    # Largest reliable chunk sizes found by probing, shared by all the helpers so they survive reconnecting, indexed by (adapter id, operation, register bits).
+    # They are also saved to a file, so they survive restarts
+    _chunk_size_cache = {}
+    _chunk_size_file = Path.home() / ".i2c_gui" / "chunk_sizes.json"
+    _chunk_size_file_loaded = False
+
     def __init__(self, parent: Base_GUI, max_seq_byte: int, swap_endian: bool):
         super().__init__(parent, None, parent._logger)
         self._max_seq_byte = max_seq_byte
@@ -39,6 +50,46 @@ class I2C_Connection_Helper(GUI_Helper):
 
         self._no_connect = None
 
+        # The adapter id is kept while connected, so the transfers do not read tk variables (they may run outside the main thread)
+        self._connected_adapter_id = None
+
+        # Number of chunks handed over to the derived class at once, helpers which can queue several
+        # I2C commands in a single exchange with the adapter should increase it
+        self._pipeline_depth = 1
+
+        # The chunk size used for each (adapter, operation, register bits) is reduced when transfers fail and grown back
+        # after _chunk_grow_threshold clean transfers, up to the size found by probing or else the limit of the adapter
+        self._chunk_sizes = {}
+        self._clean_chunk_count = {}
+        self._chunk_grow_threshold = 64
+
+        # Failed transfers are repeated up to _max_retries times, with smaller chunks and an exponentially growing pause
+        self._max_retries = 3
+        self._retry_delay_us = 1000
+        self._max_retry_delay_us = 100000
+
+        # Details of the last transfer, for the metrics kept by the connection controller
+        self._last_chunk_count = 0
+        self._last_sleep_ns = 0
+        self._last_retry_count = 0
+
+    @property
+    def last_chunk_count(self):
+        return self._last_chunk_count
+
+    @property
+    def last_sleep_ns(self):
+        return self._last_sleep_ns
+
+    @property
+    def last_retry_count(self):
+        return self._last_retry_count
+
+    def set_retry_policy(self, max_retries: int, retry_delay_us: int, max_retry_delay_us: int):
+        self._max_retries = max_retries
+        self._retry_delay_us = retry_delay_us
+        self._max_retry_delay_us = max_retry_delay_us
+
     def _check_i2c_device(self, address: int):
         raise RuntimeError("Derived classes must implement the individual device access functions: check_device")
 
@@ -48,6 +99,15 @@ class I2C_Connection_Helper(GUI_Helper):
     def _read_i2c_device_memory(self, address: int, memory_address: int, byte_count: int, register_bits: int = 16) -> list[int]:
         raise RuntimeError("Derived classes must implement the individual device access functions: _read_device_memory")
 
+    def _read_i2c_device_memory_chunks(self, address: int, chunks: list[tuple[int, int]], register_bits: int = 16) -> list[list[int]]:
+        # Default implementation, one I2C command at a time. Each chunk is a (memory address, byte count) tuple
+        return [self._read_i2c_device_memory(address, memory_address, byte_count, register_bits) for memory_address, byte_count in chunks]
+
+    def _write_i2c_device_memory_chunks(self, address: int, chunks: list[tuple[int, list[int]]], register_bits: int = 16):
+        # Default implementation, one I2C command at a time. Each chunk is a (memory address, data) tuple
+        for memory_address, data in chunks:
+            self._write_i2c_device_memory(address, memory_address, data, register_bits)
+
     def display_in_frame(self, frame: ttk.Frame):
         raise RuntimeError("Derived classes must implement the display function")
 
@@ -60,6 +120,7 @@ class I2C_Connection_Helper(GUI_Helper):
     def disconnect(self):
         raise RuntimeError("Derived classes must implement the disconnect method")
 
+    @traced("i2c")
     def check_i2c_device(self, address: int):
         self._parent.send_i2c_logging_message("Trying to find the I2C device with address 0x{:02x}".format(address))
 
@@ -80,6 +141,204 @@ class I2C_Connection_Helper(GUI_Helper):
         high_byte = tmp[-4:-2]
         return int("0x" + low_byte + high_byte, 16)
 
+    def _device_memory_address(self, memory_address: int, register_bits: int):
+        if self._swap_endian and register_bits == 16:
+            return self.swap_endian_16bit(memory_address)
+        return memory_address
+
+    @property
+    def adapter_id(self):
+        """Identifies the physical adapter, so the chunk sizes found by probing can be reused. Derived classes should override it"""
+        return None
+
+    def remember_connection_params(self):
+        """Called on the main thread once connected, derived classes should keep here any other parameter from tk variables used by the transfers"""
+        self._connected_adapter_id = self.adapter_id
+        self._load_probed_chunk_sizes()
+
+    def _load_probed_chunk_sizes(self):
+        if I2C_Connection_Helper._chunk_size_file_loaded:
+            return
+        I2C_Connection_Helper._chunk_size_file_loaded = True
+
+        if not self._chunk_size_file.is_file():
+            return
+        try:
+            with open(self._chunk_size_file, 'r') as file:
+                probed_sizes = json.load(file)
+        except (OSError, ValueError) as error:
+            self._logger.warning("Unable to load the probed chunk sizes from {}: {}".format(self._chunk_size_file, error))
+            return
+
+        for key in probed_sizes:
+            adapter_id, operation, register_bits = key.rsplit("|", 2)
+            self._chunk_size_cache.setdefault((adapter_id, operation, int(register_bits)), probed_sizes[key])
+
+    def _save_probed_chunk_sizes(self):
+        probed_sizes = {}
+        for (adapter_id, operation, register_bits), chunk_size in self._chunk_size_cache.items():
+            if adapter_id is not None:
+                probed_sizes["{}|{}|{}".format(adapter_id, operation, register_bits)] = chunk_size
+
+        self._chunk_size_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self._chunk_size_file, 'w') as file:
+            json.dump(probed_sizes, file, indent=2)
+
+    def forget_connection_params(self):
+        self._connected_adapter_id = None
+
+    def _chunk_key(self, operation: str, register_bits: int):
+        if self._connected_adapter_id is not None:
+            return (self._connected_adapter_id, operation, register_bits)
+        return (self.adapter_id, operation, register_bits)
+
+    def _get_max_chunk_size(self, operation: str, register_bits: int):
+        # Largest transfer supported by the adapter, derived classes should override it with the limits of the hardware
+        return self._max_seq_byte
+
+    def _get_chunk_ceiling(self, operation: str, register_bits: int):
+        key = self._chunk_key(operation, register_bits)
+        if key in self._chunk_size_cache:
+            return self._chunk_size_cache[key]
+        # Never probed, start from the limit of the adapter and rely on the chunks being halved if the transfers fail
+        return self._get_max_chunk_size(operation, register_bits)
+
+    def get_chunk_size(self, operation: str, register_bits: int = 16):
+        key = self._chunk_key(operation, register_bits)
+        if key not in self._chunk_sizes:
+            self._chunk_sizes[key] = self._get_chunk_ceiling(operation, register_bits)
+        return self._chunk_sizes[key]
+
+    def _chunk_failed(self, operation: str, register_bits: int):
+        # Returns whether the chunk size could be reduced, i.e. whether it is worth repeating the transfer
+        key = self._chunk_key(operation, register_bits)
+        chunk_size = self.get_chunk_size(operation, register_bits)
+        self._clean_chunk_count[key] = 0
+        if chunk_size <= 1:
+            return False
+
+        self._chunk_sizes[key] = chunk_size//2
+        self._logger.warning("Failed I2C {} transfer with chunks of {} bytes, reducing the chunk size to {} bytes".format(operation, chunk_size, chunk_size//2))
+        return True
+
+    def _chunk_succeeded(self, operation: str, register_bits: int):
+        # After enough clean transfers, the chunk size is grown back towards the largest size known to be reliable
+        key = self._chunk_key(operation, register_bits)
+        chunk_size = self.get_chunk_size(operation, register_bits)
+        ceiling = self._get_chunk_ceiling(operation, register_bits)
+
+        if chunk_size >= ceiling:
+            return
+
+        count = self._clean_chunk_count.get(key, 0) + 1
+        if count >= self._chunk_grow_threshold:
+            self._chunk_sizes[key] = min(chunk_size*2, ceiling)
+            count = 0
+        self._clean_chunk_count[key] = count
+
+    def _retry_failed_transfer(self, operation: str, device_address: int, register_bits: int, attempt: int, error: Exception):
+        # The chunks are re-split into smaller ones (down to single bytes) and the transfer is repeated after a pause
+        self._last_retry_count += 1
+        if self._max_seq_byte is not None:
+            self._chunk_failed(operation, register_bits)
+
+        delay_us = min(self._retry_delay_us * 2**(attempt - 1), self._max_retry_delay_us)
+        self._logger.warning("Failed I2C {} of device 0x{:02x} ({}), retrying in {:.1f} ms (attempt {} of {})".format(operation, device_address, error, delay_us/1000, attempt, self._max_retries))
+
+        sleep_start = time.perf_counter_ns()
+        time.sleep(delay_us/1E6)
+        self._last_sleep_ns += time.perf_counter_ns() - sleep_start
+
+    def _with_retries(self, operation: str, device_address: int, register_bits: int, function):
+        attempt = 0
+        while True:
+            try:
+                return function()
+            except Exception as error:
+                attempt += 1
+                if attempt > self._max_retries:
+                    raise
+                self._retry_failed_transfer(operation, device_address, register_bits, attempt, error)
+
+    def _read_with_chunk_size(self, device_address: int, memory_address: int, byte_count: int, register_bits: int, chunk_size: int):
+        chunks = []
+        for offset in range(0, byte_count, chunk_size):
+            chunks += [(self._device_memory_address(memory_address + offset, register_bits), min(chunk_size, byte_count - offset))]
+
+        data = []
+        for idx in range(0, len(chunks), self._pipeline_depth):
+            for this_data in self._read_i2c_device_memory_chunks(device_address, chunks[idx:idx + self._pipeline_depth], register_bits):
+                data += this_data
+        return data
+
+    def _write_with_chunk_size(self, device_address: int, memory_address: int, data: list[int], register_bits: int, chunk_size: int):
+        chunks = []
+        for offset in range(0, len(data), chunk_size):
+            chunks += [(self._device_memory_address(memory_address + offset, register_bits), data[offset:offset + chunk_size])]
+
+        for idx in range(0, len(chunks), self._pipeline_depth):
+            self._write_i2c_device_memory_chunks(device_address, chunks[idx:idx + self._pipeline_depth], register_bits)
+
+    def probe_chunk_size(self, device_address: int, memory_address: int, byte_count: int = None, register_bits: int = 16, include_write: bool = False):
+        """
+        Find the largest chunk sizes giving reliable transfers over a memory range and keep them for this adapter.
+        The range must hold stable values (i.e. configuration registers) and is only written, with its own contents, if include_write is set
+        """
+        if self._max_seq_byte is None or not self.is_connected or self._no_connect:
+            return None
+
+        max_read = self._get_max_chunk_size("read", register_bits)
+        max_write = self._get_max_chunk_size("write", register_bits)
+        if byte_count is None:
+            byte_count = 2*max(max_read, max_write)
+
+        # Candidate sizes are powers of 2 above the default size, plus the limit of the adapter
+        def candidate_sizes(max_size: int):
+            sizes = []
+            size = self._max_seq_byte*2
+            while size < max_size:
+                sizes += [size]
+                size *= 2
+            if max_size > self._max_seq_byte:
+                sizes += [max_size]
+            return sizes
+
+        reference = self._read_with_chunk_size(device_address, memory_address, byte_count, register_bits, self._max_seq_byte)
+
+        results = {}
+        best = self._max_seq_byte
+        for size in candidate_sizes(max_read):
+            try:
+                if self._read_with_chunk_size(device_address, memory_address, byte_count, register_bits, size) != reference:
+                    break
+            except Exception:
+                break
+            best = size
+        results["read"] = best
+
+        if include_write:
+            best = self._max_seq_byte
+            for size in candidate_sizes(max_write):
+                try:
+                    self._write_with_chunk_size(device_address, memory_address, reference, register_bits, size)
+                    if self._read_with_chunk_size(device_address, memory_address, byte_count, register_bits, self._max_seq_byte) != reference:
+                        break
+                except Exception:
+                    break
+                best = size
+            results["write"] = best
+
+        for operation in results:
+            key = self._chunk_key(operation, register_bits)
+            self._chunk_size_cache[key] = results[operation]
+            self._chunk_sizes[key] = results[operation]
+            self._clean_chunk_count[key] = 0
+        if self._chunk_key("read", register_bits)[0] is not None:
+            self._save_probed_chunk_sizes()
+
+        return results
+
+    @traced("i2c")
     def read_device_memory(self, device_address: int, memory_address: int, byte_count: int = 1, register_bits: int = 16):
         if not self.is_connected:
             raise RuntimeError("You must first connect to a device before trying to read registers from it")
@@ -88,10 +347,13 @@ class I2C_Connection_Helper(GUI_Helper):
         if not validate_i2c_address(hex(device_address)):
             raise RuntimeError("Invalid I2C address received: {}".format(hex(device_address)))
 
-        if byte_count == 1:
-            self._parent.send_i2c_logging_message("Trying to read the register 0x{:04x} of the I2C device with address 0x{:02x}:".format(memory_address, device_address))
-        else:
-            self._parent.send_i2c_logging_message("Trying to read a register block with size {} starting at register 0x{:04x} of the I2C device with address 0x{:02x}:".format(byte_count, memory_address, device_address))
+        # Checked only once, so that the transfers do not pay for the monitor when it is disabled
+        tracing = self._parent.is_logging_i2c
+        # The progress is shown through the GUI, which may only be touched from the main thread
+        show_progress = threading.current_thread() is threading.main_thread()
+        self._last_chunk_count = 1
+        self._last_sleep_ns = 0
+        self._last_retry_count = 0
 
         data = []
         if self._no_connect:
@@ -99,44 +361,68 @@ class I2C_Connection_Helper(GUI_Helper):
                 data = [42]
             else:
                 data = [i for i in range(byte_count)]
-            self._parent.send_i2c_logging_message("   Software emulation (no connect) is enabled, so returning dummy values.\n   {}\n".format(repr(data)))
+            if tracing:
+                self._parent.send_i2c_logging_message("Software emulation (no connect) is enabled, so returning dummy values.")
+                self._parent.record_i2c_transaction("Read", device_address, memory_address, data)
 
         elif self._max_seq_byte is None:
-            if self._swap_endian and register_bits == 16:
-                memory_address = self.swap_endian_16bit(memory_address)
-            data = self._read_i2c_device_memory(device_address, memory_address, byte_count, register_bits)
-            self._parent.send_i2c_logging_message("   {}\n".format(repr(data)))
+            data = self._with_retries("read", device_address, register_bits, lambda: self._read_i2c_device_memory(device_address, self._device_memory_address(memory_address, register_bits), byte_count, register_bits))
+            if tracing:
+                self._parent.record_i2c_transaction("Read", device_address, memory_address, data)
         else:
-            from math import ceil
             from time import sleep
             data = []
-            seq_calls = ceil(byte_count/self._max_seq_byte)
-            self._parent.send_i2c_logging_message("   Breaking the read into {} individual reads of {} bytes:".format(seq_calls, self._max_seq_byte))
+            self._last_chunk_count = 0
 
             lastUpdateTime = time.time_ns()
-            for i in range(seq_calls):
+            offset = 0
+            attempt = 0
+            while offset < byte_count:
                 thisTime = time.time_ns()
-                if thisTime - lastUpdateTime > 0.2 * 10**9:
-                    self.display_progress("Reading:", i*100./seq_calls)
+                if show_progress and thisTime - lastUpdateTime > 0.2 * 10**9:
+                    lastUpdateTime = thisTime
+                    self.display_progress("Reading:", offset*100./byte_count)
                     #self._frame.update_idletasks()
-                    self._frame.update()
-
-                this_block_address = memory_address + i*self._max_seq_byte
-                bytes_to_read = min(self._max_seq_byte, byte_count - i*self._max_seq_byte)
-                self._parent.send_i2c_logging_message("      Read operation {}: reading {} bytes starting from 0x{:04x}".format(i, bytes_to_read, this_block_address))
-
-                if self._swap_endian and register_bits == 16:
-                    this_block_address = self.swap_endian_16bit(this_block_address)
-                this_data = self._read_i2c_device_memory(device_address, this_block_address, bytes_to_read, register_bits)
-                self._parent.send_i2c_logging_message("         {}".format(repr(this_data)))
-
-                data += this_data
+                    if self._frame is not None:  # There is no frame to refresh when used from a script
+                        self._frame.update()
+
+                chunk_size = self.get_chunk_size("read", register_bits)
+                block_addresses = []
+                chunks = []
+                chunk_offset = offset
+                while chunk_offset < byte_count and len(chunks) < self._pipeline_depth:
+                    bytes_to_read = min(chunk_size, byte_count - chunk_offset)
+                    block_addresses += [memory_address + chunk_offset]
+                    chunks += [(self._device_memory_address(memory_address + chunk_offset, register_bits), bytes_to_read)]
+                    chunk_offset += bytes_to_read
+
+                try:
+                    chunk_data = self._read_i2c_device_memory_chunks(device_address, chunks, register_bits)
+                except Exception as error:
+                    attempt += 1
+                    if attempt > self._max_retries:
+                        raise
+                    self._retry_failed_transfer("read", device_address, register_bits, attempt, error)
+                    continue  # Repeat from the same offset with smaller chunks
+                attempt = 0
+                self._chunk_succeeded("read", register_bits)
+
+                for this_block_address, this_data in zip(block_addresses, chunk_data):
+                    if tracing:
+                        self._parent.record_i2c_transaction("Read", device_address, this_block_address, this_data)
+                    data += this_data
+                self._last_chunk_count += len(chunks)
+                offset = chunk_offset
+
+                sleep_start = time.perf_counter_ns()
                 sleep(0.00001)
+                self._last_sleep_ns += time.perf_counter_ns() - sleep_start
 
-            self.clear_progress()
-            self._parent.send_i2c_logging_message("   Full data:\n      {}\n".format(repr(data)))
+            if show_progress:
+                self.clear_progress()
         return data
 
+    @traced("i2c")
     def write_device_memory(self, device_address: int, memory_address: int, data: list[int], register_bits: int = 16):
         if not self.is_connected:
             raise RuntimeError("You must first connect to a device before trying to write registers to it")
@@ -147,45 +433,69 @@ class I2C_Connection_Helper(GUI_Helper):
 
         byte_count = len(data)
 
-        if byte_count == 1:
-            self._parent.send_i2c_logging_message("Trying to write the value 0x{:02x} to the register 0x{:04x} of the I2C device with address 0x{:02x}:".format(data[0], memory_address, device_address))
-        else:
-            self._parent.send_i2c_logging_message("Trying to write a register block with size {} starting at register 0x{:04x} of the I2C device with address 0x{:02x}:\n   Writing the value array: {}".format(byte_count, memory_address, device_address, repr(data)))
+        # Checked only once, so that the transfers do not pay for the monitor when it is disabled
+        tracing = self._parent.is_logging_i2c
+        # The progress is shown through the GUI, which may only be touched from the main thread
+        show_progress = threading.current_thread() is threading.main_thread()
+        self._last_chunk_count = 1
+        self._last_sleep_ns = 0
+        self._last_retry_count = 0
 
         if self._no_connect:
-            self._parent.send_i2c_logging_message("   Software emulation (no connect) is enabled, so no write action is taken.\n")
+            if tracing:
+                self._parent.send_i2c_logging_message("Software emulation (no connect) is enabled, so no write action is taken.")
+                self._parent.record_i2c_transaction("Write", device_address, memory_address, data)
             return
 
         if self._max_seq_byte is None:
-            self._parent.send_i2c_logging_message("   Writing the full block at once\n")
-            if self._swap_endian and register_bits == 16:
-                memory_address = self.swap_endian_16bit(memory_address)
-            self._write_i2c_device_memory(device_address, memory_address, data, register_bits)
+            self._with_retries("write", device_address, register_bits, lambda: self._write_i2c_device_memory(device_address, self._device_memory_address(memory_address, register_bits), data, register_bits))
+            if tracing:
+                self._parent.record_i2c_transaction("Write", device_address, memory_address, data)
         else:
-            from math import ceil
             from time import sleep
-            seq_calls = ceil(byte_count/self._max_seq_byte)
-            self._parent.send_i2c_logging_message("   Breaking the write into {} individual writes of {} bytes:".format(seq_calls, self._max_seq_byte))
+            self._last_chunk_count = 0
 
             lastUpdateTime = time.time_ns()
-            for i in range(seq_calls):
+            offset = 0
+            attempt = 0
+            while offset < byte_count:
                 thisTime = time.time_ns()
-                if thisTime - lastUpdateTime > 0.2 * 10**9:
-                    self.display_progress("Writing:", i*100./seq_calls)
+                if show_progress and thisTime - lastUpdateTime > 0.2 * 10**9:
+                    lastUpdateTime = thisTime
+                    self.display_progress("Writing:", offset*100./byte_count)
                     #self._frame.update_idletasks()
-                    self._frame.update()
-
-                this_block_address = memory_address + i*self._max_seq_byte
-                bytes_to_write = min(self._max_seq_byte, byte_count - i*self._max_seq_byte)
-                self._parent.send_i2c_logging_message("      Write operation {}: writing {} bytes starting from 0x{:04x}".format(i, bytes_to_write, this_block_address))
-
-                this_data = data[i*self._max_seq_byte:i*self._max_seq_byte+bytes_to_write]
-                self._parent.send_i2c_logging_message("         {}".format(repr(this_data)))
-
-                if self._swap_endian and register_bits == 16:
-                    this_block_address = self.swap_endian_16bit(this_block_address)
-                self._write_i2c_device_memory(device_address, this_block_address, this_data, register_bits)
-
+                    if self._frame is not None:  # There is no frame to refresh when used from a script
+                        self._frame.update()
+
+                chunk_size = self.get_chunk_size("write", register_bits)
+                block_addresses = []
+                chunks = []
+                chunk_offset = offset
+                while chunk_offset < byte_count and len(chunks) < self._pipeline_depth:
+                    bytes_to_write = min(chunk_size, byte_count - chunk_offset)
+                    block_addresses += [memory_address + chunk_offset]
+                    chunks += [(self._device_memory_address(memory_address + chunk_offset, register_bits), data[chunk_offset:chunk_offset + bytes_to_write])]
+                    chunk_offset += bytes_to_write
+
+                try:
+                    self._write_i2c_device_memory_chunks(device_address, chunks, register_bits)
+                except Exception as error:
+                    attempt += 1
+                    if attempt > self._max_retries:
+                        raise
+                    self._retry_failed_transfer("write", device_address, register_bits, attempt, error)
+                    continue  # Repeat from the same offset with smaller chunks, rewriting the same values is harmless
+                attempt = 0
+                self._chunk_succeeded("write", register_bits)
+
+                if tracing:
+                    for this_block_address, (address_to_write, this_data) in zip(block_addresses, chunks):
+                        self._parent.record_i2c_transaction("Write", device_address, this_block_address, this_data)
+                self._last_chunk_count += len(chunks)
+                offset = chunk_offset
+
+                sleep_start = time.perf_counter_ns()
                 sleep(0.00001)
-            self._parent.send_i2c_logging_message("")
-            self.clear_progress()
\ No newline at end of file
+                self._last_sleep_ns += time.perf_counter_ns() - sleep_start
+            if show_progress:
+                self.clear_progress()
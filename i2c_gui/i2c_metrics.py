@@ -0,0 +1,131 @@
+#############################################################################
+# zlib License
+#
+# (C) 2023 Cristóvão Beirão da Cruz e Silva <cbeiraod@cern.ch>
+#
+# This software is provided 'as-is', without any express or implied
+# warranty.  In no event will the authors be held liable for any damages
+# arising from the use of this software.
+#
+# Permission is granted to anyone to use this software for any purpose,
+# including commercial applications, and to alter it and redistribute it
+# freely, subject to the following restrictions:
+#
+# 1. The origin of this software must not be misrepresented; you must not
+#    claim that you wrote the original software. If you use this software
+#    in a product, an acknowledgment in the product documentation would be
+#    appreciated but is not required.
+# 2. Altered source versions must be plainly marked as such, and must not be
+#    misrepresented as being the original software.
+# 3. This notice may not be removed or altered from any source distribution.
+#############################################################################
+
+from __future__ import annotations
+
+import time
+import json
+import threading
+
+class I2C_Metrics():
+    _operations = ["read", "write", "check"]
+
+    def __init__(self):
+        # The metrics may be read by a monitoring thread while the transactions are being recorded
+        self._lock = threading.RLock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._start_time = time.time_ns()
+            self._stats = {}
+
+    def _new_stats(self):
+        return {
+            "count": 0,
+            "bytes": 0,
+            "wall_ns": 0,
+            "sleep_ns": 0,
+            "transfer_ns": 0,
+            "max_latency_ns": 0,
+            "retries": 0,  # Failed attempts which were repeated
+            "failures": 0,  # Transactions which failed even after the retries
+            "latency_histogram_us": {},  # Upper edge of each power of 2 bin (in us) -> count
+            "chunk_histogram": {},  # Number of chunks a transaction was split into -> count
+        }
+
+    def record(self, operation: str, device_address: int, byte_count: int, wall_ns: int, sleep_ns: int, chunks: int = 1, retries: int = 0, failed: bool = False):
+        if operation not in self._operations:
+            raise RuntimeError("Unknown I2C operation for the metrics: {}".format(operation))
+
+        with self._lock:
+            if (operation, device_address) not in self._stats:
+                self._stats[(operation, device_address)] = self._new_stats()
+            stats = self._stats[(operation, device_address)]
+
+            stats["count"] += 1
+            stats["bytes"] += byte_count
+            stats["wall_ns"] += wall_ns
+            stats["sleep_ns"] += sleep_ns
+            stats["transfer_ns"] += wall_ns - sleep_ns
+            stats["max_latency_ns"] = max(stats["max_latency_ns"], wall_ns)
+            stats["retries"] += retries
+            if failed:
+                stats["failures"] += 1
+
+            latency_bin = 1 << (wall_ns // 1000).bit_length()
+            stats["latency_histogram_us"][latency_bin] = stats["latency_histogram_us"].get(latency_bin, 0) + 1
+            stats["chunk_histogram"][chunks] = stats["chunk_histogram"].get(chunks, 0) + 1
+
+    def _merge(self, stats_list: list[dict]):
+        merged = self._new_stats()
+        for stats in stats_list:
+            for key in ["count", "bytes", "wall_ns", "sleep_ns", "transfer_ns", "retries", "failures"]:
+                merged[key] += stats[key]
+            merged["max_latency_ns"] = max(merged["max_latency_ns"], stats["max_latency_ns"])
+            for histogram in ["latency_histogram_us", "chunk_histogram"]:
+                for key in stats[histogram]:
+                    merged[histogram][key] = merged[histogram].get(key, 0) + stats[histogram][key]
+        return merged
+
+    def get_stats(self, operation: str = None, device_address: int = None):
+        """Aggregated metrics, optionally restricted to an operation type and/or device address"""
+        with self._lock:
+            selected = []
+            for (stats_operation, stats_device), stats in self._stats.items():
+                if operation is not None and stats_operation != operation:
+                    continue
+                if device_address is not None and stats_device != device_address:
+                    continue
+                selected += [stats]
+            return self._merge(selected)
+
+    def summary(self):
+        with self._lock:
+            elapsed_ns = time.time_ns() - self._start_time
+            total = self.get_stats()
+
+            per_operation = {}
+            for operation in self._operations:
+                per_operation[operation] = self.get_stats(operation=operation)
+
+            per_device = {}
+            for operation, device_address in sorted(self._stats.keys(), key=lambda key: (key[1], key[0])):
+                device = "0x{:02x}".format(device_address)
+                if device not in per_device:
+                    per_device[device] = {}
+                per_device[device][operation] = self._merge([self._stats[(operation, device_address)]])  # A copy, which is not changed by later transactions
+
+        return {
+            "elapsed_ns": elapsed_ns,
+            "i2c_fraction": total["wall_ns"]/elapsed_ns if elapsed_ns > 0 else 0,  # Fraction of the time since the last reset spent inside I2C calls
+            "total": total,
+            "operations": per_operation,
+            "devices": per_device,
+        }
+
+    def to_json(self, indent: int = 2):
+        return json.dumps(self.summary(), indent=indent)
+
+    def export_json(self, filename: str):
+        with open(filename, 'w') as file:
+            file.write(self.to_json())
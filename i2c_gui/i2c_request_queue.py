@@ -0,0 +1,85 @@
+#############################################################################
+# zlib License
+#
+# (C) 2023 Cristóvão Beirão da Cruz e Silva <cbeiraod@cern.ch>
+#
+# This software is provided 'as-is', without any express or implied
+# warranty.  In no event will the authors be held liable for any damages
+# arising from the use of this software.
+#
+# Permission is granted to anyone to use this software for any purpose,
+# including commercial applications, and to alter it and redistribute it
+# freely, subject to the following restrictions:
+#
+# 1. The origin of this software must not be misrepresented; you must not
+#    claim that you wrote the original software. If you use this software
+#    in a product, an acknowledgment in the product documentation would be
+#    appreciated but is not required.
+# 2. Altered source versions must be plainly marked as such, and must not be
+#    misrepresented as being the original software.
+# 3. This notice may not be removed or altered from any source distribution.
+#############################################################################
+
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+
+class I2C_Request_Queue():
+    """
+    Serializes the access to an I2C bus from several threads. Each request takes a ticket and is granted the bus in the order of arrival,
+    the thread owning the bus may enter again (for instance a clock tuning which issues several transfers)
+    """
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._next_ticket = 0
+        self._serving_ticket = 0
+        self._owner = None
+        self._depth = 0
+        self._abandoned_tickets = set()  # Tickets whose thread stopped waiting (i.e. KeyboardInterrupt), skipped when their turn comes
+
+    @property
+    def pending_requests(self):
+        """Number of requests waiting for the bus or using it"""
+        with self._condition:
+            return self._next_ticket - self._serving_ticket - len(self._abandoned_tickets)
+
+    @property
+    def owned_by_current_thread(self):
+        return self._owner == threading.get_ident()
+
+    @contextmanager
+    def bus(self):
+        thread_id = threading.get_ident()
+        with self._condition:
+            if self._owner != thread_id:
+                ticket = self._next_ticket
+                self._next_ticket += 1
+                try:
+                    while self._serving_ticket != ticket:
+                        self._condition.wait()
+                except BaseException:
+                    if self._serving_ticket == ticket:
+                        self._serve_next_ticket()
+                    else:
+                        self._abandoned_tickets.add(ticket)
+                    raise
+                self._owner = thread_id
+            self._depth += 1
+
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._owner = None
+                    self._serve_next_ticket()
+
+    def _serve_next_ticket(self):
+        # Must be called with the condition held
+        self._serving_ticket += 1
+        while self._serving_ticket in self._abandoned_tickets:
+            self._abandoned_tickets.remove(self._serving_ticket)
+            self._serving_ticket += 1
+        self._condition.notify_all()
@@ -0,0 +1,277 @@
+#############################################################################
+# zlib License
+#
+# (C) 2023 Cristóvão Beirão da Cruz e Silva <cbeiraod@cern.ch>
+#
+# This software is provided 'as-is', without any express or implied
+# warranty.  In no event will the authors be held liable for any damages
+# arising from the use of this software.
+#
+# Permission is granted to anyone to use this software for any purpose,
+# including commercial applications, and to alter it and redistribute it
+# freely, subject to the following restrictions:
+#
+# 1. The origin of this software must not be misrepresented; you must not
+#    claim that you wrote the original software. If you use this software
+#    in a product, an acknowledgment in the product documentation would be
+#    appreciated but is not required.
+# 2. Altered source versions must be plainly marked as such, and must not be
+#    misrepresented as being the original software.
+# 3. This notice may not be removed or altered from any source distribution.
+#############################################################################
+
+from __future__ import annotations
+
+from .i2c_connection_helper import I2C_Connection_Helper
+from .base_gui import Base_GUI
+
+import tkinter as tk
+import tkinter.ttk as ttk  # For themed widgets (gives a more native visual to the elements)
+import logging
+import time
+import struct
+
+# The log is a header followed by one record per transaction: the fixed size fields below and then the data bytes
+_session_log_magic = b"I2CLOG\x00\x01"
+_record_struct = struct.Struct("<QIBBBII")  # Timestamp (ns), duration (ns), operation, device address, register bits, memory address, data length
+
+_operation_codes = {
+    "check": 0,
+    "read": 1,
+    "write": 2,
+}
+_operation_names = {code: name for name, code in _operation_codes.items()}
+_error_flag = 0x80
+
+def read_i2c_session(filename: str):
+    """Load all the transactions of an I2C session log, as a list of dictionaries"""
+    with open(filename, 'rb') as file:
+        content = file.read()
+
+    if content[:len(_session_log_magic)] != _session_log_magic:
+        raise RuntimeError("The file {} is not an I2C session log".format(filename))
+
+    records = []
+    offset = len(_session_log_magic)
+    while offset < len(content):
+        timestamp_ns, duration_ns, operation, device_address, register_bits, memory_address, length = _record_struct.unpack_from(content, offset)
+        offset += _record_struct.size
+        records += [{
+            "timestamp_ns": timestamp_ns,
+            "duration_ns": duration_ns,
+            "operation": _operation_names[operation & ~_error_flag],
+            "failed": bool(operation & _error_flag),
+            "device_address": device_address,
+            "register_bits": register_bits,
+            "memory_address": memory_address,
+            "data": list(content[offset:offset + length]),
+        }]
+        offset += length
+    return records
+
+class I2C_Session_Recorder():
+    """Wraps an I2C connection helper, writing each transaction it carries out to a session log. Everything else is forwarded to the wrapped helper"""
+    def __init__(self, helper: I2C_Connection_Helper, filename: str):
+        self._helper = helper
+        self._filename = filename
+        self._file = open(filename, 'wb')
+        self._file.write(_session_log_magic)
+        self._start_time = time.perf_counter_ns()
+
+    def __getattr__(self, name):
+        return getattr(self._helper, name)
+
+    def __setattr__(self, name, value):
+        # Connection parameters (i.e. conn.handle.clk) must reach the wrapped helper, only the recorder state is kept here
+        if name.startswith("_"):
+            super().__setattr__(name, value)
+        else:
+            setattr(self._helper, name, value)
+
+    @property
+    def helper(self):
+        return self._helper
+
+    @property
+    def filename(self):
+        return self._filename
+
+    def close(self):
+        self._file.close()
+
+    def _record(self, operation: str, failed: bool, device_address: int, register_bits: int, memory_address: int, data: list[int], start_time: int):
+        end_time = time.perf_counter_ns()
+        operation_code = _operation_codes[operation]
+        if failed:
+            operation_code |= _error_flag
+
+        self._file.write(_record_struct.pack(
+            start_time - self._start_time,
+            min(end_time - start_time, 0xFFFFFFFF),
+            operation_code,
+            device_address,
+            register_bits,
+            memory_address,
+            len(data),
+        ))
+        self._file.write(bytes(data))
+
+    def check_i2c_device(self, address: int):
+        start_time = time.perf_counter_ns()
+        found = self._helper.check_i2c_device(address)
+        self._record("check", not found, address, 0, 0, [], start_time)
+        return found
+
+    def read_device_memory(self, device_address: int, memory_address: int, byte_count: int = 1, register_bits: int = 16):
+        start_time = time.perf_counter_ns()
+        try:
+            data = self._helper.read_device_memory(device_address, memory_address, byte_count, register_bits)
+        except Exception:
+            self._record("read", True, device_address, register_bits, memory_address, [0]*byte_count, start_time)
+            raise
+        self._record("read", False, device_address, register_bits, memory_address, data, start_time)
+        return data
+
+    def write_device_memory(self, device_address: int, memory_address: int, data: list[int], register_bits: int = 16):
+        start_time = time.perf_counter_ns()
+        try:
+            self._helper.write_device_memory(device_address, memory_address, data, register_bits)
+        except Exception:
+            self._record("write", True, device_address, register_bits, memory_address, data, start_time)
+            raise
+        self._record("write", False, device_address, register_bits, memory_address, data, start_time)
+
+class I2C_Replay_Helper(I2C_Connection_Helper):
+    """
+    Serves the responses of a recorded I2C session offline. The transactions are matched in order, skipping recorded ones which are not requested
+    Each transaction takes its recorded duration divided by the speed, a speed of 0 replays as fast as possible
+    """
+    def __init__(self, parent: Base_GUI, filename: str = "", speed: float = 1.0):
+        # Whole transactions were recorded, so they are replayed without chunking and with the memory addresses as requested
+        super().__init__(parent, None, False)
+
+        self._records = []
+        self._cursor = 0
+        self._max_retries = 0  # A recorded failure must be replayed as a failure
+        self._replay_speed = speed
+
+        self._file_var = tk.StringVar(value=filename)
+        self._speed_var = tk.DoubleVar(value=speed)
+
+    @property
+    def file(self):
+        return self._file_var.get()
+
+    @file.setter
+    def file(self, value: str):
+        self._file_var.set(value)
+
+    @property
+    def speed(self):
+        return self._speed_var.get()
+
+    @speed.setter
+    def speed(self, value: float):
+        self._speed_var.set(value)
+
+    @property
+    def adapter_id(self):
+        return "Replay:{}".format(self.file)
+
+    @property
+    def remaining_transactions(self):
+        return len(self._records) - self._cursor
+
+    def set_retry_policy(self, max_retries: int, retry_delay_us: int, max_retry_delay_us: int):
+        pass
+
+    def remember_connection_params(self):
+        super().remember_connection_params()
+        self._replay_speed = self.speed
+
+    def _next_record(self, operation: str, device_address: int, memory_address: int = 0, register_bits: int = 0, data: list[int] = None, byte_count: int = 0):
+        for idx in range(self._cursor, len(self._records)):
+            record = self._records[idx]
+            if record["operation"] != operation or record["device_address"] != device_address:
+                continue
+            if operation != "check":
+                if record["memory_address"] != memory_address or record["register_bits"] != register_bits:
+                    continue
+                if operation == "read" and len(record["data"]) != byte_count:
+                    continue
+                if operation == "write" and record["data"] != list(data):
+                    continue
+
+            if idx != self._cursor:
+                self._logger.warning("The replayed I2C session skipped {} recorded transactions".format(idx - self._cursor))
+            self._cursor = idx + 1
+
+            if self._replay_speed > 0:
+                time.sleep(record["duration_ns"]/1E9/self._replay_speed)
+            if record["failed"] and operation != "check":
+                raise RuntimeError("Replayed failure of the I2C {} of device 0x{:02x} at memory address 0x{:x}".format(operation, device_address, memory_address))
+            return record
+
+        raise RuntimeError("The I2C {} of device 0x{:02x} at memory address 0x{:x} is not in the rest of the recorded session".format(operation, device_address, memory_address))
+
+    def _check_i2c_device(self, address: int):
+        return not self._next_record("check", address)["failed"]
+
+    def _write_i2c_device_memory(self, address: int, memory_address: int, data: list[int], register_bits: int = 16):
+        self._next_record("write", address, memory_address, register_bits, data=data)
+
+    def _read_i2c_device_memory(self, address: int, memory_address: int, byte_count: int, register_bits: int = 16) -> list[int]:
+        return list(self._next_record("read", address, memory_address, register_bits, byte_count=byte_count)["data"])
+
+    def display_in_frame(self, frame: ttk.Frame):
+        if hasattr(self, '_frame') and self._frame is not None:
+            tmp = self._frame.children.copy()
+            for widget in tmp:
+                tmp[widget].destroy()
+
+        self._frame = frame
+        self._file_label = ttk.Label(self._frame, text="Session Log:")
+        self._file_label.grid(column=0, row=0, sticky=(tk.W, tk.E))
+
+        self._file_entry = ttk.Entry(self._frame, textvariable=self._file_var, width=20)
+        self._file_entry.grid(column=1, row=0, sticky=(tk.W, tk.E), padx=(0,30))
+
+        self._frame.columnconfigure(2, weight=1)
+
+        self._speed_label = ttk.Label(self._frame, text="Speed:")
+        self._speed_label.grid(column=3, row=0, sticky=(tk.W, tk.E))
+
+        self._speed_entry = ttk.Entry(self._frame, textvariable=self._speed_var, width=5)
+        self._speed_entry.grid(column=4, row=0, sticky=(tk.W, tk.E), padx=(0,30))
+
+        self._frame.columnconfigure(5, weight=1)
+
+    def validate_connection_params(self):
+        if self.file == "":
+            self.send_message("Please enter a valid session log file", "Error")
+            return False
+
+        return True
+
+    def connect(self, no_connect: bool = False):
+        self._no_connect = no_connect
+        try:
+            self._records = read_i2c_session(self.file)
+        except Exception as error:
+            self.send_message("Unable to load the I2C session log {}: {}".format(self.file, error))
+            return False
+        self._cursor = 0
+
+        if hasattr(self, "_file_entry"):
+            self._file_entry.config(state="disabled")
+        if hasattr(self, "_speed_entry"):
+            self._speed_entry.config(state="disabled")
+        self.send_message("Replaying the {} transactions of the I2C session log {}".format(len(self._records), self.file))
+        return True
+
+    def disconnect(self):
+        if hasattr(self, "_file_entry"):
+            self._file_entry.config(state="normal")
+        if hasattr(self, "_speed_entry"):
+            self._speed_entry.config(state="normal")
+        self.send_message("Stopped replaying the I2C session log {} with {} transactions left".format(self.file, self.remaining_transactions))
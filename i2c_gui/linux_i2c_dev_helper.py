@@ -0,0 +1,210 @@
+#############################################################################
+# zlib License
+#
+# (C) 2023 Cristóvão Beirão da Cruz e Silva <cbeiraod@cern.ch>
+#
+# This software is provided 'as-is', without any express or implied
+# warranty.  In no event will the authors be held liable for any damages
+# arising from the use of this software.
+#
+# Permission is granted to anyone to use this software for any purpose,
+# including commercial applications, and to alter it and redistribute it
+# freely, subject to the following restrictions:
+#
+# 1. The origin of this software must not be misrepresented; you must not
+#    claim that you wrote the original software. If you use this software
+#    in a product, an acknowledgment in the product documentation would be
+#    appreciated but is not required.
+# 2. Altered source versions must be plainly marked as such, and must not be
+#    misrepresented as being the original software.
+# 3. This notice may not be removed or altered from any source distribution.
+#############################################################################
+
+from __future__ import annotations
+
+from .i2c_connection_helper import I2C_Connection_Helper
+from .base_gui import Base_GUI
+
+import tkinter as tk
+import tkinter.ttk as ttk  # For themed widgets (gives a more native visual to the elements)
+import logging
+import os
+import ctypes
+
+# Constants from the linux/i2c.h and linux/i2c-dev.h kernel headers
+I2C_FUNCS = 0x0705
+I2C_RDWR = 0x0707
+I2C_FUNC_I2C = 0x00000001
+I2C_M_RD = 0x0001
+I2C_RDWR_IOCTL_MAX_MSGS = 42
+
+class _I2C_Msg(ctypes.Structure):
+    _fields_ = [
+        ("addr", ctypes.c_uint16),
+        ("flags", ctypes.c_uint16),
+        ("len", ctypes.c_uint16),
+        ("buf", ctypes.POINTER(ctypes.c_uint8)),
+    ]
+
+class _I2C_RDWR_Ioctl_Data(ctypes.Structure):
+    _fields_ = [
+        ("msgs", ctypes.POINTER(_I2C_Msg)),
+        ("nmsgs", ctypes.c_uint32),
+    ]
+
+class I2C_Dev_File():
+    """
+    Thin layer over an i2c-dev character device. It can be replaced by any object with the same methods (for instance to test without the hardware)
+    Each message is an (address, flags, buffer) tuple, the buffers of the read messages are filled in place
+    """
+    def __init__(self, path: str):
+        self._fd = os.open(path, os.O_RDWR)
+
+    def close(self):
+        os.close(self._fd)
+
+    def functionality(self) -> int:
+        import fcntl
+        funcs = ctypes.c_ulong(0)
+        fcntl.ioctl(self._fd, I2C_FUNCS, funcs)
+        return funcs.value
+
+    def transfer(self, messages: list[tuple[int, int, bytearray]]):
+        import fcntl
+        msgs = (_I2C_Msg * len(messages))()
+        buffers = []  # Keep a reference to the ctypes views until the ioctl returns
+        for idx, (address, flags, data) in enumerate(messages):
+            buffer = (ctypes.c_uint8 * len(data)).from_buffer(data)
+            buffers += [buffer]
+            msgs[idx].addr = address
+            msgs[idx].flags = flags
+            msgs[idx].len = len(data)
+            msgs[idx].buf = ctypes.cast(buffer, ctypes.POINTER(ctypes.c_uint8))
+
+        fcntl.ioctl(self._fd, I2C_RDWR, _I2C_RDWR_Ioctl_Data(msgs, len(messages)))
+
+class Linux_I2C_Dev_Helper(I2C_Connection_Helper):
+    """Helper for a native I2C bus through the Linux i2c-dev interface, the chunks are sent as batches of messages in a single I2C_RDWR ioctl"""
+    def __init__(self, parent: Base_GUI, max_seq_byte: int = 32, swap_endian: bool = True, device_file_factory = I2C_Dev_File, max_messages: int = I2C_RDWR_IOCTL_MAX_MSGS):
+        super().__init__(parent, max_seq_byte, swap_endian)
+
+        self._device_file_factory = device_file_factory
+        self._device_file = None
+        self._max_messages = max_messages
+        self._pipeline_depth = max(max_messages//2, 1)  # Each read chunk takes two messages, the register address write and the data read
+
+        self._device_var = tk.StringVar(value='/dev/i2c-1')
+
+    @property
+    def device(self):
+        return self._device_var.get()
+
+    @device.setter
+    def device(self, value: str):
+        self._device_var.set(value)
+
+    @property
+    def adapter_id(self):
+        return "i2c-dev:{}".format(self.device)
+
+    def _get_max_chunk_size(self, operation: str, register_bits: int):
+        # The length of each message is a 16 bit field and the kernel refuses messages above 8 kB
+        return 8192 - register_bits//8
+
+    def _memory_address_bytes(self, memory_address: int, register_bits: int):
+        if register_bits == 16:
+            return [memory_address >> 8, memory_address & 0xff]
+        if register_bits == 8:
+            return [memory_address & 0xff]
+        raise RuntimeError("Unknown bit size trying to be sent: {}".format(register_bits))
+
+    def _transfer(self, messages: list[tuple[int, int, bytearray]], group_size: int = 1):
+        # Split in as few ioctl calls as possible, without separating the messages of a group
+        step = self._max_messages - self._max_messages%group_size
+        for idx in range(0, len(messages), step):
+            self._device_file.transfer(messages[idx:idx + step])
+
+    def _check_i2c_device(self, address: int):
+        # A zero length write only checks for the acknowledge of the device address
+        try:
+            self._transfer([(address, 0, bytearray())])
+        except OSError:
+            return False
+        return True
+
+    def _write_i2c_device_memory(self, address: int, memory_address: int, data: list[int], register_bits: int = 16):
+        self._write_i2c_device_memory_chunks(address, [(memory_address, data)], register_bits)
+
+    def _read_i2c_device_memory(self, address: int, memory_address: int, byte_count: int, register_bits: int = 16) -> list[int]:
+        return self._read_i2c_device_memory_chunks(address, [(memory_address, byte_count)], register_bits)[0]
+
+    def _write_i2c_device_memory_chunks(self, address: int, chunks: list[tuple[int, list[int]]], register_bits: int = 16):
+        messages = []
+        for memory_address, data in chunks:
+            messages += [(address, 0, bytearray(self._memory_address_bytes(memory_address, register_bits) + list(data)))]
+        self._transfer(messages)
+
+    def _read_i2c_device_memory_chunks(self, address: int, chunks: list[tuple[int, int]], register_bits: int = 16) -> list[list[int]]:
+        # The register address write and the data read are combined with a repeated start, so they must stay in the same ioctl
+        messages = []
+        buffers = []
+        for memory_address, byte_count in chunks:
+            buffer = bytearray(byte_count)
+            buffers += [buffer]
+            messages += [
+                (address, 0, bytearray(self._memory_address_bytes(memory_address, register_bits))),
+                (address, I2C_M_RD, buffer),
+            ]
+
+        self._transfer(messages, group_size=2)
+        return [list(buffer) for buffer in buffers]
+
+    def display_in_frame(self, frame: ttk.Frame):
+        if hasattr(self, '_frame') and self._frame is not None:
+            tmp = self._frame.children.copy()
+            for widget in tmp:
+                tmp[widget].destroy()
+
+        self._frame = frame
+        self._device_label = ttk.Label(self._frame, text="Device:")
+        self._device_label.grid(column=0, row=0, sticky=(tk.W, tk.E))
+
+        self._device_entry = ttk.Entry(self._frame, textvariable=self._device_var, width=12)
+        self._device_entry.grid(column=1, row=0, sticky=(tk.W, tk.E), padx=(0,30))
+
+        self._frame.columnconfigure(2, weight=1)
+
+    def validate_connection_params(self):
+        if self.device == "":
+            self.send_message("Please enter a valid I2C device", "Error")
+            return False
+
+        return True
+
+    def connect(self, no_connect: bool = False):
+        self._no_connect = no_connect
+        if not no_connect:  # For emulated connection
+            try:
+                self._device_file = self._device_file_factory(self.device)
+                if not self._device_file.functionality() & I2C_FUNC_I2C:
+                    raise RuntimeError("The I2C adapter does not support plain I2C messages")
+            except Exception as error:
+                if self._device_file is not None:
+                    self._device_file.close()
+                    self._device_file = None
+                self.send_message("Unable to connect to the I2C bus through {}: {}".format(self.device, error))
+                return False
+
+        if hasattr(self, "_device_entry"):
+            self._device_entry.config(state="disabled")
+        self.send_message("Connected to the I2C bus through {}".format(self.device))
+        return True
+
+    def disconnect(self):
+        if self._device_file is not None:
+            self._device_file.close()
+            self._device_file = None
+
+        if hasattr(self, "_device_entry"):
+            self._device_entry.config(state="normal")
+        self.send_message("Disconnected from the I2C bus through {}".format(self.device))
@@ -28,7 +28,63 @@ from .base_gui import Base_GUI
 import tkinter as tk
 import tkinter.ttk as ttk  # For themed widgets (gives a more native visual to the elements)
 import logging
-import io
+import logging.handlers
+from collections import deque
+
+def append_lines_to_text(text: tk.Text, lines: list[str], max_lines: int):
+    # All the lines are inserted with a single call and the oldest lines are dropped, so the widget never grows without bound
+    if len(lines) == 0:
+        return
+    text.configure(state='normal')
+    text.insert('end', "\n".join(lines) + "\n")
+    excess_lines = int(text.index('end-1c').split('.')[0]) - 1 - max_lines
+    if excess_lines > 0:
+        text.delete("1.0", "{}.0".format(excess_lines + 1))
+    text.configure(state='disabled')
+
+class Ring_Buffer_Handler(logging.Handler):
+    def __init__(self, capacity: int = 10000, spill_handler: logging.Handler = None):
+        super().__init__()
+
+        self._records = deque(maxlen=capacity)
+        self._record_count = 0
+        self.spill_handler = spill_handler
+
+    @property
+    def capacity(self):
+        return self._records.maxlen
+
+    @property
+    def record_count(self):
+        # Total number of records ever emitted, used to find which records are new since the last time they were fetched
+        return self._record_count
+
+    def emit(self, record: logging.LogRecord):
+        if len(self._records) == self._records.maxlen and self.spill_handler is not None:
+            self.spill_handler.handle(self._records[0])
+        self._records.append(record)
+        self._record_count += 1
+
+    def get_records(self, since: int = 0):
+        new_records = self._record_count - since
+        if new_records >= len(self._records):
+            return list(self._records)
+        if new_records <= 0:
+            return []
+        return list(self._records)[-new_records:]
+
+    def get_lines(self, since: int = 0):
+        return [self.format(record) for record in self.get_records(since)]
+
+    def clear(self):
+        self._records.clear()
+
+    def close(self):
+        if self.spill_handler is not None:
+            for record in self._records:
+                self.spill_handler.handle(record)
+            self.spill_handler.close()
+        super().close()
 
 class Logging_Helper(GUI_Helper):
     _parent: Base_GUI
@@ -42,16 +98,19 @@ class Logging_Helper(GUI_Helper):
         "Critical": logging.CRITICAL,
     }
     _default_log_level = "Info"
+    _log_format = '%(asctime)s - %(levelname)s:%(name)s:%(message)s'
 
-    def __init__(self, parent: Base_GUI):
+    def __init__(self, parent: Base_GUI, max_records: int = 10000, max_displayed_lines: int = 2000):
         super().__init__(parent, None, parent._logger)
 
         self._do_logging = False
         self._logger.disabled = True
 
-        self._stream = io.StringIO()
-        self._stream_handler = logging.StreamHandler(self._stream)
-        self._stream_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s:%(name)s:%(message)s'))
+        self._max_displayed_lines = max_displayed_lines
+        self._displayed_record_count = 0
+
+        self._stream_handler = Ring_Buffer_Handler(max_records)
+        self._stream_handler.setFormatter(logging.Formatter(self._log_format))
         self._logger.handlers.clear()
 
         self._logging_window_status_var = tk.StringVar()
@@ -113,8 +172,22 @@ class Logging_Helper(GUI_Helper):
             self._logger.disabled = True
             self._logging_window_status_var.set("Logging Disabled")
 
+    def spill_to_file(self, filename: str, max_bytes: int = 10*1024*1024, backup_count: int = 5):
+        # Records which would be dropped from the ring buffer are written to a rotating set of files instead
+        spill_handler = logging.handlers.RotatingFileHandler(filename, maxBytes=max_bytes, backupCount=backup_count)
+        spill_handler.setFormatter(logging.Formatter(self._log_format))
+        if self._stream_handler.spill_handler is not None:
+            self._stream_handler.spill_handler.close()
+        self._stream_handler.spill_handler = spill_handler
+
+    def get_records(self):
+        return self._stream_handler.get_records()
+
     def get_log(self):
-        return self._stream.getvalue()
+        lines = self._stream_handler.get_lines()
+        if len(lines) == 0:
+            return ""
+        return "\n".join(lines) + "\n"
 
     def display_logging(self):
         if hasattr(self, "_logging_window"):
@@ -139,6 +212,7 @@ class Logging_Helper(GUI_Helper):
         self._text_frame.rowconfigure(100, weight=1)
 
         self._text_display = tk.Text(self._text_frame, state='disabled', width=150, wrap='none')
+        self._displayed_record_count = 0
         self._text_display.grid(column=100, row=100, sticky=(tk.N, tk.W, tk.E, tk.S))
 
         self._scrollbar = ttk.Scrollbar(self._text_frame, command=self._text_display.yview)
@@ -184,9 +258,11 @@ class Logging_Helper(GUI_Helper):
         del self._logging_window
 
     def clear_log(self):
-        self._stream.truncate(0)
-        self._stream.seek(0)
-        self.refresh_logging()
+        self._stream_handler.clear()
+        self._text_display.configure(state='normal')
+        self._text_display.delete("1.0", tk.END)
+        self._text_display.configure(state='disabled')
+        self._displayed_record_count = self._stream_handler.record_count
 
     def toggle_logging(self):
         self.is_logging = not self.is_logging
@@ -224,17 +300,12 @@ class Logging_Helper(GUI_Helper):
             self._text_display.after(500, self.autorefresh_logging)
 
     def refresh_logging(self):
-        pos = self._scrollbar.get()
         vw = self._text_display.yview()
 
-        #print(pos)
-        #print(vw)
-        # TODO: Scrollbar is still jumping around when updating. It is related to when the lines of text wrap to the next line
-        # Disabling line wrapping seems to have "fixed" (hidden) the issue
+        # Only the records emitted since the last refresh are appended, and only the tail of the log is kept in the widget
+        since = max(self._displayed_record_count, self._stream_handler.record_count - self._max_displayed_lines)
+        lines = self._stream_handler.get_lines(since)
+        self._displayed_record_count = self._stream_handler.record_count
 
-        self._text_display.configure(state='normal')
-        self._text_display.delete("1.0", tk.END)
-        self._text_display.insert('end', self.get_log())
-        self._text_display.configure(state='disabled')
-        #self._text_display.yview_moveto(pos[0])
-        self._text_display.yview_moveto(vw[0])
\ No newline at end of file
+        append_lines_to_text(self._text_display, lines, self._max_displayed_lines)
+        self._text_display.yview_moveto(vw[0])
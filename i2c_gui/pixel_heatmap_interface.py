@@ -0,0 +1,264 @@
+#############################################################################
+# zlib License
+#
+# (C) 2023 Cristóvão Beirão da Cruz e Silva <cbeiraod@cern.ch>
+#
+# This software is provided 'as-is', without any express or implied
+# warranty.  In no event will the authors be held liable for any damages
+# arising from the use of this software.
+#
+# Permission is granted to anyone to use this software for any purpose,
+# including commercial applications, and to alter it and redistribute it
+# freely, subject to the following restrictions:
+#
+# 1. The origin of this software must not be misrepresented; you must not
+#    claim that you wrote the original software. If you use this software
+#    in a product, an acknowledgment in the product documentation would be
+#    appreciated but is not required.
+# 2. Altered source versions must be plainly marked as such, and must not be
+#    misrepresented as being the original software.
+# 3. This notice may not be removed or altered from any source distribution.
+#############################################################################
+
+from __future__ import annotations
+
+from .gui_helper import GUI_Helper
+
+import tkinter as tk
+import tkinter.ttk as ttk  # For themed widgets (gives a more native visual to the elements)
+import logging
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from chips.base_chip import Base_Chip
+
+from .base_interface import Base_Interface
+
+class Pixel_Heatmap_Interface(Base_Interface):
+    _parent: Base_Chip
+    _colour_stops = [(0x20, 0x30, 0xa0), (0x20, 0xb0, 0x60), (0xf0, 0xe0, 0x30), (0xc0, 0x00, 0x00)]
+    _invalid_colour = '#808080'
+    _selection_colour = '#000000'
+
+    def __init__(self, parent: Base_Chip, title: str, address_space: str, values: dict[str, str], control_variables, columns: int = 16, rows: int = 16, cell_size: int = 24):
+        super().__init__(parent, False, False)
+
+        self._title = title
+        self._address_space = address_space
+        self._values = values  # Maps each decoded value to the block array it belongs to
+        self._control_variables = control_variables
+        self._columns = columns
+        self._rows = rows
+        self._cell_size = cell_size
+
+        self._value_var = tk.StringVar(value=list(values.keys())[0])
+        self._range_var = tk.StringVar(value="")
+        self._hover_var = tk.StringVar(value="")
+
+        self._pixel_vars = {}
+        self._pixel_traces = []
+        self._pixel_values = {}
+        self._pixel_colours = {}
+        self._value_range = None
+
+    def update_whether_modified(self):
+        self._parent.update_whether_modified()
+
+    def enable(self):
+        super().enable()
+        if hasattr(self, "_read_button"):
+            self._read_button.config(state="normal")
+
+    def disable(self):
+        super().disable()
+        if hasattr(self, "_read_button"):
+            self._read_button.config(state="disabled")
+
+    def refresh(self, address_space_name: str):
+        # Called once when a batch of bulk updates is released, all the values are then reloaded together
+        if address_space_name == self._address_space:
+            self._load_values()
+            self._redraw()
+
+    def prepare_display(self, element: tk.Tk, col: int, row: int):
+        self._frame = ttk.LabelFrame(element, text=self._title)
+        self._frame.grid(column=col, row=row, sticky=(tk.N, tk.W, tk.E, tk.S))#, padx=5, pady=5)
+        self._frame.columnconfigure(100, weight=1)
+
+        state = 'disabled'
+        if self._enabled:
+            state = 'normal'
+
+        self._control_frame = ttk.Frame(self._frame)
+        self._control_frame.grid(column=100, row=100, sticky=(tk.N, tk.W, tk.E))
+        self._control_frame.columnconfigure(300, weight=1)
+
+        self._value_label = ttk.Label(self._control_frame, text="Value:")
+        self._value_label.grid(column=100, row=100, sticky=(tk.W), padx=(0, 5))
+
+        self._value_selector = ttk.Combobox(self._control_frame, textvariable=self._value_var, values=list(self._values.keys()), state='readonly', width=10)
+        self._value_selector.grid(column=200, row=100, sticky=(tk.W))
+        self._value_selector.bind('<<ComboboxSelected>>', self._select_value)
+
+        self._range_label = ttk.Label(self._control_frame, textvariable=self._range_var)
+        self._range_label.grid(column=300, row=100, sticky=(tk.W), padx=(10, 0))
+
+        self._read_button = ttk.Button(self._control_frame, text="Read Array", command=self._read_array, state=state)
+        self._read_button.grid(column=400, row=100, sticky=(tk.E))
+
+        margin = self._cell_size
+        self._canvas = tk.Canvas(
+            self._frame,
+            width=margin + self._columns*self._cell_size + 2,
+            height=margin + self._rows*self._cell_size + 2,
+            borderwidth=0,
+            highlightthickness=0,
+        )
+        self._canvas.grid(column=100, row=200, pady=(5, 5))
+
+        for column in range(self._columns):
+            self._canvas.create_text(margin + (column + 0.5)*self._cell_size, margin/2, text=str(column))
+        for row in range(self._rows):
+            self._canvas.create_text(margin/2, margin + (row + 0.5)*self._cell_size, text=str(row))
+
+        # All the pixels are drawn once and then only recoloured in place
+        self._rectangles = {}
+        for column in range(self._columns):
+            for row in range(self._rows):
+                x = margin + column*self._cell_size
+                y = margin + row*self._cell_size
+                rectangle = self._canvas.create_rectangle(x, y, x + self._cell_size, y + self._cell_size, fill=self._invalid_colour, outline='#ffffff')
+                self._canvas.tag_bind(rectangle, '<Button-1>', lambda event, column=column, row=row: self._select_pixel(column, row))
+                self._canvas.tag_bind(rectangle, '<Enter>', lambda event, column=column, row=row: self._hover_pixel(column, row))
+                self._rectangles[(column, row)] = rectangle
+                self._pixel_colours[(column, row)] = self._invalid_colour
+        self._selection = self._canvas.create_rectangle(0, 0, 0, 0, outline=self._selection_colour, width=3)
+        self._canvas.bind('<Leave>', lambda event: self._hover_var.set(""))
+
+        self._hover_label = ttk.Label(self._frame, textvariable=self._hover_var)
+        self._hover_label.grid(column=100, row=300, sticky=(tk.W))
+
+        for variable in ["column", "row"]:
+            self._control_variables[variable]["variable"].trace_add('write', lambda var, index, mode: self._update_selection())
+
+        self._select_value()
+        self._update_selection()
+
+    def _block_ref(self, block: str, column: int, row: int):
+        return "{}:{}:{}".format(block, column, row)
+
+    def _select_value(self, event=None):
+        for var, trace in self._pixel_traces:
+            var.trace_remove('write', trace)
+        self._pixel_traces = []
+
+        value = self._value_var.get()
+        block = self._values[value]
+
+        self._pixel_vars = {}
+        for column in range(self._columns):
+            for row in range(self._rows):
+                var: tk.StringVar = self._parent.get_decoded_display_var(self._address_space, self._block_ref(block, column, row), value)
+                trace = var.trace_add('write', lambda var, index, mode, pixel=(column, row): self._pixel_updated(pixel))
+                self._pixel_vars[(column, row)] = var
+                self._pixel_traces += [(var, trace)]
+
+        self._load_values()
+        self._redraw()
+
+    def _get_var_value(self, pixel: tuple[int, int]):
+        # The values come from the decoded display variables, so the heatmap always agrees with the register widgets
+        try:
+            return int(self._pixel_vars[pixel].get(), 0)
+        except ValueError:
+            return None
+
+    def _load_values(self):
+        for pixel in self._pixel_vars:
+            self._pixel_values[pixel] = self._get_var_value(pixel)
+
+    def _pixel_updated(self, pixel: tuple[int, int]):
+        if self.notifications_suspended:  # The full heatmap is reloaded once, when the batch of notifications is released
+            return
+
+        # A single value changed (i.e. edited by the user), only its cell is recoloured unless the colour scale changes
+        self._pixel_values[pixel] = self._get_var_value(pixel)
+
+        if self._get_value_range() != self._value_range:
+            self._redraw()
+        else:
+            self._recolour(pixel)
+
+    def _get_pixel_value(self, column: int, row: int):
+        return self._pixel_values.get((column, row))
+
+    def _get_value_range(self):
+        valid_values = [val for val in self._pixel_values.values() if val is not None]
+        if len(valid_values) == 0:
+            return None
+        return (min(valid_values), max(valid_values))
+
+    def _colour(self, fraction: float):
+        segments = len(self._colour_stops) - 1
+        position = min(max(fraction, 0), 1)*segments
+        idx = min(int(position), segments - 1)
+        position -= idx
+
+        low = self._colour_stops[idx]
+        high = self._colour_stops[idx + 1]
+        return '#{:02x}{:02x}{:02x}'.format(*[int(low[i] + (high[i] - low[i])*position) for i in range(3)])
+
+    def _redraw(self):
+        if not hasattr(self, "_canvas"):
+            return
+
+        self._value_range = self._get_value_range()
+        if self._value_range is None:
+            self._range_var.set("")
+        else:
+            self._range_var.set("Range: {} to {}".format(*self._value_range))
+
+        for pixel in self._pixel_values:
+            self._recolour(pixel)
+
+    def _recolour(self, pixel: tuple[int, int]):
+        if not hasattr(self, "_canvas"):
+            return
+
+        value = self._pixel_values[pixel]
+        if value is None or self._value_range is None:
+            colour = self._invalid_colour
+        elif self._value_range[0] == self._value_range[1]:
+            colour = self._colour(0)
+        else:
+            colour = self._colour((value - self._value_range[0])/(self._value_range[1] - self._value_range[0]))
+
+        if self._pixel_colours[pixel] != colour:  # Avoid reconfiguring the pixels that did not change
+            self._canvas.itemconfigure(self._rectangles[pixel], fill=colour)
+            self._pixel_colours[pixel] = colour
+
+    def _select_pixel(self, column: int, row: int):
+        self._control_variables["column"]["variable"].set(str(column))
+        self._control_variables["row"]["variable"].set(str(row))
+
+    def _hover_pixel(self, column: int, row: int):
+        value = self._get_pixel_value(column, row)
+        if value is None:
+            value = "Unknown"
+        self._hover_var.set("Pixel (column {}, row {}): {} = {}".format(column, row, self._value_var.get(), value))
+
+    def _update_selection(self):
+        try:
+            column = int(self._control_variables["column"]["variable"].get())
+            row = int(self._control_variables["row"]["variable"].get())
+        except ValueError:
+            return
+
+        if (column, row) not in self._rectangles:
+            return
+
+        self._canvas.coords(self._selection, *self._canvas.coords(self._rectangles[(column, row)]))
+        self._canvas.tag_raise(self._selection)
+
+    def _read_array(self):
+        self._parent.read_all_block(self._address_space, self._values[self._value_var.get()], full_array=True)
@@ -0,0 +1,116 @@
+#############################################################################
+# zlib License
+#
+# (C) 2023 Cristóvão Beirão da Cruz e Silva <cbeiraod@cern.ch>
+#
+# This software is provided 'as-is', without any express or implied
+# warranty.  In no event will the authors be held liable for any damages
+# arising from the use of this software.
+#
+# Permission is granted to anyone to use this software for any purpose,
+# including commercial applications, and to alter it and redistribute it
+# freely, subject to the following restrictions:
+#
+# 1. The origin of this software must not be misrepresented; you must not
+#    claim that you wrote the original software. If you use this software
+#    in a product, an acknowledgment in the product documentation would be
+#    appreciated but is not required.
+# 2. Altered source versions must be plainly marked as such, and must not be
+#    misrepresented as being the original software.
+# 3. This notice may not be removed or altered from any source distribution.
+#############################################################################
+
+from __future__ import annotations
+
+import time
+import json
+import os
+import threading
+import functools
+from collections import deque
+from contextlib import contextmanager
+
+class Trace_Profiler():
+    """
+    Collects nested timing spans and saves them in the Chrome trace event format (loadable in Perfetto or chrome://tracing).
+    Only the most recent max_events spans are kept, so the profiler can be left on during long runs
+    """
+    def __init__(self, max_events: int = 200000):
+        self._enabled = False
+        self._events = deque(maxlen=max_events)
+        self._event_count = 0
+        self._start_time = time.perf_counter_ns()
+
+    @property
+    def enabled(self):
+        return self._enabled
+
+    @property
+    def dropped_events(self):
+        # Number of the oldest spans which were discarded to keep within max_events
+        return self._event_count - len(self._events)
+
+    def start(self):
+        self._events.clear()
+        self._event_count = 0
+        self._start_time = time.perf_counter_ns()
+        self._enabled = True
+
+    def stop(self):
+        self._enabled = False
+
+    def add_span(self, name: str, category: str, start_ns: int, duration_ns: int):
+        # Spans are stored as plain tuples, they are only converted to trace events when saved
+        self._events.append((name, category, start_ns, duration_ns, threading.get_ident()))
+        self._event_count += 1
+
+    @contextmanager
+    def span(self, name: str, category: str = "i2c_gui"):
+        if not self._enabled:
+            yield
+            return
+
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.add_span(name, category, start, time.perf_counter_ns() - start)
+
+    def get_trace_events(self):
+        pid = os.getpid()
+        events = []
+        for name, category, start_ns, duration_ns, thread_id in self._events:
+            events += [{
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (start_ns - self._start_time)/1000,
+                "dur": duration_ns/1000,
+                "pid": pid,
+                "tid": thread_id,
+            }]
+        return events
+
+    def save(self, filename: str):
+        with open(filename, 'w') as file:
+            json.dump({"traceEvents": self.get_trace_events(), "displayTimeUnit": "ms", "otherData": {"dropped_events": self.dropped_events}}, file)
+
+profiler = Trace_Profiler()
+
+def traced(category: str):
+    """Decorator which records a span for each call of the decorated function while the profiler is enabled"""
+    def decorator(function):
+        name = function.__qualname__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not profiler._enabled:  # Only a flag check when profiling is off
+                return function(*args, **kwargs)
+
+            start = time.perf_counter_ns()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                profiler.add_span(name, category, start, time.perf_counter_ns() - start)
+        return wrapper
+    return decorator
@@ -69,6 +69,13 @@ class Register_Block_Array_Decoded_Interface(Base_Interface):
             for value in self._value_handle:
                 self._value_handle[value].disable()
 
+    def refresh(self, address_space_name: str):
+        if address_space_name != self._address_space:
+            return
+        if hasattr(self, "_value_handle"):
+            for handle in self._value_handle:
+                self._value_handle[handle].refresh()
+
     def prepare_display(self, element: tk.Tk, col: int, row: int, value_columns: int):
         values = list(self._decoding_info.keys())
 
@@ -145,13 +152,10 @@ class Register_Block_Array_Decoded_Interface(Base_Interface):
             #element.bind("<Configure>", self._check_for_resize, add='+')
 
     def update_array_display_vars(self):
-        values = list(self._decoding_info.keys())
-
-        for value in values:
-            handle = self._value_handle[value]
-            internal_var: tk.StringVar = self._parent.get_decoded_indexed_var(self._address_space, self._block_name, value)
+        internal_vars = self._parent.get_decoded_indexed_vars(self._address_space, self._block_name)
 
-            handle.shadow_var = internal_var
+        for value in self._value_handle:
+            self._value_handle[value].shadow_var = internal_vars[value]
 
     def _check_for_resize(self, event):
         from math import floor
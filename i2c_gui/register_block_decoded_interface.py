@@ -69,6 +69,13 @@ class Register_Block_Decoded_Interface(Base_Interface):
             for value in self._value_handle:
                 self._value_handle[value].disable()
 
+    def refresh(self, address_space_name: str):
+        if address_space_name != self._address_space:
+            return
+        if hasattr(self, "_value_handle"):
+            for handle in self._value_handle:
+                self._value_handle[handle].refresh()
+
     def prepare_display(self, element: tk.Tk, col: int, row: int, value_columns: int):
         values = list(self._decoding_info.keys())
 
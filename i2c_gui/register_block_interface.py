@@ -78,6 +78,13 @@ class Register_Block_Interface(Base_Interface):
         if not self._parent.write_register(self._address_space, self._block_name, register_name, write_check=self._parent.enable_readback):
             self.send_message("Failed writing the register {} in block {} of address space {}.".format(register_name, self._block_name, self._address_space), "Error")
 
+    def refresh(self, address_space_name: str):
+        if address_space_name != self._address_space:
+            return
+        if hasattr(self, "_register_handle"):
+            for handle in self._register_handle:
+                self._register_handle[handle].refresh()
+
     def prepare_display(self, element: tk.Tk, col: int, row: int, register_columns: int):
         registers = list(self._register_model.keys())
 
@@ -29,10 +29,31 @@ import tkinter as tk
 import tkinter.ttk as ttk  # For themed widgets (gives a more native visual to the elements)
 import logging
 import time
+import json
+from pathlib import Path
 
 from usb_iss import UsbIss
 
 class USB_ISS_Helper(I2C_Connection_Helper):
+    # Largest transfers supported by the USB-ISS module, indexed by operation and register bits
+    _max_chunk_sizes = {
+        ("read", 8): 60,
+        ("write", 8): 60,
+        ("read", 16): 64,
+        ("write", 16): 59,
+    }
+
+    _clk_values = [ # These are the frequencies supported by the USB-ISS module (in kHz), two of them are supported in both hardware and software
+        20,   # Supported in software bit bashed
+        50,   # Supported in software bit bashed
+        100,  # Supported in software bit bashed and hardware
+        400,  # Supported in software bit bashed and hardware
+        1000  # Supported in hardware
+    ]
+
+    # The clock frequencies found by tune_clock, indexed by port and board
+    _tuned_clock_file = Path.home() / ".i2c_gui" / "usb_iss_clock.json"
+
     def __init__(self, parent: Base_GUI, max_seq_byte: int = 8, swap_endian: bool = True):
         super().__init__(parent, max_seq_byte, swap_endian)
 
@@ -44,6 +65,8 @@ class USB_ISS_Helper(I2C_Connection_Helper):
         self._clk_var = tk.IntVar(self._frame)
         self._clk_var.set(100)
 
+        self._board = ""
+
     @property
     def port(self):
         return self._port_var.get()
@@ -60,6 +83,115 @@ class USB_ISS_Helper(I2C_Connection_Helper):
     def clk(self, value):
         self._clk_var.set(value)
 
+    @property
+    def board(self):
+        """Name of the board on the bus, used together with the port to look up the clock found by tune_clock"""
+        return self._board
+
+    @board.setter
+    def board(self, value: str):
+        self._board = value
+
+    @property
+    def adapter_id(self):
+        return "USB-ISS:{}".format(self.port)
+
+    def _get_max_chunk_size(self, operation: str, register_bits: int):
+        if (operation, register_bits) in self._max_chunk_sizes:
+            return self._max_chunk_sizes[(operation, register_bits)]
+        return self._max_seq_byte
+
+    def _set_clock(self, clk: int):
+        # Give preference to hardware I2C for clk which support both hardware and bit bashed
+        use_hardware = True
+        if clk < 100:
+            use_hardware = False
+
+        self._iss.setup_i2c(clock_khz=clk, use_i2c_hardware=use_hardware)
+        self._clk_var.set(clk)
+
+    def _load_tuned_clocks(self):
+        if not self._tuned_clock_file.is_file():
+            return {}
+        with open(self._tuned_clock_file, 'r') as file:
+            return json.load(file)
+
+    def _tuned_clock_key(self, board: str):
+        return "{}|{}".format(self.port, board)
+
+    def load_tuned_clock(self, board: str = ""):
+        """Set the clock to the value found by tune_clock for this port and board, returns whether one was found"""
+        tuned_clocks = self._load_tuned_clocks()
+        key = self._tuned_clock_key(board)
+        if key not in tuned_clocks:
+            return False
+        self.clk = tuned_clocks[key]
+        return True
+
+    def _apply_tuned_clock(self):
+        try:
+            if self.load_tuned_clock(self.board):
+                self._logger.info("Using the I2C clock of {} kHz tuned for port {} and board '{}'".format(self.clk, self.port, self.board))
+        except (OSError, ValueError) as error:
+            self._logger.warning("Unable to load the tuned I2C clocks from {}: {}".format(self._tuned_clock_file, error))
+
+    def _save_tuned_clock(self, board: str, clk: int):
+        tuned_clocks = self._load_tuned_clocks()
+        tuned_clocks[self._tuned_clock_key(board)] = clk
+
+        self._tuned_clock_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self._tuned_clock_file, 'w') as file:
+            json.dump(tuned_clocks, file, indent=2)
+
+    def tune_clock(self, device_address: int, memory_address: int, byte_count: int, register_bits: int = 16, iterations: int = 10, board: str = None, start_clk: int = 100):
+        """
+        Step up the I2C clock, keeping the fastest frequency with no errors over the given number of verified read/write bursts.
+        The bursts write back the current contents of the memory range, so the device state is not changed.
+        The result is stored for the port and board (the board property if none is given) and used on the next connect
+        """
+        if board is None:
+            board = self.board
+        if not self.is_connected or self._no_connect:
+            return None
+
+        original_clk = self.clk
+        read_chunk_size = self.get_chunk_size("read", register_bits)
+        write_chunk_size = self.get_chunk_size("write", register_bits)
+        reference = self._read_with_chunk_size(device_address, memory_address, byte_count, register_bits, read_chunk_size)
+
+        best_clk = None
+        for clk in self._clk_values:
+            if clk < start_clk:
+                continue
+
+            clean = True
+            try:
+                self._set_clock(clk)
+                for iteration in range(iterations):
+                    self._write_with_chunk_size(device_address, memory_address, reference, register_bits, write_chunk_size)
+                    if self._read_with_chunk_size(device_address, memory_address, byte_count, register_bits, read_chunk_size) != reference:
+                        clean = False
+                        break
+            except Exception:
+                clean = False
+
+            self._logger.info("I2C clock tuning at {} kHz: {}".format(clk, "no errors" if clean else "errors found"))
+            if not clean:
+                break
+            best_clk = clk
+
+        if best_clk is None:
+            self._set_clock(original_clk)
+            self.send_message("Unable to find an I2C clock frequency without errors on port {}, keeping {} kHz".format(self.port, original_clk), "Error")
+            return None
+
+        self._set_clock(best_clk)
+        # Rewrite the reference values at the final clock, in case a failed burst at a higher frequency corrupted them
+        self._write_with_chunk_size(device_address, memory_address, reference, register_bits, write_chunk_size)
+        self._save_tuned_clock(board, best_clk)
+        self.send_message("Tuned the I2C clock on port {} to {} kHz".format(self.port, best_clk))
+        return best_clk
+
     def _check_i2c_device(self, address: int):
         return self._iss.i2c.test(address)
 
@@ -95,14 +227,6 @@ class USB_ISS_Helper(I2C_Connection_Helper):
 
         self._frame.columnconfigure(2, weight=1)
 
-        self._clk_values = [ # These are the frequencies supported by the USB-ISS module (in kHz), two of them are supported in both hardware and software
-            20,   # Supported in software bit bashed
-            50,   # Supported in software bit bashed
-            100,  # Supported in software bit bashed and hardware
-            400,  # Supported in software bit bashed and hardware
-            1000  # Supported in hardware
-        ]
-
         self._clk_label = ttk.Label(self._frame, text="Clock Frequency:")
         self._clk_label.grid(column=3, row=0, sticky=(tk.W, tk.E))
 
@@ -122,16 +246,12 @@ class USB_ISS_Helper(I2C_Connection_Helper):
         return True
 
     def connect(self, no_connect: bool = False):
-        # Give preference to hardware I2C for clk which support both hardware and bit bashed
-        use_hardware = True
-        if self._clk_var.get() < 100:
-            use_hardware = False
-
         self._no_connect = no_connect
         if not no_connect:  # For emulated connection
+            self._apply_tuned_clock()
             try:
                 self._iss.open(self.port)
-                self._iss.setup_i2c(clock_khz=self.clk, use_i2c_hardware=use_hardware)
+                self._set_clock(self.clk)
             except:
                 self.send_message("Unable to connect to I2C bus on port {} using I2C at {} kHz".format(self.port, self.clk))
                 return False
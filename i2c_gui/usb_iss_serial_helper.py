@@ -0,0 +1,190 @@
+#############################################################################
+# zlib License
+#
+# (C) 2023 Cristóvão Beirão da Cruz e Silva <cbeiraod@cern.ch>
+#
+# This software is provided 'as-is', without any express or implied
+# warranty.  In no event will the authors be held liable for any damages
+# arising from the use of this software.
+#
+# Permission is granted to anyone to use this software for any purpose,
+# including commercial applications, and to alter it and redistribute it
+# freely, subject to the following restrictions:
+#
+# 1. The origin of this software must not be misrepresented; you must not
+#    claim that you wrote the original software. If you use this software
+#    in a product, an acknowledgment in the product documentation would be
+#    appreciated but is not required.
+# 2. Altered source versions must be plainly marked as such, and must not be
+#    misrepresented as being the original software.
+# 3. This notice may not be removed or altered from any source distribution.
+#############################################################################
+
+from __future__ import annotations
+
+from .usb_iss_helper import USB_ISS_Helper
+from .base_gui import Base_GUI
+
+import tkinter as tk
+import tkinter.ttk as ttk  # For themed widgets (gives a more native visual to the elements)
+import logging
+
+import serial
+
+class USB_ISS_Serial_Helper(USB_ISS_Helper):
+    """USB-ISS helper which speaks the serial protocol of the module directly, queueing several I2C commands in each USB transfer"""
+    _cmd_i2c_ad1 = 0x55
+    _cmd_i2c_ad2 = 0x56
+    _cmd_i2c_test = 0x58
+    _cmd_usb_iss = 0x5A
+    _sub_cmd_iss_version = 0x01
+    _sub_cmd_iss_mode = 0x02
+    _io_type = 0x0A  # All IO pins as digital inputs
+    _ack = 0xFF
+    _nack = 0x00
+
+    # ISS_MODE values, indexed by the clock frequency (in kHz) and whether the hardware I2C is used
+    _i2c_modes = {
+        (20, False): 0x20,
+        (50, False): 0x30,
+        (100, False): 0x40,
+        (400, False): 0x50,
+        (100, True): 0x60,
+        (400, True): 0x70,
+        (1000, True): 0x80,
+    }
+
+    # Commands are only queued up to the size of a full speed USB packet, so the receive buffer of the module is never overrun
+    _max_packet_bytes = 64
+
+    def __init__(self, parent: Base_GUI, max_seq_byte: int = 8, swap_endian: bool = True, pipeline_depth: int = 16, timeout: float = 0.5):
+        super().__init__(parent, max_seq_byte, swap_endian)
+
+        self._serial = None
+        self._timeout = timeout
+        self._pipeline_depth = pipeline_depth
+
+        # Set after a failed exchange, late response bytes may still arrive and would shift all the following responses
+        self._needs_resync = False
+
+    def _resync(self):
+        # Wait for any late response bytes to arrive and drop them, then confirm the module answers in step again
+        self._serial.reset_output_buffer()
+        while len(self._serial.read(self._serial.in_waiting or 1)) > 0:
+            pass
+        self._serial.reset_input_buffer()
+
+        self._serial.write(bytes([self._cmd_usb_iss, self._sub_cmd_iss_version]))
+        response = self._serial.read(3)
+        if len(response) != 3:
+            self._serial.reset_input_buffer()
+            raise RuntimeError("Unable to resynchronise with the USB-ISS module, {} of the 3 bytes of the version response were received".format(len(response)))
+        self._needs_resync = False
+
+    def _exchange(self, commands: list[tuple[list[int], int]]) -> list[list[int]]:
+        # Each command is a tuple of the bytes to send and the number of bytes in the response, the
+        # commands are packed in as few serial writes as possible and the responses read in bulk
+        if self._needs_resync:
+            self._resync()
+
+        responses = []
+        idx = 0
+        while idx < len(commands):
+            packet = []
+            response_sizes = []
+            while idx < len(commands) and (len(packet) == 0 or len(packet) + len(commands[idx][0]) <= self._max_packet_bytes):
+                packet += commands[idx][0]
+                response_sizes += [commands[idx][1]]
+                idx += 1
+
+            self._serial.write(bytes(packet))
+            response = self._serial.read(sum(response_sizes))
+            if len(response) != sum(response_sizes):
+                self._serial.reset_input_buffer()
+                self._serial.reset_output_buffer()
+                self._needs_resync = True
+                raise RuntimeError("Expected {} bytes from the USB-ISS module, but {} were received".format(sum(response_sizes), len(response)))
+
+            offset = 0
+            for size in response_sizes:
+                responses += [list(response[offset:offset + size])]
+                offset += size
+
+        return responses
+
+    def _memory_command(self, address: int, memory_address: int, register_bits: int):
+        if register_bits == 16:
+            return [self._cmd_i2c_ad2, address, memory_address >> 8, memory_address & 0xff]
+        if register_bits == 8:
+            return [self._cmd_i2c_ad1, address, memory_address & 0xff]
+        raise RuntimeError("Unknown bit size trying to be sent: {}".format(register_bits))
+
+    def _set_clock(self, clk: int):
+        # Give preference to hardware I2C for clk which support both hardware and bit bashed
+        use_hardware = True
+        if clk < 100:
+            use_hardware = False
+
+        response = self._exchange([([self._cmd_usb_iss, self._sub_cmd_iss_mode, self._i2c_modes[(clk, use_hardware)], self._io_type], 2)])[0]
+        if response[0] != self._ack:
+            raise RuntimeError("The USB-ISS module refused the I2C mode, error code 0x{:02x}".format(response[1]))
+        self._clk_var.set(clk)
+
+    def _check_i2c_device(self, address: int):
+        return self._exchange([([self._cmd_i2c_test, address << 1], 1)])[0][0] != self._nack
+
+    def _write_i2c_device_memory(self, address: int, memory_address: int, data: list[int], register_bits: int = 16):
+        self._write_i2c_device_memory_chunks(address, [(memory_address, data)], register_bits)
+
+    def _read_i2c_device_memory(self, address: int, memory_address: int, byte_count: int, register_bits: int = 16) -> list[int]:
+        return self._read_i2c_device_memory_chunks(address, [(memory_address, byte_count)], register_bits)[0]
+
+    def _write_i2c_device_memory_chunks(self, address: int, chunks: list[tuple[int, list[int]]], register_bits: int = 16):
+        commands = []
+        for memory_address, data in chunks:
+            commands += [(self._memory_command(address << 1, memory_address, register_bits) + [len(data)] + list(data), 1)]
+
+        responses = self._exchange(commands)
+        for (memory_address, data), response in zip(chunks, responses):
+            if response[0] == self._nack:
+                raise RuntimeError("The write of {} bytes to the I2C device 0x{:02x} at memory address 0x{:x} was not acknowledged".format(len(data), address, memory_address))
+
+    def _read_i2c_device_memory_chunks(self, address: int, chunks: list[tuple[int, int]], register_bits: int = 16) -> list[list[int]]:
+        commands = []
+        for memory_address, byte_count in chunks:
+            commands += [(self._memory_command((address << 1) | 0x01, memory_address, register_bits) + [byte_count], byte_count)]
+
+        return self._exchange(commands)
+
+    def connect(self, no_connect: bool = False):
+        self._no_connect = no_connect
+        if not no_connect:  # For emulated connection
+            self._apply_tuned_clock()
+            try:
+                self._serial = serial.Serial(port=self.port, baudrate=9600, timeout=self._timeout)
+                self._set_clock(self.clk)
+            except Exception:
+                if self._serial is not None:
+                    self._serial.close()
+                    self._serial = None
+                self.send_message("Unable to connect to I2C bus on port {} using I2C at {} kHz".format(self.port, self.clk))
+                return False
+
+        if hasattr(self, "_port_entry"):
+            self._port_entry.config(state="disabled")
+        if hasattr(self, "_clk_option"):
+            self._clk_option.config(state="disabled")
+        self.send_message("Connected to I2C bus with a bitrate of {} kHz through port {}".format(self.clk, self.port))
+        return True
+
+    def disconnect(self):
+        if self._serial is not None:
+            self._serial.close()
+            self._serial = None
+        self._needs_resync = False
+
+        if hasattr(self, "_port_entry"):
+            self._port_entry.config(state="normal")
+        if hasattr(self, "_clk_option"):
+            self._clk_option.config(state="normal")
+        self.send_message("Disconnected from I2C bus with a bitrate of {} kHz through port {}".format(self.clk, self.port))
@@ -0,0 +1,123 @@
+#############################################################################
+# zlib License
+#
+# (C) 2023 Cristóvão Beirão da Cruz e Silva <cbeiraod@cern.ch>
+#
+# This software is provided 'as-is', without any express or implied
+# warranty.  In no event will the authors be held liable for any damages
+# arising from the use of this software.
+#
+# Permission is granted to anyone to use this software for any purpose,
+# including commercial applications, and to alter it and redistribute it
+# freely, subject to the following restrictions:
+#
+# 1. The origin of this software must not be misrepresented; you must not
+#    claim that you wrote the original software. If you use this software
+#    in a product, an acknowledgment in the product documentation would be
+#    appreciated but is not required.
+# 2. Altered source versions must be plainly marked as such, and must not be
+#    misrepresented as being the original software.
+# 3. This notice may not be removed or altered from any source distribution.
+#############################################################################
+
+import logging
+import i2c_gui
+from i2c_gui.i2c_session_log import read_i2c_session
+
+from pathlib import Path
+import time
+import json
+
+def replay_session(filename: str, speed: float = 1.0):
+    """Issue the transactions of a recorded I2C session through a connection controller replaying the same session, returning the timing summary"""
+    records = read_i2c_session(filename)
+
+    i2c_gui.__no_connect__ = False
+
+    logger = logging.getLogger("Replay_Logger")
+    Script_Helper = i2c_gui.ScriptHelper(logger)
+
+    conn = i2c_gui.Connection_Controller(Script_Helper)
+    conn.connection_type = "Replay"
+    conn.handle.file = filename
+    conn.handle.speed = speed
+    conn.connect()
+
+    replayed_failures = 0
+    start_time = time.perf_counter_ns()
+    try:
+        for record in records:
+            try:
+                if record["operation"] == "check":
+                    conn.check_i2c_device(hex(record["device_address"]))
+                elif record["operation"] == "read":
+                    conn.read_device_memory(record["device_address"], record["memory_address"], len(record["data"]), record["register_bits"])
+                else:
+                    conn.write_device_memory(record["device_address"], record["memory_address"], record["data"], record["register_bits"])
+            except RuntimeError:
+                if not record["failed"]:
+                    raise
+                replayed_failures += 1
+        wall_ns = time.perf_counter_ns() - start_time
+    finally:
+        conn.disconnect()
+
+    recorded_i2c_ns = sum([record["duration_ns"] for record in records])
+    recorded_span_ns = 0
+    if len(records) > 0:
+        recorded_span_ns = records[-1]["timestamp_ns"] + records[-1]["duration_ns"] - records[0]["timestamp_ns"]
+    total = conn.metrics.summary()["total"]
+
+    return {
+        "file": str(filename),
+        "speed": speed,
+        "transactions": len(records),
+        "bytes": sum([len(record["data"]) for record in records]),
+        "failures": replayed_failures,
+        "recorded_span_s": recorded_span_ns/1E9,
+        "recorded_i2c_s": recorded_i2c_ns/1E9,
+        "replay_wall_s": wall_ns/1E9,
+        "replay_i2c_s": total["wall_ns"]/1E9,
+        "replay_pacing_sleep_s": total["sleep_ns"]/1E9,
+        # Time spent outside the replayed transfers, i.e. the software overhead of the controller and helper
+        "replay_overhead_s": (wall_ns - (recorded_i2c_ns/speed if speed > 0 else 0))/1E9,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Replay a recorded I2C session log offline, reporting the timing of the replay (no hardware needed)')
+    parser.add_argument(
+        'file',
+        help = 'The I2C session log, as recorded with Connection_Controller.start_recording',
+        type = Path,
+    )
+    parser.add_argument(
+        '-s',
+        '--speed',
+        help = 'Speed factor for the recorded transaction durations, 0 replays as fast as possible. Default: 1',
+        default = 1.0,
+        dest = 'speed',
+        type = float,
+    )
+    parser.add_argument(
+        '-o',
+        '--output',
+        help = 'The JSON file where to store the results, if not set they are printed to the terminal',
+        default = None,
+        dest = 'output',
+        type = Path,
+    )
+
+    args = parser.parse_args()
+
+    logging.basicConfig(format='%(asctime)s - %(levelname)s:%(name)s:%(message)s', level=logging.WARNING)
+
+    results = replay_session(args.file, args.speed)
+
+    if args.output is None:
+        print(json.dumps(results, indent=2))
+    else:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)